@@ -51,6 +51,14 @@ def create_app():
     csrf = CustomCSRF()
     csrf.init_app(app)
 
+    # orjson-backed jsonify (core/serializers.py)
+    from core.serializers import init_json
+    init_json(app)
+
+    # gzip / brotli for API and HTML responses
+    from core.compression import init_compression
+    init_compression(app)
+
     # Make sure SECRET_KEY is set
     app.config['SECRET_KEY'] = app.config.get('SECRET_KEY') or 'mqM_nXhDHOYlb0T8E9bT4c7XCLiDImpINnVHFmCLR-Q'
 
@@ -116,10 +124,13 @@ def register_blueprints(app):
     from modules.leave.api_routes import api_leave_bp
     from modules.document.api_routes import api_document_bp
     from modules.candidate.api_routes import api_candidate_bp
+    from modules.candidate.api_specialties import api_specialty_bp
     from modules.user.api_routes import api_user_bp
     from modules.auth.api_mobile import api_mobile_auth_bp
     from modules.employee.api_uploads import api_employee_upload_bp
     from modules.requests.api_mobile import api_mobile_requests_bp
+    from modules.search.api_routes import api_search_bp
+    from modules.sync.api_routes import api_sync_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(dashboard_bp, url_prefix='/dashboard')
@@ -138,10 +149,13 @@ def register_blueprints(app):
     app.register_blueprint(api_leave_bp)
     app.register_blueprint(api_document_bp)
     app.register_blueprint(api_candidate_bp)
+    app.register_blueprint(api_specialty_bp)
     app.register_blueprint(api_user_bp)
     app.register_blueprint(api_mobile_auth_bp)
     app.register_blueprint(api_employee_upload_bp)
     app.register_blueprint(api_mobile_requests_bp)
+    app.register_blueprint(api_search_bp)
+    app.register_blueprint(api_sync_bp)
 
     print("All registered endpoints:")
     for rule in app.url_map.iter_rules():
@@ -222,6 +236,8 @@ app = create_app()
 with app.app_context():
     try:
         db.create_all()
+        from core.services.search_index import ensure_search_index
+        ensure_search_index()
         initialize_database()
     except Exception as e:
         print(f"Database initialization error (non-critical): {e}")
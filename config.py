@@ -1,4 +1,5 @@
 import os
+import json
 from datetime import timedelta
 
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -27,6 +28,36 @@ class Config:
     BABEL_DEFAULT_LOCALE = 'en'
     BABEL_TRANSLATION_DIRECTORIES = 'translations'
 
+    # Outbound call timeouts (seconds)
+    RECAPTCHA_TIMEOUT = float(os.environ.get('RECAPTCHA_TIMEOUT', 5))
+    SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', 10))
+
+    # Background jobs
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+    JOB_BACKOFF_SECONDS = int(os.environ.get('JOB_BACKOFF_SECONDS', 30))
+    JOB_BACKOFF_MAX_SECONDS = int(os.environ.get('JOB_BACKOFF_MAX_SECONDS', 3600))
+    JOB_STALE_AFTER_SECONDS = int(os.environ.get('JOB_STALE_AFTER_SECONDS', 900))
+    JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 5))
+
+    # Response compression (core/compression.py); brotli is used when installed
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', '1') == '1'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_BR_QUALITY = int(os.environ.get('COMPRESS_BR_QUALITY', 5))
+
+    # Leave balances (modules/leave/ledger.py): yearly entitlement per leave type,
+    # accrued monthly, and the most days carried into a new year
+    LEAVE_ENTITLEMENT_DAYS = {'annual': float(os.environ.get('LEAVE_ANNUAL_DAYS', 21))}
+    LEAVE_CARRY_OVER_MAX_DAYS = float(os.environ.get('LEAVE_CARRY_OVER_MAX_DAYS', 10))
+
+    # Working-day calendars (core/services/work_calendar.py): weekmask per site, Monday..Sunday,
+    # 1 = working day. A user's site is the country on their employee record when it is listed
+    # here, otherwise 'default'. Extra sites: WORK_WEEKMASKS='{"Egypt": "1111001", "India": "1111110"}'
+    WORK_WEEKMASKS = dict(
+        {'default': '1111001'},  # Friday/Saturday weekend (Gulf sites)
+        **json.loads(os.environ.get('WORK_WEEKMASKS', '{}'))
+    )
+
 class DevelopmentConfig(Config):
     DEBUG = True
 
@@ -1,244 +1,259 @@
 # config/specialties.py
 # Comprehensive list of specialties for candidates
 
-SPECIALTIES = [
+# Taxonomy ids are stored on candidates (specialty_id / specialty_category_id),
+# so every entry carries an explicit, permanent id: give new entries the next
+# free id and never reuse or renumber one. Order only affects display.
+SPECIALTY_CATEGORIES = [
+    (1, 'Welding'),
+    (2, 'Electrical'),
+    (3, 'Mechanics'),
+    (4, 'HVAC'),
+    (5, 'Plumbing'),
+    (6, 'Construction & Carpentry'),
+    (7, 'Painting & Finishing'),
+    (8, 'Operators'),
+    (9, 'Fabrication & Metalwork'),
+    (10, 'Quality & Inspection'),
+    (11, 'Safety & Compliance'),
+    (12, 'Logistics & Warehouse'),
+    (13, 'Production & Manufacturing'),
+    (14, 'Maintenance & Janitorial'),
+    (15, 'Specialized Trades'),
+    (16, 'Entry Level & General'),
+    (17, 'Supervisory & Management'),
+]
+
+# Grouped by trade: (category name, [(specialty id, name), ...])
+SPECIALTY_SECTIONS = [
     # WELDING
-    'Welding - MIG',
-    'Welding - TIG',
-    'Welding - Stick (SMAW)',
-    'Welding - Flux Core',
-    'Pipe Welding',
-    'Structural Welding',
-    'Aluminum Welding',
-    'Stainless Steel Welding',
-    'Certified Welder',
-    
+    ('Welding', [
+        (1, 'Welding - MIG'),
+        (2, 'Welding - TIG'),
+        (3, 'Welding - Stick (SMAW)'),
+        (4, 'Welding - Flux Core'),
+        (5, 'Pipe Welding'),
+        (6, 'Structural Welding'),
+        (7, 'Aluminum Welding'),
+        (8, 'Stainless Steel Welding'),
+        (9, 'Certified Welder'),
+    ]),
+
     # ELECTRICAL
-    'Electrical - High Voltage',
-    'Electrical - Low Voltage',
-    'Electrical Wiring',
-    'Panel Installation',
-    'Troubleshooting & Repair',
-    'Industrial Electrical',
-    'Building Electrical',
-    'Solar Installation',
-    'Certified Electrician',
-    'PLC Programming',
-    
+    ('Electrical', [
+        (10, 'Electrical - High Voltage'),
+        (11, 'Electrical - Low Voltage'),
+        (12, 'Electrical Wiring'),
+        (13, 'Panel Installation'),
+        (14, 'Troubleshooting & Repair'),
+        (15, 'Industrial Electrical'),
+        (16, 'Building Electrical'),
+        (17, 'Solar Installation'),
+        (18, 'Certified Electrician'),
+        (19, 'PLC Programming'),
+    ]),
+
     # MECHANICS - GENERAL
-    'General Mechanic',
-    'Equipment Mechanic',
-    'Machinery Technician',
-    'Maintenance Mechanic',
-    'Industrial Mechanic',
-    'Heavy Equipment Mechanic',
-    
+    ('Mechanics', [
+        (20, 'General Mechanic'),
+        (21, 'Equipment Mechanic'),
+        (22, 'Machinery Technician'),
+        (23, 'Maintenance Mechanic'),
+        (24, 'Industrial Mechanic'),
+        (25, 'Heavy Equipment Mechanic'),
+    ]),
+
     # MECHANICS - AUTOMOTIVE
-    'Automotive Mechanic',
-    'Engine Mechanic',
-    'Transmission Repair',
-    'Brake Systems',
-    'Suspension & Alignment',
-    'Diesel Engine Mechanic',
-    'Heavy Truck Mechanic',
-    'Auto Electrician',
-    'Certified ASE Mechanic',
-    
+    ('Mechanics', [
+        (26, 'Automotive Mechanic'),
+        (27, 'Engine Mechanic'),
+        (28, 'Transmission Repair'),
+        (29, 'Brake Systems'),
+        (30, 'Suspension & Alignment'),
+        (31, 'Diesel Engine Mechanic'),
+        (32, 'Heavy Truck Mechanic'),
+        (33, 'Auto Electrician'),
+        (34, 'Certified ASE Mechanic'),
+    ]),
+
     # MECHANICS - INDUSTRIAL/MAINTENANCE
-    'Predictive Maintenance',
-    'Preventive Maintenance',
-    'CNC Machine Operator',
-    'Lathe Operator',
-    'Precision Machinist',
-    'Hydraulics Technician',
-    'Pneumatics Technician',
-    'Bearing & Seal Specialist',
-    
+    ('Mechanics', [
+        (35, 'Predictive Maintenance'),
+        (36, 'Preventive Maintenance'),
+        (37, 'CNC Machine Operator'),
+        (38, 'Lathe Operator'),
+        (39, 'Precision Machinist'),
+        (40, 'Hydraulics Technician'),
+        (41, 'Pneumatics Technician'),
+        (42, 'Bearing & Seal Specialist'),
+    ]),
+
     # HVAC
-    'HVAC Technician',
-    'Air Conditioning Technician',
-    'Heating Systems',
-    'Refrigeration Technician',
-    'HVAC Installation',
-    'EPA Certified HVAC',
-    'Ventilation Systems',
-    
+    ('HVAC', [
+        (43, 'HVAC Technician'),
+        (44, 'Air Conditioning Technician'),
+        (45, 'Heating Systems'),
+        (46, 'Refrigeration Technician'),
+        (47, 'HVAC Installation'),
+        (48, 'EPA Certified HVAC'),
+        (49, 'Ventilation Systems'),
+    ]),
+
     # PLUMBING
-    'Plumber',
-    'Pipe Fitter',
-    'Plumbing Installation',
-    'Drainage Systems',
-    'Water Treatment',
-    'Gas Fitting',
-    'Backflow Prevention',
-    'Certified Plumber',
-    
+    ('Plumbing', [
+        (50, 'Plumber'),
+        (51, 'Pipe Fitter'),
+        (52, 'Plumbing Installation'),
+        (53, 'Drainage Systems'),
+        (54, 'Water Treatment'),
+        (55, 'Gas Fitting'),
+        (56, 'Backflow Prevention'),
+        (57, 'Certified Plumber'),
+    ]),
+
     # CONSTRUCTION & CARPENTRY
-    'Carpenter',
-    'Rough Carpentry',
-    'Finish Carpentry',
-    'Framing',
-    'Masonry',
-    'Concrete Work',
-    'Tile Installation',
-    'Drywall Installation',
-    'Roofing',
-    'Formwork Specialist',
-    
+    ('Construction & Carpentry', [
+        (58, 'Carpenter'),
+        (59, 'Rough Carpentry'),
+        (60, 'Finish Carpentry'),
+        (61, 'Framing'),
+        (62, 'Masonry'),
+        (63, 'Concrete Work'),
+        (64, 'Tile Installation'),
+        (65, 'Drywall Installation'),
+        (66, 'Roofing'),
+        (67, 'Formwork Specialist'),
+    ]),
+
     # PAINTING & FINISHING
-    'Painter',
-    'Industrial Painter',
-    'Spray Painting',
-    'Surface Preparation',
-    'Coating Specialist',
-    'Finish Carpenter',
-    
+    ('Painting & Finishing', [
+        (68, 'Painter'),
+        (69, 'Industrial Painter'),
+        (70, 'Spray Painting'),
+        (71, 'Surface Preparation'),
+        (72, 'Coating Specialist'),
+        (73, 'Finish Carpenter'),
+    ]),
+
     # OPERATORS
-    'Forklift Operator',
-    'Crane Operator',
-    'Excavator Operator',
-    'Loader Operator',
-    'Dozer Operator',
-    'Heavy Equipment Operator',
-    'Scissor Lift Operator',
-    'Reach Truck Operator',
-    'Certified Equipment Operator',
-    
+    ('Operators', [
+        (74, 'Forklift Operator'),
+        (75, 'Crane Operator'),
+        (76, 'Excavator Operator'),
+        (77, 'Loader Operator'),
+        (78, 'Dozer Operator'),
+        (79, 'Heavy Equipment Operator'),
+        (80, 'Scissor Lift Operator'),
+        (81, 'Reach Truck Operator'),
+        (82, 'Certified Equipment Operator'),
+    ]),
+
     # WELDING - ADVANCED
-    'Robotic Welding',
-    'Underwater Welding',
-    'Aerospace Welding',
-    'Pressure Vessel Welding',
-    'Code Inspector Welder',
-    
+    ('Welding', [
+        (83, 'Robotic Welding'),
+        (84, 'Underwater Welding'),
+        (85, 'Aerospace Welding'),
+        (86, 'Pressure Vessel Welding'),
+        (87, 'Code Inspector Welder'),
+    ]),
+
     # FABRICATION & METALWORK
-    'Metal Fabricator',
-    'Sheet Metal Fabrication',
-    'Steel Fabrication',
-    'Aluminum Fabrication',
-    'Ironworker',
-    'Blacksmith',
-    'Tool & Die Maker',
-    
+    ('Fabrication & Metalwork', [
+        (88, 'Metal Fabricator'),
+        (89, 'Sheet Metal Fabrication'),
+        (90, 'Steel Fabrication'),
+        (91, 'Aluminum Fabrication'),
+        (92, 'Ironworker'),
+        (93, 'Blacksmith'),
+        (94, 'Tool & Die Maker'),
+    ]),
+
     # QUALITY & INSPECTION
-    'Quality Control Inspector',
-    'Inspection Technician',
-    'NDT Technician (Non-Destructive Testing)',
-    'Ultrasonic Testing',
-    'X-Ray Inspection',
-    'Dimensional Inspector',
-    'Surface Inspector',
-    
+    ('Quality & Inspection', [
+        (95, 'Quality Control Inspector'),
+        (96, 'Inspection Technician'),
+        (97, 'NDT Technician (Non-Destructive Testing)'),
+        (98, 'Ultrasonic Testing'),
+        (99, 'X-Ray Inspection'),
+        (100, 'Dimensional Inspector'),
+        (101, 'Surface Inspector'),
+    ]),
+
     # SAFETY & COMPLIANCE
-    'Safety Officer',
-    'Health & Safety Technician',
-    'OSHA Certified',
-    'Fire Safety Inspector',
-    'Environmental Health & Safety',
-    
+    ('Safety & Compliance', [
+        (102, 'Safety Officer'),
+        (103, 'Health & Safety Technician'),
+        (104, 'OSHA Certified'),
+        (105, 'Fire Safety Inspector'),
+        (106, 'Environmental Health & Safety'),
+    ]),
+
     # LOGISTICS & WAREHOUSE
-    'Warehouse Manager',
-    'Inventory Specialist',
-    'Logistics Coordinator',
-    'Shipping & Receiving',
-    'Material Handler',
-    'Stock Keeper',
-    
+    ('Logistics & Warehouse', [
+        (107, 'Warehouse Manager'),
+        (108, 'Inventory Specialist'),
+        (109, 'Logistics Coordinator'),
+        (110, 'Shipping & Receiving'),
+        (111, 'Material Handler'),
+        (112, 'Stock Keeper'),
+    ]),
+
     # PRODUCTION & MANUFACTURING
-    'Production Supervisor',
-    'Production Technician',
-    'Assembly Technician',
-    'Line Operator',
-    'Process Technician',
-    'Quality Technician',
-    'Manufacturing Engineer',
-    
+    ('Production & Manufacturing', [
+        (113, 'Production Supervisor'),
+        (114, 'Production Technician'),
+        (115, 'Assembly Technician'),
+        (116, 'Line Operator'),
+        (117, 'Process Technician'),
+        (118, 'Quality Technician'),
+        (119, 'Manufacturing Engineer'),
+    ]),
+
     # MAINTENANCE & JANITORIAL
-    'Janitor/Cleaner',
-    'Building Maintenance',
-    'Facilities Maintenance',
-    'General Handyman',
-    'Landscaping',
-    'Grounds Keeper',
-    
+    ('Maintenance & Janitorial', [
+        (120, 'Janitor/Cleaner'),
+        (121, 'Building Maintenance'),
+        (122, 'Facilities Maintenance'),
+        (123, 'General Handyman'),
+        (124, 'Landscaping'),
+        (125, 'Grounds Keeper'),
+    ]),
+
     # SPECIALIZED TRADES
-    'Glazier',
-    'Glass Installation',
-    'Locksmith',
-    'Door & Hardware Installation',
-    'Insulation Technician',
-    'Weatherization Specialist',
-    'Scaffolding Specialist',
-    'Signage Installation',
-    
+    ('Specialized Trades', [
+        (126, 'Glazier'),
+        (127, 'Glass Installation'),
+        (128, 'Locksmith'),
+        (129, 'Door & Hardware Installation'),
+        (130, 'Insulation Technician'),
+        (131, 'Weatherization Specialist'),
+        (132, 'Scaffolding Specialist'),
+        (133, 'Signage Installation'),
+    ]),
+
     # ENTRY LEVEL & GENERAL
-    'Laborer',
-    'General Laborer',
-    'Helper',
-    'Apprentice',
-    'Trainee',
-    'Unskilled Worker',
-    'Assembly Helper',
-    'Production Helper',
-    
+    ('Entry Level & General', [
+        (134, 'Laborer'),
+        (135, 'General Laborer'),
+        (136, 'Helper'),
+        (137, 'Apprentice'),
+        (138, 'Trainee'),
+        (139, 'Unskilled Worker'),
+        (140, 'Assembly Helper'),
+        (141, 'Production Helper'),
+    ]),
+
     # SUPERVISORY & MANAGEMENT
-    'Supervisor',
-    'Team Lead',
-    'Shift Manager',
-    'Site Manager',
-    'Project Manager',
-    'Operations Manager',
-    'Maintenance Manager',
-    'Production Manager',
+    ('Supervisory & Management', [
+        (142, 'Supervisor'),
+        (143, 'Team Lead'),
+        (144, 'Shift Manager'),
+        (145, 'Site Manager'),
+        (146, 'Project Manager'),
+        (147, 'Operations Manager'),
+        (148, 'Maintenance Manager'),
+        (149, 'Production Manager'),
+    ]),
 ]
 
-# Organized by category (for better UI)
-SPECIALTIES_BY_CATEGORY = {
-    'Welding': [
-        'Welding - MIG',
-        'Welding - TIG',
-        'Welding - Stick (SMAW)',
-        'Welding - Flux Core',
-        'Pipe Welding',
-        'Structural Welding',
-        'Robotic Welding',
-    ],
-    'Electrical': [
-        'Electrical - High Voltage',
-        'Electrical - Low Voltage',
-        'Industrial Electrical',
-        'Building Electrical',
-        'PLC Programming',
-    ],
-    'Mechanics': [
-        'Engine Mechanic',
-        'General Mechanic',
-        'Automotive Mechanic',
-        'Heavy Equipment Mechanic',
-        'Industrial Mechanic',
-    ],
-    'HVAC & Plumbing': [
-        'HVAC Technician',
-        'Plumber',
-        'Pipe Fitter',
-        'Refrigeration Technician',
-    ],
-    'Operations': [
-        'Forklift Operator',
-        'Crane Operator',
-        'Heavy Equipment Operator',
-        'CNC Machine Operator',
-    ],
-    'Supervision & Management': [
-        'Supervisor',
-        'Team Lead',
-        'Project Manager',
-        'Production Manager',
-    ],
-    'Entry Level': [
-        'Laborer',
-        'Helper',
-        'Apprentice',
-        'Unskilled Worker',
-    ],
-}
\ No newline at end of file
+SPECIALTIES = [name for _, entries in SPECIALTY_SECTIONS for _, name in entries]
@@ -0,0 +1,137 @@
+# core/compression.py
+# Negotiated gzip / brotli compression for API and HTML responses
+
+import threading
+import zlib
+from collections import OrderedDict
+from flask import request
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+    'image/svg+xml', 'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'text/xml',
+}
+
+
+class _VariantCache:
+    """Small LRU of compressed bodies keyed by (ETag, encoding); bounded by total bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self.size -= len(old)
+
+
+def _encodings(app):
+    if brotli is not None and app.config['COMPRESS_BROTLI']:
+        return ['br', 'gzip']
+    return ['gzip']
+
+
+def _gzip(level):
+    # wbits 31 = gzip container; one compressobj per body or stream
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def compress(body, encoding, app):
+    if encoding == 'br':
+        return brotli.compress(body, quality=app.config['COMPRESS_BR_QUALITY'])
+    compressor = _gzip(app.config['COMPRESS_LEVEL'])
+    return compressor.compress(body) + compressor.flush()
+
+
+def _compress_stream(chunks, encoding, app):
+    """Compress a streamed body chunk by chunk; every chunk is flushed so clients see data as it comes"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=app.config['COMPRESS_BR_QUALITY'])
+        step, finish = (lambda c: compressor.process(c) + compressor.flush()), compressor.finish
+    else:
+        compressor = _gzip(app.config['COMPRESS_LEVEL'])
+        step, finish = (lambda c: compressor.compress(c) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+    try:
+        for chunk in chunks:
+            data = step(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def init_compression(app):
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)      # bytes; smaller bodies gain nothing
+    app.config.setdefault('COMPRESS_LEVEL', 6)           # gzip level
+    app.config.setdefault('COMPRESS_BROTLI', True)
+    app.config.setdefault('COMPRESS_BR_QUALITY', 5)      # brotli quality (0-11)
+    app.config.setdefault('COMPRESS_CACHE_BYTES', 16 * 1024 * 1024)
+    cache = _VariantCache(app.config['COMPRESS_CACHE_BYTES'])
+    app.extensions['compression_cache'] = cache
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config['COMPRESS_ENABLED']:
+            return response
+        if response.mimetype not in COMPRESSIBLE_TYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (
+            response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.direct_passthrough  # send_file: let the file be sent as-is
+        ):
+            return response
+
+        encoding = request.accept_encodings.best_match(_encodings(app))
+        if not encoding or request.accept_encodings[encoding] == 0:
+            return response
+
+        etag, weak = response.get_etag()
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, app)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < app.config['COMPRESS_MIN_SIZE']:
+                return response
+            key = (etag, encoding) if etag else None
+            compressed = cache.get(key) if key else None
+            if compressed is None:
+                compressed = compress(body, encoding, app)
+                if key:
+                    cache.put(key, compressed)
+            if len(compressed) >= len(body):
+                return response
+            response.set_data(compressed)
+
+        if etag:
+            # Same resource, different bytes: the validator becomes weak
+            response.set_etag(etag, weak=True)
+
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -1,7 +1,9 @@
 # core/decoratos.py
+import hashlib
 from functools import wraps
-from flask import abort, current_app
+from flask import abort, current_app, request, make_response
 from flask_login import current_user
+from core.services.table_versions import versions  # also registers the write counters
 
 def permission_required(permission):
     def decorator(f):
@@ -40,4 +42,38 @@ def role_required(roles):
                 abort(403)
             return f(*args, **kwargs)
         return decorated_function
-    return decorator
\ No newline at end of file
+    return decorator
+
+def conditional_get(*tables, vary=None):
+    """
+    ETag / 304 support for JSON list endpoints (use below mobile_auth_required).
+    The ETag is derived from the write counters of `tables`, the caller and the
+    query string, so it is known before the view runs its queries; a matching
+    If-None-Match returns 304 without running the view at all. `vary` returns
+    anything else the response depends on (e.g. a month implied by today's date).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user = getattr(request, 'user', None)
+            key = '|'.join(map(str, [
+                request.path,
+                sorted(request.args.items(multi=True)),
+                getattr(user, 'id', None),
+                getattr(user, 'role', None),
+                versions(*tables),
+                vary() if vary else None,
+            ]))
+            etag = hashlib.sha1(key.encode('utf-8')).hexdigest()[:32]
+
+            if request.if_none_match.contains_weak(etag):  # weak once compressed
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
@@ -3,6 +3,7 @@ from wtforms import StringField, PasswordField, SubmitField, SelectField, DateFi
 from wtforms.validators import DataRequired, Email, Length, Optional, ValidationError
 from flask_wtf.file import FileField, FileAllowed
 from flask_login import current_user
+from core.extensions import db
 from core.models import Department, User
 
 
@@ -44,7 +45,8 @@ class UserForm(FlaskForm):
     
     def __init__(self, *args, **kwargs):
         super(UserForm, self).__init__(*args, **kwargs)
-        self.department.choices = [(0, 'Select Department')] + [(d.id, d.name) for d in Department.query.all()]
+        departments = db.session.query(Department.id, Department.name).order_by(Department.name)
+        self.department.choices = [(0, 'Select Department')] + [(d.id, d.name) for d in departments]
 
 
 class LeaveForm(FlaskForm):
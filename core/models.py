@@ -4,9 +4,20 @@ from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError, InvalidHash
 from flask_login import UserMixin
 from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import validates, Session, with_loader_criteria
 
 ph = PasswordHasher()
 
+
+class SoftDeleteMixin:
+    """
+    Rows are deleted logically first (deleted_at is set) and purged later by a
+    background job. ORM queries skip deleted rows unless executed with
+    execution_options(include_deleted=True).
+    """
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
+
 # -------------------- EMPLOYEE REQUEST --------------------
 class EmployeeRequest(db.Model):
     __tablename__ = 'employee_requests'
@@ -18,16 +29,18 @@ class EmployeeRequest(db.Model):
     message = db.Column(db.Text, nullable=False)
     status = db.Column(db.String(20), default='pending')
     response = db.Column(db.Text, nullable=True)
+    approver_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # who last set the status
+    decided_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    user = db.relationship('User', back_populates='employee_requests')
+    user = db.relationship('User', back_populates='employee_requests', foreign_keys=[user_id])
 
     def __repr__(self):
         return f"<EmployeeRequest {self.id} - {self.subject} ({self.status})>"
 
 # -------------------- USER --------------------
-class User(db.Model, UserMixin):
+class User(SoftDeleteMixin, db.Model, UserMixin):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
@@ -43,6 +56,7 @@ class User(db.Model, UserMixin):
     last_login = db.Column(db.DateTime)
     login_count = db.Column(db.Integer, default=0)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
+    manager_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)  # reporting line; change via core/services/org_hierarchy.py
 
     # Relationships
     documents = db.relationship('UserDocument', back_populates='user', cascade="all, delete-orphan")
@@ -50,7 +64,8 @@ class User(db.Model, UserMixin):
     activities = db.relationship('ActivityLog', back_populates='user', cascade="all, delete-orphan")
     leave_requests = db.relationship('LeaveRequest', back_populates='requester', foreign_keys='LeaveRequest.user_id')
     approved_requests = db.relationship('LeaveRequest', back_populates='approver', foreign_keys='LeaveRequest.approver_id')
-    employee_requests = db.relationship('EmployeeRequest', back_populates='user', lazy='dynamic')
+    employee_requests = db.relationship('EmployeeRequest', back_populates='user', lazy='dynamic',
+                                        foreign_keys='EmployeeRequest.user_id')
 
 
     def set_password(self, password):
@@ -79,7 +94,7 @@ class User(db.Model, UserMixin):
 
 
 # -------------------- EMPLOYEE --------------------
-class Employee(db.Model):
+class Employee(SoftDeleteMixin, db.Model):
     __tablename__ = "employees"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -93,15 +108,17 @@ class Employee(db.Model):
     country = db.Column(db.String(100), nullable=True)
     state = db.Column(db.String(100), nullable=True)
     birth_date = db.Column(db.Date, nullable=True)
-    id_number = db.Column(db.String(50), nullable=True)  # Identity card / Passport number
+    id_number = db.Column(db.String(50), nullable=True, index=True)  # Identity card / Passport number (import upsert key)
     id_type = db.Column(db.String(50), nullable=True)    # Passport, National ID, etc.
-    nationality = db.Column(db.String(100), nullable=True)
+    nationality = db.Column(db.String(100), nullable=True, index=True)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Foreign Keys
-    department_id = db.Column(db.Integer, db.ForeignKey("departments.id"))
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Optional link to a user account
+    department_id = db.Column(db.Integer, db.ForeignKey("departments.id"), index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)  # Optional link to a user account
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id', ondelete='SET NULL'), nullable=True, index=True)  # Set when promoted from a candidate
     documents = db.relationship('EmployeeDocument', back_populates='employee', cascade='all, delete-orphan')
 
 
@@ -121,10 +138,11 @@ class Department(db.Model):
     name = db.Column(db.String(120), unique=True, nullable=False)
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
-    employees = db.relationship("Employee", back_populates="department", lazy="selectin")
-    candidates = db.relationship("Candidate", back_populates="department", lazy="selectin")
+    # Relationships (loaded on access only; lists use modules/department/services.py for counts and pages)
+    employees = db.relationship("Employee", back_populates="department", lazy="select")
+    candidates = db.relationship("Candidate", back_populates="department", lazy="select")
 
     def __repr__(self):
         return f"<Department {self.name}>"
@@ -213,6 +231,14 @@ class ActivityLog(db.Model):
 # -------------------- LEAVE REQUEST --------------------
 class LeaveRequest(db.Model):
     __tablename__ = 'leave_requests'
+    __table_args__ = (
+        # overlap / availability range lookups (modules/leave/availability.py)
+        db.Index('ix_leave_requests_user_range', 'user_id', 'start_date', 'end_date'),
+        # approval queues (modules/leave/services.py pending_queue): an approver's own queue ...
+        db.Index('ix_leave_requests_approver_queue', 'approver_id', 'status', 'created_at'),
+        # ... and every queue's pending rows in page order (created_at, id), no sort step
+        db.Index('ix_leave_requests_status_queue', 'status', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -230,13 +256,45 @@ class LeaveRequest(db.Model):
     approver = db.relationship('User', foreign_keys=[approver_id], back_populates='approved_requests')
 
 
+# -------------------- LEAVE LEDGER --------------------
+class LeaveLedgerEntry(db.Model):
+    """One signed posting to a user's leave balance; the ledger is append-only"""
+    __tablename__ = 'leave_ledger'
+    __table_args__ = (
+        # idempotency key for periodic postings (accrual:2026-03, carry_over:2026)
+        db.UniqueConstraint('user_id', 'leave_type', 'reference', name='uix_leave_ledger_reference'),
+        db.Index('ix_leave_ledger_user_type', 'user_id', 'leave_type', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    leave_type = db.Column(db.String(30), nullable=False, default='annual')
+    kind = db.Column(db.String(20), nullable=False)  # accrual, consumption, adjustment, carry_over
+    days = db.Column(db.Float, nullable=False)       # + credits, - debits
+    leave_request_id = db.Column(db.Integer, db.ForeignKey('leave_requests.id'), nullable=True, index=True)
+    reference = db.Column(db.String(50), nullable=True)
+    note = db.Column(db.String(255), nullable=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class LeaveBalance(db.Model):
+    """Running total of leave_ledger per user and leave type, moved with every posting"""
+    __tablename__ = 'leave_balances'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    leave_type = db.Column(db.String(30), primary_key=True)
+    balance = db.Column(db.Float, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 # -------------------- CANDIDATE --------------------
 class Candidate(db.Model):
     __tablename__ = 'candidates'
 
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(120), nullable=False)
-    email = db.Column(db.String(120), nullable=True)
+    email = db.Column(db.String(120), nullable=True)  # duplicate checks on import use ix_candidates_email_lower
     phone = db.Column(db.String(20), nullable=True)
     nationality = db.Column(db.String(50), nullable=True)
     
@@ -245,27 +303,88 @@ class Candidate(db.Model):
     
     # NEW: Added specialty field
     specialty = db.Column(db.String(255), nullable=True)  # Specific field of work/specialization
+    specialty_id = db.Column(db.Integer, nullable=True, index=True)            # taxonomy id, see core/services/specialty_taxonomy.py
+    specialty_category_id = db.Column(db.Integer, nullable=True, index=True)   # taxonomy category id
     
     experience = db.Column(db.String(50), nullable=True)  # 0-2, 3-5, 6-10, 10+
     education = db.Column(db.String(50), nullable=True)   # High School, Bachelor's, Master's, PhD
     skills = db.Column(db.Text, nullable=True)           # Skills and qualifications
     
-    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=True)
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=True, index=True)
     cv_filepath = db.Column(db.String(255), nullable=True)
     
     # UPDATED: Changed from nullable to required (nullable=False)
     id_document_filepath = db.Column(db.String(255), nullable=False)
     
-    status = db.Column(db.String(50), default='new')
+    # active_history keeps the previous value around so status changes can be recorded
+    status = db.column_property(db.Column(db.String(50), default='new'), active_history=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     department = db.relationship("Department", back_populates="candidates", lazy=True)
 
+    @validates('specialty')
+    def _normalize_specialty(self, key, value):
+        # Keep the integer taxonomy ids in sync with the free-text specialty
+        from core.services.specialty_taxonomy import taxonomy
+        specialty_id = taxonomy.resolve(value)
+        self.specialty_id = specialty_id
+        self.specialty_category_id = taxonomy.category_id(specialty_id)
+        return taxonomy.name(specialty_id) or value
+
     def __repr__(self):
         return f"<Candidate {self.full_name} - {self.applied_position} ({self.status})>"
 
 
+
+# Case-insensitive email lookups (candidate import de-duplication)
+db.Index('ix_candidates_email_lower', db.func.lower(Candidate.email))
+
+
+# -------------------- CANDIDATE STATUS HISTORY --------------------
+class CandidateStatusEvent(db.Model):
+    __tablename__ = 'candidate_status_events'
+    __table_args__ = (
+        db.Index('ix_candidate_status_events_candidate_created', 'candidate_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id', ondelete='SET NULL'), nullable=True)
+    from_status = db.Column(db.String(50), nullable=True)  # None for the initial status
+    to_status = db.Column(db.String(50), nullable=False)
+
+    # Snapshot of the candidate's dimensions at the time of the change
+    specialty = db.Column(db.String(255), nullable=True)
+    nationality = db.Column(db.String(50), nullable=True)
+    department_id = db.Column(db.Integer, nullable=True)
+
+    changed_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    candidate = db.relationship('Candidate')
+
+    def __repr__(self):
+        return f"<CandidateStatusEvent {self.candidate_id}: {self.from_status} -> {self.to_status}>"
+
+
+class CandidateFunnelDaily(db.Model):
+    __tablename__ = 'candidate_funnel_daily'
+    __table_args__ = (
+        db.UniqueConstraint('day', 'status', 'specialty', 'nationality', 'department_id', name='uix_funnel_daily_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    status = db.Column(db.String(50), nullable=False)
+    specialty = db.Column(db.String(255), nullable=True)
+    nationality = db.Column(db.String(50), nullable=True)
+    department_id = db.Column(db.Integer, nullable=True)
+
+    entered_count = db.Column(db.Integer, nullable=False, default=0)   # transitions into `status`
+    exited_count = db.Column(db.Integer, nullable=False, default=0)    # transitions out of `status`
+    stage_seconds = db.Column(db.BigInteger, nullable=False, default=0)  # total time spent in `status` by those exits
+
+
 # -------------------- EmployeeDocument ----------------
 
 class EmployeeDocument(db.Model):
@@ -283,3 +402,124 @@ class EmployeeDocument(db.Model):
 
     def __repr__(self):
         return f"<EmployeeDocument id={self.id} filename={self.filename} employee_id={self.employee_id}>"
+
+
+# -------------------- BACKGROUND JOB --------------------
+class BackgroundJob(db.Model):
+    __tablename__ = 'background_jobs'
+    __table_args__ = (db.Index('ix_background_jobs_status_run_at', 'status', 'run_at'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=True)  # JSON-encoded handler arguments
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Text, nullable=True)  # JSON progress reported by long-running handlers
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.id} {self.kind} ({self.status}, attempt {self.attempts})>"
+
+
+# -------------------- EMAIL OUTBOX --------------------
+class EmailOutbox(db.Model):
+    __tablename__ = 'email_outbox'
+    __table_args__ = (db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    from_email = db.Column(db.String(120), nullable=False)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    html_body = db.Column(db.Text, nullable=False)
+    text_body = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<EmailOutbox {self.id} to={self.to_email} ({self.status})>"
+
+
+# -------------------- CHANGE LOG (mobile delta sync) --------------------
+class ChangeLog(db.Model):
+    """
+    Latest change per synced row. The AUTOINCREMENT id is the change sequence
+    clients sync from: every write replaces the entity's row with a new,
+    higher id, and deletions stay as tombstones (op='delete').
+    """
+    __tablename__ = 'change_log'
+    __table_args__ = (
+        db.UniqueConstraint('entity_type', 'entity_id', name='uix_change_log_entity'),
+        {'sqlite_autoincrement': True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(30), nullable=False)  # employee, department, request, leave
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # upsert / delete
+    owner_user_id = db.Column(db.Integer, nullable=True)  # set for per-user rows (requests, leaves)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ChangeLog {self.id} {self.op} {self.entity_type}:{self.entity_id}>"
+
+
+# -------------------- PUBLIC HOLIDAYS (working-day calendars) --------------------
+class Holiday(db.Model):
+    """Non-working day for one site; site 'default' holidays apply to every site"""
+    __tablename__ = 'holidays'
+    __table_args__ = (db.UniqueConstraint('site', 'date', name='uix_holiday_site_date'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    site = db.Column(db.String(50), nullable=False, default='default')
+    date = db.Column(db.Date, nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# -------------------- ORG HIERARCHY (closure of users.manager_id) --------------------
+class OrgClosure(db.Model):
+    """
+    One row per (manager, report) pair at any distance plus a depth-0 row per
+    user in the hierarchy; maintained by core/services/org_hierarchy.py
+    """
+    __tablename__ = 'org_closure'
+    __table_args__ = (db.Index('ix_org_closure_descendant_depth', 'descendant_id', 'depth'),)
+
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    depth = db.Column(db.Integer, nullable=False)
+
+
+# -------------------- TABLE VERSIONS (HTTP validators) --------------------
+class TableVersion(db.Model):
+    """Write counter per table, bumped by core/services/table_versions.py; used to build ETags"""
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# -------------------- SOFT DELETE FILTER --------------------
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted_rows(state):
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get("include_deleted", False)
+    ):
+        # Only top-level queries are filtered: navigating from a live row to a
+        # deleted one (leave.requester, ...) still works until the purge job runs
+        state.statement = state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None),
+                                 include_aliases=True, propagate_to_loaders=False)
+        )
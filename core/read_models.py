@@ -0,0 +1,81 @@
+# core/read_models.py
+# Read models for the hot list endpoints: column-only SELECTs with the joins
+# resolved in SQL. Rows come back as plain Row tuples (no ORM instances, no
+# identity map) and are serialized by the *_row schemas in core/schemas.py.
+# Soft-deleted rows are still hidden by the session's do_orm_execute filter.
+
+from sqlalchemy import select, func
+
+from core.extensions import db
+from core.models import Employee, Department, User, Candidate, EmployeeRequest
+from core.schemas import USER_LIST_FIELDS
+
+# Employee field -> labelled columns it needs (labels match the employee_row schema)
+EMPLOYEE_COLUMNS = {
+    'id': (Employee.id,),
+    'full_name': (Employee.full_name,),
+    'job_title': (Employee.job_title,),
+    'phone': (Employee.phone,),
+    'country': (Employee.country,),
+    'state': (Employee.state,),
+    'nationality': (Employee.nationality,),
+    'actual_address': (Employee.actual_address,),
+    'mother_country_address': (Employee.mother_country_address,),
+    'birth_date': (Employee.birth_date,),
+    'id_number': (Employee.id_number,),
+    'created_at': (Employee.created_at,),
+    'updated_at': (Employee.updated_at,),
+    'department': (Department.id.label('department_id'), Department.name.label('department_name')),
+    'role': (func.coalesce(User.role, 'employee').label('role'),),  # Default to employee if no user account
+    'user': (User.id.label('user_id'), User.email.label('user_email'), User.role.label('user_role')),
+}
+
+
+def _columns(registry, fields):
+    """Columns for `fields`, each label once, in field order"""
+    seen = {}
+    for field in fields:
+        for column in registry[field]:
+            seen.setdefault(column.key, column)
+    return list(seen.values())
+
+
+def employee_rows(fields):
+    """SELECT for the employee list; departments and user accounts are LEFT JOINed only when asked for"""
+    stmt = select(*_columns(EMPLOYEE_COLUMNS, ('id',) + tuple(fields))).select_from(Employee)
+    if 'department' in fields:
+        stmt = stmt.outerjoin(Department, Department.id == Employee.department_id)
+    if 'role' in fields or 'user' in fields:
+        stmt = stmt.outerjoin(User, User.id == Employee.user_id)
+    return stmt
+
+
+def candidate_rows():
+    return (
+        select(*Candidate.__table__.c, Department.name.label('department_name'))
+        .select_from(Candidate)
+        .outerjoin(Department, Department.id == Candidate.department_id)
+    )
+
+
+def user_rows(fields=USER_LIST_FIELDS):
+    return select(*[getattr(User, f) for f in fields])
+
+
+def request_rows():
+    return (
+        select(
+            EmployeeRequest.id, EmployeeRequest.user_id, EmployeeRequest.category, EmployeeRequest.subject,
+            EmployeeRequest.message, EmployeeRequest.status, EmployeeRequest.response,
+            EmployeeRequest.created_at, EmployeeRequest.updated_at,
+            User.id.label('requester_id'), User.name.label('requester_name'), User.role.label('requester_role'),
+            User.avatar.label('requester_avatar'), User.position.label('requester_position'),
+        )
+        .select_from(EmployeeRequest)
+        .outerjoin(User, User.id == EmployeeRequest.user_id)
+    )
+
+
+def fetch(stmt):
+    """Run a read-model SELECT and return its rows"""
+    return db.session.execute(stmt).all()
@@ -0,0 +1,166 @@
+# core/schemas.py
+# API shapes, declared once and shared by list, detail and sync endpoints.
+# Dates and datetimes are left as objects; the JSON provider writes them as ISO 8601.
+
+from core.serializers import SCHEMAS, schema, Nested, Joined, Method, compile_schema, dump, dump_many  # noqa: F401
+
+# ---------------- references (nested objects) ----------------
+schema('department_ref', {
+    'id': 'id',
+    'name': 'name',
+})
+
+schema('user_ref', {
+    'id': 'id',
+    'email': 'email',
+    'role': 'role',
+})
+
+schema('person_ref', {
+    'id': 'id',
+    'name': 'name',
+})
+
+schema('requester_ref', {
+    'id': 'id',
+    'name': 'name',
+    'role': 'role',
+    'avatar': 'avatar',
+    'position': 'position',
+})
+
+# ---------------- entities ----------------
+schema('employee', {
+    'id': 'id',
+    'full_name': 'full_name',
+    'job_title': 'job_title',
+    'phone': 'phone',
+    'country': 'country',
+    'state': 'state',
+    'nationality': 'nationality',
+    'actual_address': 'actual_address',
+    'mother_country_address': 'mother_country_address',
+    'birth_date': 'birth_date',
+    'id_number': 'id_number',
+    'id_type': 'id_type',
+    'department_id': 'department_id',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'department': Nested('department_ref'),
+    'role': Method(lambda e: e.user.role if e.user else 'employee'),  # Default to employee if no user account
+    'user': Nested('user_ref'),
+})
+
+schema('department', {
+    'id': 'id',
+    'name': 'name',
+    'description': 'description',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    # present on department_summaries() rows
+    'employee_count': 'employee_count',
+    'candidate_count': 'candidate_count',
+})
+
+schema('candidate', {
+    'id': 'id',
+    'full_name': 'full_name',
+    'email': 'email',
+    'phone': 'phone',
+    'nationality': 'nationality',
+    'applied_position': 'applied_position',
+    'specialty': 'specialty',
+    'specialty_id': 'specialty_id',
+    'specialty_category_id': 'specialty_category_id',
+    'experience': 'experience',
+    'education': 'education',
+    'skills': 'skills',
+    'status': 'status',
+    'cv_filepath': 'cv_filepath',
+    'id_document_filepath': 'id_document_filepath',
+    'updated_at': 'updated_at',
+    'department': Nested('department_ref'),
+    'created_at': 'created_at',
+})
+
+schema('user', {
+    'id': 'id',
+    'name': 'name',
+    'email': 'email',
+    'role': 'role',
+    'phone': 'phone',
+    'position': 'position',
+    'access_code': 'access_code',
+    'is_active': 'is_active',
+    'login_count': 'login_count',
+    'created_at': 'created_at',
+    'last_login': 'last_login',
+    'manager_id': 'manager_id',
+    'employee': Nested('employee', fields=('id', 'full_name')),
+})
+
+schema('leave', {
+    'id': 'id',
+    'user_id': 'user_id',
+    'requester': Nested('person_ref'),
+    'type': 'type',
+    'start_date': 'start_date',
+    'end_date': 'end_date',
+    'reason': 'reason',
+    'status': 'status',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+})
+
+schema('request', {
+    'id': 'id',
+    'user_id': 'user_id',
+    'user': Nested('requester_ref'),
+    'category': 'category',
+    'subject': 'subject',
+    'message': 'message',
+    'status': 'status',
+    'response': 'response',
+    'date': Method(lambda r: r.created_at.strftime('%Y-%m-%d') if r.created_at else None),
+    'updated_at': 'updated_at',
+})
+
+# ---------------- read-model rows (core/read_models.py) ----------------
+# Same output as the entity schemas; related objects come from joined columns
+DEPARTMENT_JOINED = Joined('department_id', {'id': 'department_id', 'name': 'department_name'})
+
+schema('employee_row', dict(
+    SCHEMAS['employee'],
+    department=DEPARTMENT_JOINED,
+    role='role',
+    user=Joined('user_id', {'id': 'user_id', 'email': 'user_email', 'role': 'user_role'}),
+))
+
+schema('candidate_row', dict(SCHEMAS['candidate'], department=DEPARTMENT_JOINED))
+
+schema('team_row', dict(SCHEMAS['user'], depth='depth'))
+
+schema('request_row', dict(SCHEMAS['request'], user=Joined('requester_id', {
+    'id': 'requester_id',
+    'name': 'requester_name',
+    'role': 'requester_role',
+    'avatar': 'requester_avatar',
+    'position': 'requester_position',
+})))
+
+# ---------------- field sets used by several endpoints ----------------
+EMPLOYEE_DETAIL_FIELDS = (
+    'id', 'full_name', 'job_title', 'phone', 'actual_address', 'mother_country_address', 'country',
+    'state', 'birth_date', 'id_number', 'nationality', 'department', 'user', 'created_at'
+)
+DEPARTMENT_SUMMARY_FIELDS = ('id', 'name', 'description', 'employee_count', 'candidate_count')
+USER_LIST_FIELDS = ('id', 'name', 'email', 'role', 'phone', 'position', 'is_active', 'created_at', 'last_login')
+USER_DETAIL_FIELDS = (
+    'id', 'name', 'email', 'role', 'phone', 'position', 'access_code', 'is_active',
+    'login_count', 'last_login', 'manager_id', 'employee'
+)
+USER_TEAM_FIELDS = ('id', 'name', 'email', 'role', 'position', 'manager_id', 'depth')
+LEAVE_OWN_FIELDS = ('id', 'type', 'start_date', 'end_date', 'reason', 'status', 'created_at')
+LEAVE_PENDING_FIELDS = ('id', 'requester', 'type', 'start_date', 'end_date', 'reason', 'created_at')
+REQUEST_OWN_FIELDS = ('id', 'category', 'subject', 'message', 'status', 'response', 'date')
+REQUEST_ALL_FIELDS = ('id', 'user', 'category', 'subject', 'message', 'status', 'response', 'date')
@@ -0,0 +1,135 @@
+# core/serializers.py
+# Declarative API schemas compiled once into plain dict-building functions,
+# plus an orjson-backed JSON provider for jsonify.
+
+from functools import lru_cache
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:
+    orjson = None
+
+# name -> {output key: field spec}
+SCHEMAS = {}
+
+
+class Nested:
+    """Serialize a related object with another schema (None stays None)"""
+
+    def __init__(self, schema, attr=None, fields=None):
+        self.schema = schema
+        self.attr = attr
+        self.fields = tuple(fields) if fields else None
+
+
+class Joined:
+    """
+    Related object whose columns were joined into a flat row (read models):
+    {output key: row attr}; None when the row's `present` column is NULL
+    """
+
+    def __init__(self, present, fields):
+        self.present = present
+        self.fields = fields
+
+
+class Method:
+    """Computed value: fn(obj)"""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+
+def schema(name, fields):
+    """
+    Register a schema. Field specs:
+      'attr'          -> obj.attr (dates/datetimes are encoded as ISO 8601 by the JSON provider)
+      Nested(...)     -> related object through another schema
+      Joined(...)     -> related object from columns joined into the row
+      Method(fn)      -> fn(obj)
+    """
+    SCHEMAS[name] = fields
+    compile_schema.cache_clear()
+    return fields
+
+
+@lru_cache(maxsize=None)
+def compile_schema(name, fields=None):
+    """
+    Build `obj -> dict` for a schema (optionally a subset of its fields) as one
+    generated function with a dict literal, so serializing a row is a single
+    call with plain attribute reads instead of a loop over getters.
+    """
+    spec = SCHEMAS[name]
+    keys = fields or tuple(spec)
+    unknown = [k for k in keys if k not in spec]
+    if unknown:
+        raise KeyError(f"Unknown field(s) for {name}: {', '.join(unknown)}")
+
+    env = {}
+    items = []
+    for i, key in enumerate(keys):
+        field = spec[key]
+        if isinstance(field, str):
+            expr = f"o.{field}"
+        elif isinstance(field, Nested):
+            sub = f"_n{i}"
+            env[sub] = compile_schema(field.schema, field.fields)
+            value = f"o.{field.attr or key}"
+            expr = f"(None if {value} is None else {sub}({value}))"
+        elif isinstance(field, Joined):
+            inner = ', '.join(f"{k!r}: o.{attr}" for k, attr in field.fields.items())
+            expr = f"(None if o.{field.present} is None else {{{inner}}})"
+        elif isinstance(field, Method):
+            fn = f"_m{i}"
+            env[fn] = field.fn
+            expr = f"{fn}(o)"
+        else:
+            raise TypeError(f"Bad field spec for {name}.{key}: {field!r}")
+        items.append(f"{key!r}: {expr}")
+
+    source = f"def serialize_{name}(o):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<schema {name}>", "exec"), env)
+    return env[f"serialize_{name}"]
+
+
+def dump(name, obj, fields=None):
+    return compile_schema(name, tuple(fields) if fields else None)(obj)
+
+
+def dump_many(name, objs, fields=None):
+    serialize = compile_schema(name, tuple(fields) if fields else None)
+    return [serialize(o) for o in objs]
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    jsonify() through orjson: native datetime/date (ISO 8601), dataclass and
+    UUID encoding; anything else falls back to Flask's default hook.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:  # json.dumps options (the session serializer's separators, ...)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:  # object_hook etc.: the session serializer untags tuples / Markup / datetimes with it
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+
+def init_json(app):
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,204 @@
+# core/services/bulk_update.py
+
+from datetime import datetime
+
+from sqlalchemy import update, insert, case, true
+
+from core.extensions import db
+from core.models import ActivityLog
+
+# Upper bound on rows a single bulk request may touch (keeps the IN list
+# well under SQLite's bound-parameter limit)
+MAX_BULK_TARGETS = 5000
+
+
+class BulkUpdateError(ValueError):
+    """Invalid bulk request (bad patch, bad filter, too many targets)"""
+
+
+def _coerce(field, value, kind):
+    if value is None:
+        return None
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        if str(value).lower() in ('1', 'true', 'yes'):
+            return True
+        if str(value).lower() in ('0', 'false', 'no'):
+            return False
+        raise BulkUpdateError(f"{field} must be true or false")
+    if kind is int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise BulkUpdateError(f"{field} must be an integer")
+    value = str(value).strip()
+    return value or None
+
+
+def validate_patch(patch, fields):
+    """
+    Check a patch against `fields` ({name: (type, validator or None)}).
+    Validators receive the coerced value and raise BulkUpdateError.
+    Returns the coerced patch.
+    """
+    if not isinstance(patch, dict) or not patch:
+        raise BulkUpdateError("patch must be a non-empty object")
+    unknown = [f for f in patch if f not in fields]
+    if unknown:
+        raise BulkUpdateError(f"Field(s) not allowed in a bulk update: {', '.join(unknown)}. "
+                              f"Allowed: {', '.join(fields)}")
+    values = {}
+    for field, value in patch.items():
+        kind, validator = fields[field]
+        values[field] = _coerce(field, value, kind)
+        if validator:
+            validator(values[field])
+    return values
+
+
+def parse_ids(ids):
+    """Deduplicated int ids in request order; raises BulkUpdateError"""
+    if not isinstance(ids, list) or not ids:
+        raise BulkUpdateError("ids must be a non-empty list of integers")
+    try:
+        requested = list(dict.fromkeys(int(i) for i in ids))
+    except (TypeError, ValueError):
+        raise BulkUpdateError("ids must be a list of integers")
+    if len(requested) > MAX_BULK_TARGETS:
+        raise BulkUpdateError(f"At most {MAX_BULK_TARGETS} ids per request")
+    return requested
+
+
+def resolve_targets(model, ids=None, filters=None, filter_fields=()):
+    """
+    Target ids for a bulk request: either an explicit id list or an equality
+    filter ({field: value or [values]}) on whitelisted columns.
+    Returns (requested_ids, existing_ids); requested_ids is None for a filter.
+    """
+    if bool(ids) == bool(filters):
+        raise BulkUpdateError("Send either 'ids' or 'filter'")
+
+    if ids:
+        requested = parse_ids(ids)
+        existing = set(db.session.scalars(db.select(model.id).where(model.id.in_(requested))))
+        return requested, existing
+
+    if not isinstance(filters, dict):
+        raise BulkUpdateError("filter must be an object")
+    unknown = [f for f in filters if f not in filter_fields]
+    if unknown:
+        raise BulkUpdateError(f"Unknown filter field(s): {', '.join(unknown)}. Allowed: {', '.join(filter_fields)}")
+
+    stmt = db.select(model.id)
+    for field, value in filters.items():
+        column = getattr(model, field)
+        if isinstance(value, list):
+            stmt = stmt.where(column.in_(value))
+        elif value is None:
+            stmt = stmt.where(column.is_(None))
+        else:
+            stmt = stmt.where(column == value)
+    existing = db.session.scalars(stmt.order_by(model.id).limit(MAX_BULK_TARGETS + 1)).all()
+    if len(existing) > MAX_BULK_TARGETS:
+        raise BulkUpdateError(f"The filter matches more than {MAX_BULK_TARGETS} rows, narrow it down")
+    return None, set(existing)
+
+
+def apply_bulk_update(model, ids, values, actor_id, label, skipped=None):
+    """
+    Apply `values` to every id in one UPDATE ... WHERE id IN (...) and record a
+    single activity-log entry, in one transaction. `ids` are existing rows;
+    `skipped` maps ids that must not be touched to a reason.
+    Returns the list of updated ids. The caller commits.
+    """
+    skipped = skipped or {}
+    targets = sorted(i for i in ids if i not in skipped)
+    if targets:
+        db.session.execute(
+            update(model).where(model.id.in_(targets)).values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    db.session.add(ActivityLog(
+        user_id=actor_id,
+        action='bulk_update',
+        target=label,
+        details=f"Set {', '.join(f'{k}={v!r}' for k, v in values.items())} "
+                f"on {len(targets)} {label}: {', '.join(map(str, targets[:200]))}"
+                + (" ..." if len(targets) > 200 else "")
+    ))
+    return targets
+
+
+def apply_bulk_decision(model, ids, values, actor_id, action, authorized=None, open_statuses=('pending',)):
+    """
+    Decide many rows at once (approve / reject / resolve ...):
+      - one SELECT classifies every id: not found, not authorized
+        (`authorized` is a SQL condition, default everyone) or already decided
+        (status outside `open_statuses`);
+      - one UPDATE applies `values` to the rest, re-checking the status so a
+        concurrent decision is not overwritten;
+      - one executemany writes an ActivityLog row per decided item.
+    Returns (requested, existing, updated, skipped, owners) for summarize();
+    owners maps every updated id to the row's user_id. The caller commits.
+    """
+    requested = parse_ids(ids)
+    allowed = case((authorized if authorized is not None else true(), True), else_=False)
+    rows = db.session.execute(
+        db.select(model.id, model.status, model.user_id, allowed).where(model.id.in_(requested))
+    ).all()
+
+    existing = {row[0] for row in rows}
+    skipped, owners = {}, {}
+    for row_id, status, user_id, is_allowed in rows:
+        if not is_allowed:
+            skipped[row_id] = 'not authorized to decide this item'
+        elif status not in open_statuses:
+            skipped[row_id] = f'already {status}'
+        else:
+            owners[row_id] = user_id
+
+    targets = sorted(owners)
+    updated = []
+    if targets:
+        result = db.session.execute(
+            update(model).where(model.id.in_(targets), model.status.in_(open_statuses)).values(**values)
+            .returning(model.id).execution_options(synchronize_session=False)
+        )
+        updated = sorted(r[0] for r in result)
+        for row_id in set(targets) - set(updated):
+            skipped[row_id] = 'decided concurrently'
+            owners.pop(row_id)
+
+    if updated:
+        now = datetime.utcnow()
+        db.session.execute(insert(ActivityLog), [{
+            'user_id': actor_id,
+            'action': action,
+            'target': f"{model.__tablename__}:{row_id}",
+            'details': f"Set {', '.join(f'{k}={v!r}' for k, v in values.items() if k in ('status', 'response'))} "
+                       f"on {model.__tablename__} #{row_id} (bulk)",
+            'timestamp': now,
+        } for row_id in updated])
+    return requested, existing, updated, skipped, owners
+
+
+def summarize(requested, existing, updated, skipped=None):
+    """Per-id outcome: updated / skipped (with reason) / not_found"""
+    skipped = skipped or {}
+    updated = set(updated)
+    results = []
+    for i in (requested if requested is not None else sorted(existing)):
+        if i in updated:
+            results.append({'id': i, 'status': 'updated'})
+        elif i in skipped:
+            results.append({'id': i, 'status': 'skipped', 'reason': skipped[i]})
+        else:
+            results.append({'id': i, 'status': 'not_found'})
+    return {
+        'matched': len(existing),
+        'updated': len(updated),
+        'skipped': len(skipped),
+        'not_found': sum(1 for r in results if r['status'] == 'not_found'),
+        'results': results,
+    }
@@ -0,0 +1,96 @@
+# core/services/change_log.py
+
+import logging
+from datetime import datetime
+from sqlalchemy import event, insert, or_
+from sqlalchemy.orm import Session
+
+from core.extensions import db
+from core.models import ChangeLog, Employee, Department, EmployeeRequest, LeaveRequest
+
+logger = logging.getLogger(__name__)
+
+# model -> (entity type, attribute holding the owning user id or None for shared rows)
+SYNCED_MODELS = {
+    Employee: ('employee', None),
+    Department: ('department', None),
+    EmployeeRequest: ('request', 'user_id'),
+    LeaveRequest: ('leave', 'user_id'),
+}
+SHARED_TYPES = ('employee', 'department')
+
+# REPLACE drops the entity's previous entry and inserts one with a fresh,
+# higher id (AUTOINCREMENT never reuses ids), so the id is a monotonic cursor.
+# SQLite runs one writer at a time, so ids also become visible in order.
+_RECORD = insert(ChangeLog).prefix_with('OR REPLACE')
+
+
+def _entry(entity_type, entity_id, op, owner_user_id=None):
+    return {
+        'entity_type': entity_type,
+        'entity_id': entity_id,
+        'op': op,
+        'owner_user_id': owner_user_id,
+        'changed_at': datetime.utcnow(),
+    }
+
+
+def record(model, ids, op='upsert', owners=None):
+    """
+    Log changes made by bulk statements that bypass the ORM unit of work.
+    Runs in the caller's transaction; `owners` maps id -> owning user id.
+    """
+    entity_type = SYNCED_MODELS[model][0]
+    owners = owners or {}
+    entries = [_entry(entity_type, i, op, owners.get(i)) for i in ids]
+    if entries:
+        db.session.execute(_RECORD, entries)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_changes(session, flush_context):
+    entries = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        spec = SYNCED_MODELS.get(type(obj))
+        if spec is None or obj.id is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        entity_type, owner_attr = spec
+        deleted = obj in session.deleted or getattr(obj, 'deleted_at', None) is not None
+        owner = getattr(obj, owner_attr) if owner_attr else None
+        entries[(entity_type, obj.id)] = _entry(entity_type, obj.id, 'delete' if deleted else 'upsert', owner)
+    if entries:
+        # Same connection and transaction as the flush: the log commits or rolls back with the data
+        session.connection().execute(_RECORD, list(entries.values()))
+
+
+def changes_since(user, since=0, limit=500, see_all=False):
+    """
+    Change entries after the `since` cursor, oldest first. Shared entities are
+    visible to everyone; requests and leaves only to their owner unless
+    `see_all`. Returns (entries, next_cursor, has_more).
+    """
+    query = ChangeLog.query.filter(ChangeLog.id > (since or 0))
+    if not see_all:
+        query = query.filter(or_(
+            ChangeLog.entity_type.in_(SHARED_TYPES),
+            ChangeLog.owner_user_id == user.id
+        ))
+    entries = query.order_by(ChangeLog.id.asc()).limit(limit + 1).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    next_cursor = entries[-1].id if entries else (since or 0)
+    return entries, next_cursor, has_more
+
+
+def backfill():
+    """Log every existing row once (initial setup of an existing database). Returns the count."""
+    total = 0
+    for model, (entity_type, owner_attr) in SYNCED_MODELS.items():
+        columns = [model.id] + ([getattr(model, owner_attr)] if owner_attr else [])
+        rows = db.session.query(*columns).all()
+        record(model, [r[0] for r in rows], owners={r[0]: r[1] for r in rows} if owner_attr else None)
+        total += len(rows)
+    db.session.commit()
+    return total
@@ -4,14 +4,25 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import logging
+from core.services.email_templates import render_email, render_many
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 class EmailService:
     """Service to handle email sending via cPanel SMTP"""
+
+    STATUS_SUBJECTS = {
+        'new': "Application Update | تحديث الطلب | Mise à jour de candidature - ALGHAITH",
+        'interviewed': "Interview Completed | تمت المقابلة | Entretien effectué - ALGHAITH",
+        'hired': "Congratulations | تهانينا | Félicitations - ALGHAITH",
+        'rejected': "Application Update | تحديث الطلب | Mise à jour de candidature - ALGHAITH",
+    }
     
     def __init__(self):
         self.smtp_server = os.getenv('SMTP_SERVER', 'mail.alghaithcompanies.group')
@@ -19,147 +30,272 @@ class EmailService:
         self.smtp_email = os.getenv('SMTP_EMAIL', 'hr@alghaithcompanies.group')
         self.smtp_password = os.getenv('SMTP_PASSWORD')
         self.company_email = os.getenv('COMPANY_EMAIL', 'hr@alghaithcompanies.group')
+        self.smtp_timeout = float(os.getenv('SMTP_TIMEOUT', 10))
+        self.smtp_use_ssl = os.getenv('SMTP_USE_SSL', 'true').lower() == 'true'
+        self.smtp_starttls = os.getenv('SMTP_STARTTLS', 'false').lower() == 'true'
+
+        # Outbox delivery limits (cPanel accounts cap messages per hour)
+        self.max_per_minute = int(os.getenv('SMTP_MAX_PER_MINUTE', 30))
+        self.max_per_hour = int(os.getenv('SMTP_MAX_PER_HOUR', 300))
+        self.max_per_connection = int(os.getenv('SMTP_MAX_PER_CONNECTION', 100))
+        self.max_attempts = int(os.getenv('EMAIL_MAX_ATTEMPTS', 5))
+        self.stale_after = int(os.getenv('EMAIL_STALE_AFTER_SECONDS', 900))
+        self._outbox_sender = None
     
-    def send_candidate_confirmation(self, candidate_name, candidate_email, position=''):
-        """Send multilingual confirmation email to candidate after successful application"""
+    def send_candidate_confirmation(self, candidate_name, candidate_email, position='', commit=True):
+        """Queue multilingual confirmation email to candidate after successful application"""
         subject = "Application Received | طلب التوظيف المستلم | Candidature reçue - ALGHAITH"
-        
-        html_body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; color: #333; line-height: 1.6;">
-            <div style="max-width: 600px; margin: 0 auto;">
-                <div style="background-color: #1e40af; padding: 20px; border-radius: 8px 8px 0 0; color: white;">
-                    <h1 style="margin: 0; text-align: center;">ALGHAITH International Group</h1>
-                    <p style="margin: 5px 0 0 0; text-align: center; opacity: 0.9; font-size: 14px;">مجموعة الغيث العالمية | ALGHAITH International Group</p>
-                </div>
-                
-                <!-- ENGLISH -->
-                <div style="background-color: #f5f7fa; padding: 30px; border-bottom: 2px solid #ddd;">
-                    <h2 style="color: #1e40af;">English</h2>
-                    <h3>Dear {candidate_name},</h3>
-                    
-                    <p>Thank you for submitting your application for the <strong>{position}</strong> position!</p>
-                    
-                    <p>We have successfully received your application and all supporting documents. Our HR team will carefully review your qualifications against our current requirements.</p>
-                    
-                    <div style="background-color: white; padding: 15px; border-left: 4px solid #3498db; margin: 20px 0;">
-                        <p style="margin: 0;"><strong>Application Status:</strong></p>
-                        <p style="margin: 10px 0 0 0;">Your application is now under review. We appreciate your interest in joining our team and will contact you if your profile matches our current hiring needs.</p>
-                    </div>
-                    
-                    <p>Due to the volume of applications we receive, we are only able to contact candidates who are selected for the next stage of our recruitment process.</p>
-                    
-                    <p>We wish you the best in your job search!</p>
-                    
-                    <p>Best regards,<br><strong>ALGHAITH HR Team</strong></p>
-                </div>
-                
-                <!-- ARABIC -->
-                <div style="background-color: #f5f7fa; padding: 30px; border-bottom: 2px solid #ddd; direction: rtl; text-align: right;">
-                    <h2 style="color: #1e40af;">العربية</h2>
-                    <h3>عزيزي/عزيزتي {candidate_name}،</h3>
-                    
-                    <p>شكراً لك على تقديم طلب التوظيف لوظيفة <strong>{position}</strong>!</p>
-                    
-                    <p>لقد استلمنا طلبك وجميع المستندات الداعمة بنجاح. سيقوم فريق الموارد البشرية لدينا بمراجعة مؤهلاتك بعناية وفقاً لمتطلباتنا الحالية.</p>
-                    
-                    <div style="background-color: white; padding: 15px; border-right: 4px solid #3498db; margin: 20px 0;">
-                        <p style="margin: 0;"><strong>حالة الطلب:</strong></p>
-                        <p style="margin: 10px 0 0 0;">طلبك قيد المراجعة الآن. نقدر اهتمامك بالانضمام إلى فريقنا وسنتواصل معك إذا كان ملفك الشخصي يتطابق مع احتياجاتنا التوظيفية الحالية.</p>
-                    </div>
-                    
-                    <p>نظراً لعدد الطلبات التي نتلقاها، فإننا نتواصل فقط مع المرشحين الذين يتم اختيارهم للمرحلة التالية من عملية التوظيف.</p>
-                    
-                    <p>نتمنى لك التوفيق في بحثك عن وظيفة!</p>
-                    
-                    <p>مع أطيب التحيات،<br><strong>فريق الموارد البشرية - الغيث</strong></p>
-                </div>
-                
-                <!-- FRENCH -->
-                <div style="background-color: #f5f7fa; padding: 30px; border-radius: 0 0 8px 8px;">
-                    <h2 style="color: #1e40af;">Français</h2>
-                    <h3>Cher/Chère {candidate_name},</h3>
-                    
-                    <p>Merci d'avoir soumis votre candidature pour le poste de <strong>{position}</strong>!</p>
-                    
-                    <p>Nous avons bien reçu votre candidature et tous les documents justificatifs. Notre équipe RH examinera attentivement vos qualifications par rapport à nos besoins actuels.</p>
-                    
-                    <div style="background-color: white; padding: 15px; border-left: 4px solid #3498db; margin: 20px 0;">
-                        <p style="margin: 0;"><strong>Statut de la candidature:</strong></p>
-                        <p style="margin: 10px 0 0 0;">Votre candidature est en cours d'examen. Nous apprécions votre intérêt à rejoindre notre équipe et vous contacterons si votre profil correspond à nos besoins de recrutement actuels.</p>
-                    </div>
-                    
-                    <p>En raison du volume de candidatures que nous recevons, nous ne pouvons contacter que les candidats sélectionnés pour l'étape suivante de notre processus de recrutement.</p>
-                    
-                    <p>Nous vous souhaitons bonne chance dans votre recherche d'emploi!</p>
-                    
-                    <p>Cordialement,<br><strong>Équipe RH ALGHAITH</strong></p>
-                </div>
-            </div>
-        </body>
-    </html>
-    """
-        return self.send_email(self.company_email, candidate_email, subject, html_body)
-    
-    def send_candidate_notification(self, candidate_name, candidate_email, phone, position):
-        """Send notification to HR team about new application"""
+        html_body, text_body = render_email(
+            'candidate_confirmation', candidate_name=candidate_name, position=position
+        )
+        return self.queue_email(candidate_email, subject, html_body, text_body=text_body, commit=commit)
+
+    def send_candidate_notification(self, candidate_name, candidate_email, phone, position, commit=True):
+        """Queue notification to HR team about new application"""
         subject = f"New Application: {candidate_name} - {position}"
-        
-        html_body = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto;">
-                    <h2>New Application Received</h2>
-                    
-                    <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
-                        <tr style="background-color: #f5f7fa;">
-                            <td style="padding: 10px; font-weight: bold; width: 30%;">Name:</td>
-                            <td style="padding: 10px;">{candidate_name}</td>
-                        </tr>
-                        <tr>
-                            <td style="padding: 10px; font-weight: bold;">Email:</td>
-                            <td style="padding: 10px;">{candidate_email}</td>
-                        </tr>
-                        <tr style="background-color: #f5f7fa;">
-                            <td style="padding: 10px; font-weight: bold;">Phone:</td>
-                            <td style="padding: 10px;">{phone}</td>
-                        </tr>
-                        <tr>
-                            <td style="padding: 10px; font-weight: bold;">Position:</td>
-                            <td style="padding: 10px;">{position}</td>
-                        </tr>
-                    </table>
-                </div>
-            </body>
-        </html>
+        html_body, text_body = render_email(
+            'candidate_notification',
+            candidate_name=candidate_name, candidate_email=candidate_email, phone=phone, position=position
+        )
+        return self.queue_email(self.company_email, subject, html_body, text_body=text_body, commit=commit)
+
+    def queue_status_updates(self, candidates, status, chunk_size=1000):
         """
-        
-        return self.send_email(self.company_email, self.company_email, subject, html_body)
-    
-    def send_email(self, from_email, to_email, subject, html_body):
-        """Generic email sender using SMTP with SSL"""
+        Queue a multilingual status-update email for each candidate (mass mailing).
+        Bodies are bulk-rendered and inserted into the outbox in chunks.
+        Returns the number of emails queued.
+        """
+        from core.extensions import db
+        from core.models import EmailOutbox
+
+        subject = self.STATUS_SUBJECTS.get(status, self.STATUS_SUBJECTS['new'])
+        recipients = [c for c in candidates if c.email]
+        contexts = ({'candidate_name': c.full_name, 'position': c.applied_position or ''} for c in recipients)
+        now = datetime.utcnow()
+
+        rows = []
+        queued = 0
+        for candidate, (html_body, text_body) in zip(recipients, render_many('candidate_status_update', contexts, status=status)):
+            rows.append({
+                'from_email': self.company_email,
+                'to_email': candidate.email,
+                'subject': subject,
+                'html_body': html_body,
+                'text_body': text_body,
+                'status': 'pending',
+                'attempts': 0,
+                'max_attempts': self.max_attempts,
+                'next_attempt_at': now,
+                'created_at': now,
+            })
+            if len(rows) >= chunk_size:
+                db.session.bulk_insert_mappings(EmailOutbox, rows)
+                queued += len(rows)
+                rows = []
+        if rows:
+            db.session.bulk_insert_mappings(EmailOutbox, rows)
+            queued += len(rows)
+        db.session.commit()
+        return queued
+
+    def queue_email(self, to_email, subject, html_body, text_body=None, from_email=None, commit=True):
+        """Persist an email in the outbox; the worker delivers it with drain_outbox()"""
+        from core.extensions import db
+        from core.models import EmailOutbox
+
+        message = EmailOutbox(
+            from_email=from_email or self.company_email,
+            to_email=to_email,
+            subject=subject,
+            html_body=html_body,
+            text_body=text_body,
+            status='pending',
+            max_attempts=self.max_attempts
+        )
+        db.session.add(message)
+        if commit:
+            db.session.commit()
+        return message
+
+    def build_message(self, from_email, to_email, subject, html_body, text_body=None):
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"ALGHAITH HR Team <{from_email}>"
+        msg['To'] = to_email
+
+        # Plain-text part first so clients prefer the HTML part
+        if text_body:
+            msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
+        msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+        return msg
+
+    def send_email(self, from_email, to_email, subject, html_body, text_body=None):
+        """Send a single email immediately over a one-off connection"""
         try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"ALGHAITH HR Team <{from_email}>"
-            msg['To'] = to_email
-            
-            part = MIMEText(html_body, 'html')
-            msg.attach(part)
-            
-            # Connect to SMTP server with SSL (port 465)
-            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port)
-            server.login(self.smtp_email, self.smtp_password)
-            server.sendmail(from_email, to_email, msg.as_string())
-            server.quit()
-            
+            with SMTPSender(self) as sender:
+                sender.send(from_email, to_email, self.build_message(from_email, to_email, subject, html_body, text_body))
+
             logger.info(f"✅ Email sent successfully to {to_email}")
             return True
-        
+
         except Exception as e:
             logger.error(f"❌ Failed to send email to {to_email}: {str(e)}")
             return False
 
+    def drain_outbox(self, batch_size=50):
+        """
+        Deliver up to `batch_size` due outbox messages over one authenticated
+        connection. Failed messages are retried with backoff. Returns the
+        number of messages attempted.
+        """
+        from core.extensions import db
+        from core.models import EmailOutbox
+        from core.services.job_queue import backoff_delay
+
+        # Rows left 'sending' by a crashed worker go back in the queue
+        stale_cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        EmailOutbox.query.filter(
+            EmailOutbox.status == 'sending',
+            EmailOutbox.next_attempt_at < stale_cutoff
+        ).update({'status': 'pending'}, synchronize_session=False)
+        db.session.commit()
+
+        sender = self._sender()
+        budget = min(batch_size, sender.hourly_budget())
+        if budget <= 0:
+            sender.close()
+            return 0
+
+        now = datetime.utcnow()
+        due_ids = [row_id for (row_id,) in db.session.query(EmailOutbox.id).filter(
+            EmailOutbox.status == 'pending',
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.next_attempt_at.asc()).limit(budget).all()]
+        if not due_ids:
+            sender.close()
+            return 0
+
+        # Claim each row with a conditional UPDATE (as claim_jobs does) and send
+        # only the rows this drain claimed, so overlapping workers never share one
+        claimed = []
+        for row_id in due_ids:
+            updated = EmailOutbox.query.filter_by(id=row_id, status='pending').update({
+                'status': 'sending',
+                'attempts': EmailOutbox.attempts + 1,
+                'next_attempt_at': now
+            }, synchronize_session=False)
+            if updated:
+                claimed.append(row_id)
+        db.session.commit()
+        if not claimed:
+            sender.close()
+            return 0
+
+        messages = EmailOutbox.query.filter(EmailOutbox.id.in_(claimed))\
+            .order_by(EmailOutbox.next_attempt_at.asc(), EmailOutbox.id.asc()).all()
+
+        for message in messages:
+            try:
+                sender.send(message.from_email, message.to_email, self.build_message(
+                    message.from_email, message.to_email, message.subject, message.html_body, message.text_body
+                ))
+                message.status = 'sent'
+                message.sent_at = datetime.utcnow()
+                message.last_error = None
+            except Exception as e:
+                message.last_error = str(e)[:2000]
+                if message.attempts >= message.max_attempts:
+                    message.status = 'failed'
+                    logger.error(f"❌ Giving up on email {message.id} to {message.to_email}: {e}")
+                else:
+                    message.status = 'pending'
+                    message.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff_delay(message.attempts))
+                    logger.warning(f"Email {message.id} to {message.to_email} failed (attempt {message.attempts}): {e}")
+            db.session.commit()
+
+        sender.close()
+        return len(messages)
+
+    def _sender(self):
+        # One sender per process keeps the rate-limit window across drains
+        if self._outbox_sender is None:
+            self._outbox_sender = SMTPSender(self)
+        return self._outbox_sender
+
+
+class SMTPSender:
+    """
+    Reusable SMTP connection. Logs in once, sends many messages, reconnects
+    when the server drops the session and throttles to the provider's caps
+    (SMTP_MAX_PER_MINUTE, SMTP_MAX_PER_HOUR, SMTP_MAX_PER_CONNECTION).
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.server = None
+        self.sent_on_connection = 0
+        self.sent_times = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def connect(self):
+        svc = self.service
+        if svc.smtp_use_ssl:
+            server = smtplib.SMTP_SSL(svc.smtp_server, svc.smtp_port, timeout=svc.smtp_timeout)
+        else:
+            server = smtplib.SMTP(svc.smtp_server, svc.smtp_port, timeout=svc.smtp_timeout)
+            if svc.smtp_starttls:
+                server.starttls()
+        if svc.smtp_password:
+            server.login(svc.smtp_email, svc.smtp_password)
+        self.server = server
+        self.sent_on_connection = 0
+        return server
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+
+    def hourly_budget(self):
+        self._prune(time.monotonic())
+        return self.service.max_per_hour - len(self.sent_times)
+
+    def send(self, from_email, to_email, msg):
+        self._throttle()
+        if self.server is None or self.sent_on_connection >= self.service.max_per_connection:
+            self.close()
+            self.connect()
+
+        try:
+            self.server.sendmail(from_email, to_email, msg.as_string())
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError):
+            # Stale session: reconnect once and retry this message
+            self.close()
+            self.connect()
+            self.server.sendmail(from_email, to_email, msg.as_string())
+
+        self.sent_on_connection += 1
+        self.sent_times.append(time.monotonic())
+
+    def _prune(self, now):
+        while self.sent_times and now - self.sent_times[0] >= 3600:
+            self.sent_times.popleft()
+
+    def _throttle(self):
+        now = time.monotonic()
+        self._prune(now)
+        recent = [t for t in self.sent_times if now - t < 60]
+        if len(recent) >= self.service.max_per_minute:
+            time.sleep(max(60 - (now - recent[0]), 0))
+
 
 # Create singleton instance
 email_service = EmailService()
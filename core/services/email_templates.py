@@ -0,0 +1,120 @@
+# core/services/email_templates.py
+
+import os
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoescape
+from markupsafe import Markup
+
+EMAIL_TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'templates', 'emails'
+)
+
+# One environment per process: templates are compiled on first use and kept
+# in Jinja's cache (cache_size=-1 never evicts, auto_reload skips mtime checks).
+_env = Environment(
+    loader=FileSystemLoader(EMAIL_TEMPLATE_DIR),
+    autoescape=select_autoescape(['html']),
+    cache_size=-1,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+
+# ------------------------
+# HTML -> plain text
+# ------------------------
+class _TextExtractor(HTMLParser):
+    BLOCK_TAGS = {'p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'li', 'table'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('style', 'script'):
+            self._skip += 1
+        elif tag == 'br':
+            self.parts.append('\n')
+        elif tag == 'td':
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in ('style', 'script'):
+            self._skip = max(self._skip - 1, 0)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n\n')
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(re.sub(r'\s+', ' ', data))
+
+
+def html_to_text(html):
+    """Cheap HTML to plain-text conversion for the text/plain alternative"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    text = ''.join(parser.parts)
+    text = '\n'.join(line.strip() for line in text.splitlines())
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+# ------------------------
+# Static fragments (cached per locale)
+# ------------------------
+def _fragment_template(name, locale):
+    try:
+        return _env.get_template(f"fragments/{name}.{locale}.html")
+    except TemplateNotFound:
+        return _env.get_template(f"fragments/{name}.html")
+
+
+@lru_cache(maxsize=256)
+def html_fragment(name, locale='en', **static_context):
+    """Render a fragment that does not depend on the recipient, once per locale/context"""
+    return Markup(_fragment_template(name, locale).render(**static_context))
+
+
+@lru_cache(maxsize=256)
+def text_fragment(name, locale='en', **static_context):
+    return html_to_text(html_fragment(name, locale, **static_context))
+
+
+# ------------------------
+# Rendering
+# ------------------------
+def _templates(template_name):
+    html_template = _env.get_template(f"{template_name}.html")
+    try:
+        text_template = _env.get_template(f"{template_name}.txt")
+    except TemplateNotFound:
+        text_template = None
+    return html_template, text_template
+
+
+def render_email(template_name, **context):
+    """Render one email. Returns (html_body, text_body)."""
+    return next(render_many(template_name, [context]))
+
+
+def render_many(template_name, contexts, **shared_context):
+    """
+    Render a template for many recipients. Templates and static fragments
+    are resolved once; each context only pays for its personalized fields.
+    Yields (html_body, text_body) in the order of `contexts`.
+    """
+    html_template, text_template = _templates(template_name)
+    html_globals = dict(shared_context, fragment=html_fragment)
+    text_globals = dict(shared_context, fragment=text_fragment)
+
+    for context in contexts:
+        html_body = html_template.render(html_globals, **context)
+        if text_template is not None:
+            text_body = text_template.render(text_globals, **context)
+        else:
+            text_body = html_to_text(html_body)
+        yield html_body, text_body
@@ -0,0 +1,151 @@
+# core/services/job_queue.py
+
+import json
+import logging
+from datetime import datetime, timedelta
+from flask import current_app
+from core.extensions import db
+from core.models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# kind -> callable(payload: dict)
+JOB_HANDLERS = {}
+
+# Id of the job the current worker is running (read by report_progress)
+_running_job_id = None
+
+
+def job_handler(kind):
+    """Register a function as the handler for jobs of the given kind"""
+    def decorator(f):
+        JOB_HANDLERS[kind] = f
+        return f
+    return decorator
+
+
+def enqueue(kind, payload=None, run_at=None, max_attempts=None, commit=True):
+    """Persist a job so a worker picks it up outside the request cycle"""
+    job = BackgroundJob(
+        kind=kind,
+        payload=json.dumps(payload or {}),
+        status='pending',
+        attempts=0,
+        max_attempts=max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 5),
+        run_at=run_at or datetime.utcnow()
+    )
+    db.session.add(job)
+    if commit:
+        db.session.commit()
+    return job
+
+
+def backoff_delay(attempts):
+    """Exponential backoff in seconds: base, 2*base, 4*base ... capped"""
+    base = current_app.config.get('JOB_BACKOFF_SECONDS', 30)
+    cap = current_app.config.get('JOB_BACKOFF_MAX_SECONDS', 3600)
+    return min(base * (2 ** max(attempts - 1, 0)), cap)
+
+
+def requeue_stale_jobs():
+    """Put back jobs left 'running' by a worker that died mid-flight"""
+    stale_after = current_app.config.get('JOB_STALE_AFTER_SECONDS', 900)
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+    count = BackgroundJob.query.filter(
+        BackgroundJob.status == 'running',
+        BackgroundJob.updated_at < cutoff
+    ).update({'status': 'pending', 'run_at': datetime.utcnow()}, synchronize_session=False)
+    db.session.commit()
+    return count
+
+
+def claim_jobs(limit=20, kinds=None):
+    """
+    Claim up to `limit` due jobs. Each claim is a conditional UPDATE so two
+    workers polling the same table never run the same job.
+    """
+    query = BackgroundJob.query.filter(
+        BackgroundJob.status == 'pending',
+        BackgroundJob.run_at <= datetime.utcnow()
+    )
+    if kinds:
+        query = query.filter(BackgroundJob.kind.in_(kinds))
+    candidates = [job_id for (job_id,) in query.order_by(BackgroundJob.run_at.asc())
+                  .with_entities(BackgroundJob.id).limit(limit).all()]
+
+    claimed = []
+    for job_id in candidates:
+        updated = BackgroundJob.query.filter_by(id=job_id, status='pending')\
+            .update({
+                'status': 'running',
+                'attempts': BackgroundJob.attempts + 1,
+                'updated_at': datetime.utcnow()
+            }, synchronize_session=False)
+        if updated:
+            claimed.append(job_id)
+    db.session.commit()
+
+    if not claimed:
+        return []
+    return BackgroundJob.query.filter(BackgroundJob.id.in_(claimed))\
+        .order_by(BackgroundJob.run_at.asc()).all()
+
+
+def run_job(job):
+    """Run a claimed job and record the outcome (done, retry later, or failed)"""
+    global _running_job_id
+    handler = JOB_HANDLERS.get(job.kind)
+
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind '{job.kind}'")
+        _running_job_id = job.id
+        handler(json.loads(job.payload or '{}'))
+        job.status = 'done'
+        job.last_error = None
+    except Exception as e:
+        db.session.rollback()
+        job = db.session.get(BackgroundJob, job.id)
+        job.last_error = str(e)[:2000]
+        if job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            logger.error(f"❌ Job {job.id} ({job.kind}) failed permanently: {e}")
+        else:
+            job.status = 'pending'
+            job.run_at = datetime.utcnow() + timedelta(seconds=backoff_delay(job.attempts))
+            logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, retrying at {job.run_at}: {e}")
+    finally:
+        _running_job_id = None
+
+    db.session.commit()
+    return job.status
+
+
+def job_progress():
+    """Progress saved by an earlier attempt of the running job ({} on the first run)"""
+    if _running_job_id is None:
+        return {}
+    progress = db.session.query(BackgroundJob.progress).filter_by(id=_running_job_id).scalar()
+    return json.loads(progress) if progress else {}
+
+
+def report_progress(progress):
+    """
+    Save progress for the running job. Nothing is committed here: the handler's
+    own commit persists the progress together with the batch it describes. The
+    updated_at bump also keeps a long job from being requeued as stale.
+    """
+    if _running_job_id is None:
+        return
+    BackgroundJob.query.filter_by(id=_running_job_id).update({
+        'progress': json.dumps(progress),
+        'updated_at': datetime.utcnow()
+    }, synchronize_session=False)
+
+
+def run_pending(limit=20, kinds=None):
+    """Claim and run one batch of due jobs. Returns the number of jobs processed."""
+    jobs = claim_jobs(limit=limit, kinds=kinds)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
@@ -0,0 +1,140 @@
+# core/services/org_hierarchy.py
+# Reporting lines: users.manager_id holds each user's direct manager and the
+# org_closure table holds every (manager, report, distance) pair derived from
+# it, so "everyone under X", "X's approval chain" and "is X above Y" are each
+# one indexed lookup instead of a recursive walk. Change reporting lines only
+# through set_manager() / remove_user(), which keep both in step.
+from sqlalchemy import select, insert, delete, update, func, literal, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased
+
+from core.extensions import db
+from core.models import OrgClosure, User
+
+
+def ensure_nodes(user_ids):
+    """Depth-0 rows for users not yet in the closure table"""
+    rows = [{'ancestor_id': i, 'descendant_id': i, 'depth': 0} for i in set(user_ids) if i is not None]
+    if rows:
+        db.session.execute(sqlite_insert(OrgClosure).on_conflict_do_nothing(), rows)
+
+
+# ------------------------
+# Lookups
+# ------------------------
+def reports_query(manager_id, max_depth=None):
+    """SELECT of the user ids under `manager_id` (direct reports are depth 1), for IN filters"""
+    stmt = select(OrgClosure.descendant_id).where(OrgClosure.ancestor_id == manager_id, OrgClosure.depth > 0)
+    if max_depth is not None:
+        stmt = stmt.where(OrgClosure.depth <= max_depth)
+    return stmt
+
+
+def reports_under(manager_id, max_depth=None):
+    """Ids of every user reporting to `manager_id`, directly or not"""
+    return db.session.execute(reports_query(manager_id, max_depth)).scalars().all()
+
+
+def team_size(manager_id):
+    return db.session.execute(
+        select(func.count()).select_from(reports_query(manager_id).subquery())
+    ).scalar()
+
+
+def approvers_for(user_id):
+    """The management chain above `user_id`, nearest manager first (deleted accounts left out)"""
+    return User.query.join(OrgClosure, OrgClosure.ancestor_id == User.id).filter(
+        OrgClosure.descendant_id == user_id, OrgClosure.depth > 0
+    ).order_by(OrgClosure.depth).all()
+
+
+def manager_of(user_id):
+    """Direct manager id of `user_id` (None at the top or when unset)"""
+    return db.session.query(User.manager_id).filter(User.id == user_id)\
+        .execution_options(include_deleted=True).scalar()
+
+
+def in_chain(manager_id, user_id):
+    """True when `manager_id` is above `user_id` at any level"""
+    return db.session.query(
+        select(OrgClosure.depth).where(
+            OrgClosure.ancestor_id == manager_id, OrgClosure.descendant_id == user_id, OrgClosure.depth > 0
+        ).exists()
+    ).scalar()
+
+
+# ------------------------
+# Changes (the caller commits)
+# ------------------------
+def set_manager(user_id, manager_id):
+    """
+    Move `user_id` and everyone under them below `manager_id` (None detaches
+    them). Raises ValueError for an unknown manager or a loop.
+    """
+    if manager_id is not None:
+        if manager_id == user_id:
+            raise ValueError("A user cannot be their own manager")
+        if db.session.get(User, manager_id) is None:
+            raise ValueError(f"Manager {manager_id} not found")
+        if in_chain(user_id, manager_id):
+            raise ValueError("The new manager reports to this user; that would create a loop")
+    _move(user_id, manager_id)
+
+
+def _move(user_id, manager_id):
+    ensure_nodes([user_id, manager_id])
+
+    subtree = select(OrgClosure.descendant_id).where(OrgClosure.ancestor_id == user_id)
+    # Cut the subtree loose from its old managers (links inside it stay) ...
+    db.session.execute(delete(OrgClosure).where(
+        OrgClosure.descendant_id.in_(subtree), OrgClosure.ancestor_id.not_in(subtree)
+    ).execution_options(synchronize_session=False))
+    # ... and hang it under every row above the new manager
+    if manager_id is not None:
+        above, below = aliased(OrgClosure), aliased(OrgClosure)
+        db.session.execute(insert(OrgClosure).from_select(
+            ['ancestor_id', 'descendant_id', 'depth'],
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .join(below, true())  # every manager above x every member of the subtree
+            .where(above.descendant_id == manager_id, below.ancestor_id == user_id)
+        ))
+    db.session.execute(update(User).where(User.id == user_id).values(manager_id=manager_id)
+                       .execution_options(synchronize_session=False))
+
+
+def remove_user(user_id):
+    """Hand a leaving user's direct reports to their own manager and drop them from the hierarchy"""
+    manager_id = manager_of(user_id)
+    for report_id in reports_under(user_id, max_depth=1):
+        _move(report_id, manager_id)
+    _move(user_id, None)
+    db.session.execute(delete(OrgClosure).where(OrgClosure.ancestor_id == user_id)
+                       .execution_options(synchronize_session=False))
+
+
+def rebuild():
+    """
+    Recompute org_closure from users.manager_id one level at a time (after
+    imports or manual edits). Raises ValueError on a reporting loop; the
+    caller commits. Returns the number of rows.
+    """
+    db.session.execute(delete(OrgClosure))
+    db.session.execute(insert(OrgClosure).from_select(
+        ['ancestor_id', 'descendant_id', 'depth'], select(User.id, User.id, literal(0))
+    ))
+    depth = 0
+    while True:
+        try:
+            added = db.session.execute(insert(OrgClosure).from_select(
+                ['ancestor_id', 'descendant_id', 'depth'],
+                select(User.manager_id, OrgClosure.descendant_id, OrgClosure.depth + 1)
+                .join(User, User.id == OrgClosure.ancestor_id)
+                .where(OrgClosure.depth == depth, User.manager_id.isnot(None))
+            )).rowcount
+        except IntegrityError:
+            # in a tree every (ancestor, descendant) path is unique; a repeat means a loop
+            raise ValueError("users.manager_id contains a reporting loop")
+        if not added:
+            return db.session.query(func.count()).select_from(OrgClosure).scalar()
+        depth += 1
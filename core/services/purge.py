@@ -0,0 +1,52 @@
+# core/services/purge.py
+
+import os
+import shutil
+from flask import current_app
+from sqlalchemy import delete
+
+from core.extensions import db
+from core.services.job_queue import report_progress
+
+PURGE_BATCH_SIZE = 200
+
+
+def remove_upload(relative_path):
+    """Delete a file under UPLOAD_FOLDER; returns 1 if a file was removed (missing files are fine)"""
+    if not relative_path:
+        return 0
+    try:
+        os.remove(os.path.join(current_app.config['UPLOAD_FOLDER'], relative_path))
+        return 1
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        current_app.logger.warning(f"Could not remove upload {relative_path}: {e}")
+        return 0
+
+
+def remove_upload_dir(*parts):
+    shutil.rmtree(os.path.join(current_app.config['UPLOAD_FOLDER'], *map(str, parts)), ignore_errors=True)
+
+
+def purge_rows(model, condition, progress, key, batch_size=PURGE_BATCH_SIZE, filepath_column=None):
+    """
+    Delete the rows of `model` matching `condition` in id-ordered batches.
+    Files named by `filepath_column` are removed before their rows. Every batch
+    is committed together with the updated `progress[key]` count, so a job
+    that dies part-way continues from the rows that are left.
+    Yields the ids of each deleted batch.
+    """
+    columns = [model.id] + ([filepath_column] if filepath_column is not None else [])
+    while True:
+        rows = db.session.query(*columns).filter(condition).order_by(model.id).limit(batch_size).all()
+        if not rows:
+            return
+        if filepath_column is not None:
+            progress['files'] = progress.get('files', 0) + sum(remove_upload(r[1]) for r in rows)
+        ids = [r[0] for r in rows]
+        db.session.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+        progress[key] = progress.get(key, 0) + len(ids)
+        report_progress(progress)
+        db.session.commit()
+        yield ids
@@ -0,0 +1,286 @@
+# core/services/search_index.py
+
+import re
+import logging
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from core.extensions import db
+from core.models import Employee, User, Candidate, EmployeeRequest, UserDocument, EmployeeDocument
+
+logger = logging.getLogger(__name__)
+
+# FTS5 table: title/subtitle/body are matched, the rest is carried for filtering.
+# Rows are keyed by rowid = type code << 40 | entity id so updates and deletes
+# are primary-key operations instead of full-table scans on the UNINDEXED columns.
+SEARCH_TABLE_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    title, subtitle, body,
+    entity_type UNINDEXED,
+    entity_id UNINDEXED,
+    owner_user_id UNINDEXED,
+    visibility UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+ENTITY_TYPES = {
+    'employee': 1,
+    'user': 2,
+    'candidate': 3,
+    'request': 4,
+    'user_document': 5,
+    'employee_document': 6,
+}
+_ROWID_SHIFT = 40
+
+PRIVILEGED_ROLES = {'it_manager', 'general_director'}
+MANAGER_ROLES = {'general_manager', 'head_of_department', 'manager'}
+# Entity types a role can see in full; everything else is limited to the
+# user's own rows (and shared user documents)
+VISIBLE_TYPES = {
+    'privileged': set(ENTITY_TYPES),
+    'manager': {'employee', 'user', 'candidate', 'request'},
+    'employee': {'employee'},
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_RESULTS = 50
+
+
+def _join(*parts):
+    return " ".join(str(p) for p in parts if p)
+
+
+# ------------------------
+# Entity -> index row
+# ------------------------
+def _employee_row(e):
+    return dict(title=e.full_name, subtitle=e.job_title,
+                body=_join(e.phone, e.nationality, e.country, e.state),
+                owner_user_id=e.user_id, visibility=None)
+
+
+def _user_row(u):
+    return dict(title=u.name, subtitle=u.email,
+                body=_join(u.position, u.role, u.phone),
+                owner_user_id=u.id, visibility=None)
+
+
+def _candidate_row(c):
+    return dict(title=c.full_name, subtitle=_join(c.applied_position, c.specialty),
+                body=_join(c.email, c.phone, c.nationality, c.skills),
+                owner_user_id=None, visibility=None)
+
+
+def _request_row(r):
+    return dict(title=r.subject, subtitle=r.category, body=r.message,
+                owner_user_id=r.user_id, visibility=None)
+
+
+def _user_document_row(d):
+    return dict(title=d.filename, subtitle=d.document_type, body=None,
+                owner_user_id=d.owner_id if d.owner_type == 'user' else d.user_id,
+                visibility=d.visibility_type)
+
+
+def _employee_document_row(d):
+    return dict(title=d.filename, subtitle=d.document_type, body=None,
+                owner_user_id=d.employee.user_id if d.employee else None,
+                visibility=d.visibility_type)
+
+
+INDEXED_MODELS = {
+    Employee: ('employee', _employee_row),
+    User: ('user', _user_row),
+    Candidate: ('candidate', _candidate_row),
+    EmployeeRequest: ('request', _request_row),
+    UserDocument: ('user_document', _user_document_row),
+    EmployeeDocument: ('employee_document', _employee_document_row),
+}
+
+
+def _rowid(entity_type, entity_id):
+    return (ENTITY_TYPES[entity_type] << _ROWID_SHIFT) | entity_id
+
+
+# ------------------------
+# Schema / maintenance
+# ------------------------
+def ensure_search_index(rebuild_if_created=True):
+    """Create the FTS5 table if missing; a newly created index is filled from the tables"""
+    with db.engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+        )).first()
+        if not exists:
+            conn.execute(text(SEARCH_TABLE_DDL))
+    if not exists and rebuild_if_created:
+        rebuild()
+
+
+def _write(conn, upserts, deletes):
+    if deletes:
+        conn.execute(text("DELETE FROM search_index WHERE rowid = :rowid"),
+                     [{'rowid': _rowid(t, i)} for t, i in deletes])
+    if upserts:
+        conn.execute(text("DELETE FROM search_index WHERE rowid = :rowid"),
+                     [{'rowid': _rowid(t, i)} for t, i, _ in upserts])
+        conn.execute(text(
+            "INSERT INTO search_index (rowid, title, subtitle, body, entity_type, entity_id, owner_user_id, visibility) "
+            "VALUES (:rowid, :title, :subtitle, :body, :entity_type, :entity_id, :owner_user_id, :visibility)"
+        ), [dict(row, rowid=_rowid(t, i), entity_type=t, entity_id=i) for t, i, row in upserts])
+
+
+def reindex(model, ids, chunk_size=1000):
+    """Index (or re-index) the given rows; used after bulk inserts that skip the ORM hooks"""
+    entity_type, build = INDEXED_MODELS[model]
+    ids = list(ids)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        rows = model.query.filter(model.id.in_(chunk)).all()
+        with db.engine.begin() as conn:
+            _write(conn, [(entity_type, r.id, build(r)) for r in rows], [])
+
+
+def remove(model, ids):
+    """Drop the given rows from the index; used by bulk deletes that skip the ORM hooks"""
+    entity_type = INDEXED_MODELS[model][0]
+    ids = list(ids)
+    if ids:
+        with db.engine.begin() as conn:
+            _write(conn, [], [(entity_type, i) for i in ids])
+
+
+def rebuild(chunk_size=1000):
+    """Drop every entry and index all rows again. Returns the number of indexed rows."""
+    total = 0
+    with db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM search_index"))
+    for model, (entity_type, build) in INDEXED_MODELS.items():
+        # Keyset chunks: no read cursor stays open while the index connection writes
+        last_id = 0
+        while True:
+            rows = model.query.filter(model.id > last_id).order_by(model.id).limit(chunk_size).all()
+            if not rows:
+                break
+            batch = [(entity_type, obj.id, build(obj)) for obj in rows]
+            with db.engine.begin() as conn:
+                _write(conn, batch, [])
+            total += len(batch)
+            last_id = rows[-1].id
+    with db.engine.begin() as conn:
+        conn.execute(text("INSERT INTO search_index (search_index) VALUES ('optimize')"))
+    return total
+
+
+# ------------------------
+# Incremental updates (ORM session hooks)
+# ------------------------
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault('search_pending', {})
+    for obj in list(session.new) + list(session.dirty):
+        spec = INDEXED_MODELS.get(type(obj))
+        if spec is None or obj.id is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        entity_type, build = spec
+        if getattr(obj, 'deleted_at', None) is not None:  # logically deleted
+            pending[(entity_type, obj.id)] = None
+            continue
+        try:
+            pending[(entity_type, obj.id)] = build(obj)
+        except Exception as e:  # never break the user's transaction for the index
+            logger.warning("search index: could not build %s %s: %s", entity_type, obj.id, e)
+
+    for obj in session.deleted:
+        spec = INDEXED_MODELS.get(type(obj))
+        if spec is not None and obj.id is not None:
+            pending[(spec[0], obj.id)] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    pending = session.info.pop('search_pending', None)
+    if not pending:
+        return
+    upserts = [(t, i, row) for (t, i), row in pending.items() if row is not None]
+    deletes = [(t, i) for (t, i), row in pending.items() if row is None]
+    try:
+        with db.engine.begin() as conn:
+            _write(conn, upserts, deletes)
+    except Exception as e:
+        logger.error("search index update failed (run scripts/rebuild_search_index.py): %s", e)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop('search_pending', None)
+
+
+# ------------------------
+# Query
+# ------------------------
+def _match_expression(query):
+    """'ahm sal' -> '"ahm"* "sal"*' (every word, as a prefix)"""
+    tokens = _TOKEN_RE.findall(query or "")
+    return " ".join('"%s"*' % t.replace('"', '""') for t in tokens[:8])
+
+
+def _scope(user):
+    role = (getattr(user, 'role', '') or '').lower()
+    if role in PRIVILEGED_ROLES:
+        return VISIBLE_TYPES['privileged']
+    if role in MANAGER_ROLES:
+        return VISIBLE_TYPES['manager']
+    return VISIBLE_TYPES['employee']
+
+
+def search(user, query, types=None, limit=20):
+    """
+    Ranked, permission-filtered prefix search. Returns a list of
+    {'type', 'id', 'title', 'subtitle', 'score'} (lower score = better match).
+    """
+    match = _match_expression(query)
+    if not match:
+        return []
+
+    requested = {ENTITY_TYPES[t] for t in (types or ENTITY_TYPES) if t in ENTITY_TYPES}
+    if not requested:
+        return []
+    visible = {ENTITY_TYPES[t] for t in _scope(user)} & requested
+
+    # The type code is part of the rowid, so type and role filters do not read row content
+    conditions = []
+    if requested != set(ENTITY_TYPES.values()):
+        conditions.append(f"(rowid >> {_ROWID_SHIFT}) IN ({', '.join(map(str, sorted(requested)))})")
+    if visible != requested:
+        permission = ["owner_user_id = :user_id"]
+        if visible:
+            permission.insert(0, f"(rowid >> {_ROWID_SHIFT}) IN ({', '.join(map(str, sorted(visible)))})")
+        if ENTITY_TYPES['user_document'] in requested:
+            permission.append(f"((rowid >> {_ROWID_SHIFT}) = {ENTITY_TYPES['user_document']} AND visibility = 'shared')")
+        conditions.append(f"({' OR '.join(permission)})")
+
+    sql = f"""
+        SELECT entity_type, entity_id, title, subtitle, bm25(search_index, 10.0, 4.0, 1.0) AS score
+        FROM search_index
+        WHERE search_index MATCH :match {''.join(' AND ' + c for c in conditions)}
+        ORDER BY score
+        LIMIT :limit
+    """
+    rows = db.session.execute(text(sql), {
+        'match': match,
+        'user_id': getattr(user, 'id', None),
+        'limit': min(max(int(limit), 1), MAX_RESULTS),
+    }).all()
+    return [{
+        'type': r.entity_type,
+        'id': r.entity_id,
+        'title': r.title,
+        'subtitle': r.subtitle,
+        'score': round(r.score, 4),
+    } for r in rows]
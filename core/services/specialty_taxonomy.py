@@ -0,0 +1,119 @@
+# core/services/specialty_taxonomy.py
+
+import re
+import hashlib
+from config_data.specialties import SPECIALTY_CATEGORIES, SPECIALTY_SECTIONS
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+MAX_PREFIX_LENGTH = 20
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class SpecialtyTaxonomy:
+    """
+    Read-only specialty taxonomy built once at import.
+    - ids / category ids: declared explicitly in config_data/specialties.py
+      (they are stored on candidates, so they never depend on list order);
+      a repeated id, category or (normalized) name raises ValueError
+    - prefix index: word prefix -> ids of specialties containing a word with that prefix
+    """
+
+    def __init__(self, categories, sections):
+        self.categories = tuple(categories)     # (category id, name) in display order
+        self.category_ids = {}                  # category name -> category id
+        self._category_names = {}               # category id -> category name
+        for category_id, category in self.categories:
+            if category_id in self._category_names or category in self.category_ids:
+                raise ValueError(f"Duplicate specialty category {category_id} / {category!r}")
+            self._category_names[category_id] = category
+            self.category_ids[category] = category_id
+
+        ids, names = [], []
+        self._names = {}                        # id -> name
+        self._category_of = {}                  # id -> category id
+        self._ids_by_key = {}                   # normalized name -> id
+        self._prefix_index = {}
+        for category, entries in sections:
+            if category not in self.category_ids:
+                raise ValueError(f"Specialty section {category!r} is not in SPECIALTY_CATEGORIES")
+            for specialty_id, name in entries:
+                if specialty_id in self._names:
+                    raise ValueError(f"Duplicate specialty id {specialty_id} ({self._names[specialty_id]!r} / {name!r})")
+                key = " ".join(_tokens(name))
+                if key in self._ids_by_key:
+                    raise ValueError(f"Duplicate specialty name {name!r} (ids {self._ids_by_key[key]} / {specialty_id})")
+                ids.append(specialty_id)
+                names.append(name)
+                self._names[specialty_id] = name
+                self._category_of[specialty_id] = self.category_ids[category]
+                self._ids_by_key[key] = specialty_id
+                for token in set(_tokens(name)):
+                    for i in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                        self._prefix_index.setdefault(token[:i], set()).add(specialty_id)
+
+        self._prefix_index = {k: frozenset(v) for k, v in self._prefix_index.items()}
+        self.ids = tuple(ids)                   # display order
+        self.names = tuple(names)
+        self.version = hashlib.sha1("\n".join(
+            f"{i}:{self._category_of[i]}:{self._names[i]}" for i in self.ids
+        ).encode("utf-8")).hexdigest()[:16]
+
+    # ------------------------
+    # Lookups
+    # ------------------------
+    def resolve(self, name):
+        """Return the taxonomy id for a (free-text) specialty, or None if unknown"""
+        return self._ids_by_key.get(" ".join(_tokens(name))) if name else None
+
+    def name(self, specialty_id):
+        return self._names.get(specialty_id)
+
+    def category_id(self, specialty_id):
+        return self._category_of.get(specialty_id)
+
+    def category_name(self, category_id):
+        return self._category_names.get(category_id)
+
+    def specialty_ids_in(self, category_id):
+        return [i for i in self.ids if self._category_of[i] == category_id]
+
+    def as_dict(self, specialty_id):
+        category_id = self.category_id(specialty_id)
+        return {
+            'id': specialty_id,
+            'name': self.name(specialty_id),
+            'category_id': category_id,
+            'category': self.category_name(category_id),
+        }
+
+    # ------------------------
+    # Autocomplete
+    # ------------------------
+    def suggest(self, query, limit=10, category_id=None):
+        """Specialties whose words start with every word of `query`"""
+        words = _tokens(query)
+        if not words:
+            return []
+
+        matches = None
+        for word in words:
+            ids = self._prefix_index.get(word[:MAX_PREFIX_LENGTH], frozenset())
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        if category_id:
+            matches = [i for i in matches if self._category_of[i] == category_id]
+
+        query_key = " ".join(words)
+        ranked = sorted(matches, key=lambda i: (
+            not " ".join(_tokens(self._names[i])).startswith(query_key),
+            self._names[i].lower()
+        ))
+        return [self.as_dict(i) for i in ranked[:limit]]
+
+
+taxonomy = SpecialtyTaxonomy(SPECIALTY_CATEGORIES, SPECIALTY_SECTIONS)
@@ -0,0 +1,41 @@
+# core/services/table_versions.py
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import Insert, Update, Delete
+
+from core.extensions import db
+from core.models import TableVersion
+
+# Tables whose writes invalidate cached API responses
+VERSIONED_TABLES = {
+    'departments', 'employees', 'candidates', 'users', 'leave_requests', 'employee_requests',
+    'holidays',  # also invalidates the compiled calendars in core/services/work_calendar.py
+    'org_closure',  # reporting lines scope the team / queue lists
+}
+
+_BUMP = text(
+    "INSERT INTO table_versions (name, version) VALUES (:name, 1) "
+    "ON CONFLICT(name) DO UPDATE SET version = version + 1"
+)
+
+
+@event.listens_for(Engine, "after_execute")
+def _bump_version(conn, clauseelement, multiparams, params, execution_options, result):
+    """
+    Every INSERT/UPDATE/DELETE on a versioned table bumps its counter on the
+    same connection, so ORM flushes, bulk statements and Core writes are all
+    counted and a rolled back write rolls back its bump too.
+    """
+    if not isinstance(clauseelement, (Insert, Update, Delete)):
+        return
+    name = getattr(clauseelement.table, 'name', None)
+    if name in VERSIONED_TABLES:
+        conn.execute(_BUMP, {'name': name})
+
+
+def versions(*tables):
+    """Current counters for the given tables (0 for a table never written since setup)"""
+    rows = dict(db.session.query(TableVersion.name, TableVersion.version)
+                .filter(TableVersion.name.in_(tables)).all())
+    return [rows.get(t, 0) for t in tables]
@@ -0,0 +1,89 @@
+# core/services/tabular_import.py
+
+import csv
+import io
+import re
+
+_HEADER_RE = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_header(value):
+    """'Full Name ' -> 'full_name'"""
+    return _HEADER_RE.sub("_", str(value or "").strip().lower()).strip("_")
+
+
+def _cell(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _iter_csv(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        dialect = csv.Sniffer().sniff(text.read(4096), delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    text.seek(0)
+    yield from csv.reader(text, dialect)
+
+
+def _iter_xlsx(stream):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX import requires openpyxl (pip install openpyxl)")
+
+    # read_only streams rows from the sheet XML instead of building the whole workbook
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_rows(file_obj, aliases=None):
+    """
+    Stream the data rows of an uploaded CSV or XLSX file as dicts keyed by
+    normalized header. `aliases` maps alternative headers to field names.
+    Yields (row_number, row) where row_number is the spreadsheet line (header = 1).
+    Blank rows are skipped.
+    """
+    filename = (getattr(file_obj, "filename", None) or "").lower()
+    stream = getattr(file_obj, "stream", file_obj)
+    if filename.endswith(".xlsx"):
+        rows = _iter_xlsx(stream)
+    elif filename.endswith((".csv", ".txt")) or not filename:
+        rows = _iter_csv(stream)
+    else:
+        raise ValueError("Unsupported file type, upload a .csv or .xlsx file")
+
+    aliases = aliases or {}
+    header = None
+    for row_number, values in enumerate(rows, start=1):
+        if header is None:
+            header = [aliases.get(normalize_header(v), normalize_header(v)) for v in values]
+            if not any(header):
+                raise ValueError("The first row must contain column headers")
+            continue
+        cells = [_cell(v) for v in values]
+        if not any(v is not None for v in cells):
+            continue
+        yield row_number, {key: value for key, value in zip(header, cells) if key}
+
+    if header is None:
+        raise ValueError("The file is empty")
+
+
+def chunked(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,122 @@
+# core/services/work_calendar.py
+# Working days per site: the weekmask (WORK_WEEKMASKS) and holiday list of each
+# site are compiled once into a NumPy busdaycalendar and reused until the holidays
+# table changes; batches of date ranges are counted with one busday_count call.
+# Used by leave validation, the leave ledger and leave reporting.
+import threading
+from datetime import timedelta
+
+from flask import current_app
+
+from core.extensions import db
+from core.models import Employee, Holiday
+from core.services.table_versions import versions
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+DEFAULT_SITE = 'default'
+
+# site -> (holidays version, weekmask, compiled calendar)
+_calendars = {}
+_lock = threading.Lock()
+
+
+def sites():
+    return tuple(current_app.config['WORK_WEEKMASKS'])
+
+
+def site_for(country):
+    """Calendar site for an employee country (unlisted or missing -> 'default')"""
+    return country if country in current_app.config['WORK_WEEKMASKS'] else DEFAULT_SITE
+
+
+def sites_for_users(user_ids):
+    """{user_id: site} from the users' employee records; one query for the batch"""
+    user_ids = set(user_ids)
+    countries = dict(db.session.query(Employee.user_id, Employee.country)
+                     .filter(Employee.user_id.in_(user_ids)).all()) if user_ids else {}
+    return {user_id: site_for(countries.get(user_id)) for user_id in user_ids}
+
+
+def _compile(site, weekmask):
+    holidays = [d for (d,) in db.session.query(Holiday.date)
+                .filter(Holiday.site.in_({site, DEFAULT_SITE})).order_by(Holiday.date).all()]
+    if np is not None:
+        return np.busdaycalendar(weekmask=weekmask, holidays=np.array(holidays, dtype='datetime64[D]'))
+    return frozenset(i for i, flag in enumerate(weekmask) if flag == '1'), frozenset(holidays)
+
+
+def calendar(site=DEFAULT_SITE):
+    """The compiled calendar for a site, rebuilt only after holidays were written"""
+    weekmask = current_app.config['WORK_WEEKMASKS'].get(site) or current_app.config['WORK_WEEKMASKS'][DEFAULT_SITE]
+    version = versions('holidays')[0]
+    cached = _calendars.get(site)
+    if cached and cached[0] == version and cached[1] == weekmask:
+        return cached[2]
+    compiled = _compile(site, weekmask)
+    with _lock:
+        _calendars[site] = (version, weekmask, compiled)
+    return compiled
+
+
+def _count_python(cal, start, end):
+    workdays, holidays = cal
+    return sum(1 for i in range((end - start).days + 1)
+               if (start + timedelta(days=i)).weekday() in workdays
+               and start + timedelta(days=i) not in holidays)
+
+
+def count_many(ranges, site=DEFAULT_SITE):
+    """Working days in each inclusive (start, end) range, all on one site's calendar"""
+    if not ranges:
+        return []
+    cal = calendar(site)
+    if np is not None:
+        starts, ends = (np.array(column, dtype='datetime64[D]') for column in zip(*ranges))
+        # busday_count's end is exclusive; empty (end < start) ranges count 0, not negative
+        return np.maximum(np.busday_count(starts, ends + 1, busdaycal=cal), 0).tolist()
+    return [_count_python(cal, start, end) for start, end in ranges]
+
+
+def working_days(start, end, site=DEFAULT_SITE):
+    """Working days in [start, end] on a site's calendar"""
+    return count_many([(start, end)], site)[0]
+
+
+def is_working_day(day, site=DEFAULT_SITE):
+    return working_days(day, day, site) == 1
+
+
+def working_mask(start, end, site=DEFAULT_SITE):
+    """One True / False per day of [start, end]: is it a working day on the site's calendar"""
+    cal = calendar(site)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    if np is not None:
+        return np.is_busday(np.array(days, dtype='datetime64[D]'), busdaycal=cal).tolist()
+    workdays, holidays = cal
+    return [day.weekday() in workdays and day not in holidays for day in days]
+
+
+def leave_days(leaves):
+    """
+    Working days of many leave requests at once, each on its requester's site:
+    one query for the sites, one busday_count per site. Returns {leave id: days}.
+    """
+    leaves = list(leaves)
+    user_sites = sites_for_users(lr.user_id for lr in leaves)
+    by_site = {}
+    for lr in leaves:
+        by_site.setdefault(user_sites[lr.user_id], []).append(lr)
+    counts = {}
+    for site, group in by_site.items():
+        days = count_many([(lr.start_date, lr.end_date) for lr in group], site)
+        counts.update(zip((lr.id for lr in group), days))
+    return counts
+
+
+def user_working_days(user_id, start, end):
+    """Working days in [start, end] on the calendar of the user's site"""
+    return working_days(start, end, sites_for_users([user_id])[user_id])
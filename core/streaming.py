@@ -0,0 +1,56 @@
+# core/streaming.py
+# ?stream=1 (JSON array) / ?stream=ndjson (one object per line) for list endpoints:
+# rows are read through a server-side cursor and written out a chunk at a time,
+# so memory stays flat whatever the row count.
+
+from flask import Response, current_app, request, stream_with_context
+
+from core.extensions import db
+
+STREAM_CHUNK_SIZE = 1000
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def stream_mode():
+    """None, 'json' or 'ndjson' from the ?stream= query argument"""
+    value = request.args.get('stream', '').lower()
+    if value == 'ndjson':
+        return 'ndjson'
+    if value in ('1', 'true', 'yes', 'json'):
+        return 'json'
+    return None
+
+
+def iter_chunks(stmt, chunk_size=STREAM_CHUNK_SIZE):
+    """Rows of a SELECT, `chunk_size` at a time, from a server-side cursor"""
+    result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def stream_rows(stmt, serialize, key, mode, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Streamed list response for a read-model SELECT. JSON mode keeps the usual
+    envelope ({"success": true, "<key>": [...]}); NDJSON writes one serialized
+    row per line. Each chunk is encoded with a single dumps() call.
+    """
+    dumps = current_app.json.dumps
+
+    def generate_json():
+        yield '{"success":true,%s:[' % dumps(key)
+        separator = ''
+        for rows in iter_chunks(stmt, chunk_size):
+            yield separator + dumps([serialize(row) for row in rows])[1:-1]
+            separator = ','
+        yield ']}'
+
+    def generate_ndjson():
+        for rows in iter_chunks(stmt, chunk_size):
+            yield ''.join(dumps(serialize(row)) + '\n' for row in rows)
+
+    if mode == 'ndjson':
+        return Response(stream_with_context(generate_ndjson()), mimetype=NDJSON_MIMETYPE)
+    return Response(stream_with_context(generate_json()), mimetype='application/json')
@@ -0,0 +1,208 @@
+# modules/candidate/analytics.py
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+from flask import has_request_context, request
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session, aliased
+
+from core.extensions import db
+from core.models import Candidate, CandidateStatusEvent, CandidateFunnelDaily
+
+PIPELINE_STAGES = ['new', 'interviewed', 'hired', 'rejected']
+
+
+# ------------------------
+# Status history
+# ------------------------
+def _current_actor_id():
+    if not has_request_context():
+        return None
+    user_id = getattr(request, "user_id", None)
+    if user_id:
+        return user_id
+    try:
+        from flask_login import current_user
+        return current_user.id if current_user.is_authenticated else None
+    except Exception:
+        return None
+
+
+@event.listens_for(Session, "before_flush")
+def _record_status_changes(session, flush_context, instances):
+    """Write a CandidateStatusEvent for every new candidate and every status change"""
+    changed = []
+    for obj in session.new:
+        if isinstance(obj, Candidate):
+            changed.append((obj, None, obj.status or 'new'))
+
+    for obj in session.dirty:
+        if not isinstance(obj, Candidate):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        if old != obj.status:
+            changed.append((obj, old, obj.status))
+
+    if not changed:
+        return
+
+    actor_id = _current_actor_id()
+    now = datetime.utcnow()
+    for candidate, old, new in changed:
+        try:
+            department_id = int(candidate.department_id) if candidate.department_id else None
+        except (TypeError, ValueError):
+            department_id = None
+        session.add(CandidateStatusEvent(
+            candidate=candidate,
+            from_status=old,
+            to_status=new,
+            specialty=candidate.specialty,
+            nationality=candidate.nationality,
+            department_id=department_id,
+            changed_by=actor_id,
+            created_at=now
+        ))
+
+
+def seed_status_events():
+    """One-off backfill: an initial event for candidates created before history existed"""
+    has_events = db.session.query(CandidateStatusEvent.id)\
+        .filter(CandidateStatusEvent.candidate_id == Candidate.id).exists()
+    rows = db.session.query(
+        Candidate.id, Candidate.status, Candidate.specialty, Candidate.nationality,
+        Candidate.department_id, Candidate.created_at
+    ).filter(~has_events).all()
+
+    db.session.bulk_insert_mappings(CandidateStatusEvent, [{
+        'candidate_id': r.id,
+        'from_status': None,
+        'to_status': r.status or 'new',
+        'specialty': r.specialty,
+        'nationality': r.nationality,
+        'department_id': r.department_id,
+        'created_at': r.created_at or datetime.utcnow(),
+    } for r in rows])
+    db.session.commit()
+    return len(rows)
+
+
+# ------------------------
+# Daily rollup
+# ------------------------
+def rollup_day(day: date):
+    """
+    (Re)compute the funnel rows for one day from that day's status events.
+    Idempotent: existing rows for the day are replaced.
+    """
+    start = datetime.combine(day, datetime.min.time())
+    end = start + timedelta(days=1)
+
+    previous = aliased(CandidateStatusEvent)
+    prev_at = db.session.query(func.max(previous.created_at)).filter(
+        previous.candidate_id == CandidateStatusEvent.candidate_id,
+        previous.created_at < CandidateStatusEvent.created_at
+    ).correlate(CandidateStatusEvent).scalar_subquery()
+
+    events = db.session.query(
+        CandidateStatusEvent.from_status,
+        CandidateStatusEvent.to_status,
+        CandidateStatusEvent.specialty,
+        CandidateStatusEvent.nationality,
+        CandidateStatusEvent.department_id,
+        CandidateStatusEvent.created_at,
+        prev_at.label('prev_at')
+    ).filter(
+        CandidateStatusEvent.created_at >= start,
+        CandidateStatusEvent.created_at < end
+    ).all()
+
+    buckets = defaultdict(lambda: {'entered_count': 0, 'exited_count': 0, 'stage_seconds': 0})
+    for ev in events:
+        dims = (ev.specialty, ev.nationality, ev.department_id)
+        buckets[(ev.to_status,) + dims]['entered_count'] += 1
+        if ev.from_status:
+            bucket = buckets[(ev.from_status,) + dims]
+            bucket['exited_count'] += 1
+            if ev.prev_at:
+                bucket['stage_seconds'] += int((ev.created_at - ev.prev_at).total_seconds())
+
+    CandidateFunnelDaily.query.filter_by(day=day).delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(CandidateFunnelDaily, [dict(
+        day=day, status=status, specialty=specialty, nationality=nationality, department_id=department_id, **counts
+    ) for (status, specialty, nationality, department_id), counts in buckets.items()])
+    db.session.commit()
+    return len(buckets)
+
+
+def rollup_range(start_day: date, end_day: date):
+    day = start_day
+    total = 0
+    while day <= end_day:
+        total += rollup_day(day)
+        day += timedelta(days=1)
+    return total
+
+
+# ------------------------
+# Funnel read model
+# ------------------------
+FUNNEL_GROUPS = {
+    'day': CandidateFunnelDaily.day,
+    'specialty': CandidateFunnelDaily.specialty,
+    'nationality': CandidateFunnelDaily.nationality,
+    'department': CandidateFunnelDaily.department_id,
+}
+
+
+def get_funnel(start_day: date, end_day: date, filters=None, group_by=None):
+    """Aggregate the daily rollups; never touches the candidates table"""
+    filters = filters or {}
+    group_col = FUNNEL_GROUPS.get(group_by)
+
+    columns = [
+        CandidateFunnelDaily.status,
+        func.sum(CandidateFunnelDaily.entered_count).label('entered'),
+        func.sum(CandidateFunnelDaily.exited_count).label('exited'),
+        func.sum(CandidateFunnelDaily.stage_seconds).label('stage_seconds'),
+    ]
+    if group_col is not None:
+        columns.insert(0, group_col.label('group'))
+
+    query = db.session.query(*columns).filter(
+        CandidateFunnelDaily.day >= start_day,
+        CandidateFunnelDaily.day <= end_day
+    )
+    if filters.get('specialty'):
+        query = query.filter(CandidateFunnelDaily.specialty == filters['specialty'])
+    if filters.get('nationality'):
+        query = query.filter(CandidateFunnelDaily.nationality == filters['nationality'])
+    if filters.get('department_id'):
+        query = query.filter(CandidateFunnelDaily.department_id == int(filters['department_id']))
+
+    group_cols = [CandidateFunnelDaily.status] if group_col is None else [group_col, CandidateFunnelDaily.status]
+    rows = query.group_by(*group_cols).all()
+
+    def stage_row(r):
+        exited = r.exited or 0
+        return {
+            'status': r.status,
+            'entered': r.entered or 0,
+            'exited': exited,
+            'avg_days_in_stage': round((r.stage_seconds or 0) / exited / 86400, 2) if exited else None,
+        }
+
+    def ordered(stages):
+        rank = {s: i for i, s in enumerate(PIPELINE_STAGES)}
+        return sorted(stages, key=lambda s: (rank.get(s['status'], len(rank)), s['status']))
+
+    if group_col is None:
+        return ordered([stage_row(r) for r in rows])
+
+    grouped = defaultdict(list)
+    for r in rows:
+        key = r.group.isoformat() if isinstance(r.group, date) else r.group
+        grouped[key].append(stage_row(r))
+    return [{'group': key, 'stages': ordered(stages)} for key, stages in grouped.items()]
@@ -1,45 +1,76 @@
 from flask import Blueprint, jsonify, request, send_file
 from core.extensions import db
 from core.models import Candidate, Department
-from datetime import datetime
+from datetime import datetime, timedelta
 from modules.auth.jwt_utils import mobile_auth_required
+from core.decorators import conditional_get
+from core.schemas import compile_schema, dump, dump_many
+from core.read_models import candidate_rows, fetch
+from core.streaming import stream_mode, stream_rows
 
 api_candidate_bp = Blueprint('api_candidate', __name__, url_prefix='/api/candidates')
 
 @api_candidate_bp.route('', methods=['GET'])
 @mobile_auth_required
+@conditional_get('candidates', 'departments')
 def get_candidates():
     try:
-        candidates = Candidate.query.all()
+        query = candidate_rows()
+        # Indexed integer lookups on the taxonomy ids
+        for arg, column in (('category_id', Candidate.specialty_category_id), ('specialty_id', Candidate.specialty_id)):
+            if request.args.get(arg):
+                value = request.args.get(arg, type=int)
+                if value is None:
+                    return jsonify({'success': False, 'message': f'{arg} must be an integer'}), 400
+                query = query.where(column == value)
+        mode = stream_mode()
+        if mode:
+            return stream_rows(query.order_by(Candidate.id), compile_schema('candidate_row'), 'candidates', mode)
+        candidates = fetch(query)
         return jsonify({
             'success': True,
-            'candidates': [{
-                'id': c.id,
-                'full_name': c.full_name,
-                'email': c.email,
-                'phone': c.phone,
-                'nationality': c.nationality,
-                'applied_position': c.applied_position,
-                'specialty': c.specialty,
-                'experience': c.experience,
-                'education': c.education,
-                'skills': c.skills,
-                'status': c.status,
-                'cv_filepath': c.cv_filepath,
-                'id_document_filepath': c.id_document_filepath,
-                'updated_at': c.updated_at.isoformat() if c.updated_at else None,
-                'department': {
-                    'id': c.department.id,
-                    'name': c.department.name
-                } if c.department else None,
-                'created_at': c.created_at.isoformat()
-            } for c in candidates]
+            'candidates': dump_many('candidate_row', candidates)
         }), 200
 
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+# ------------------------------------------------------------
+# PIPELINE FUNNEL (reads the daily rollups)
+# ------------------------------------------------------------
+@api_candidate_bp.route('/funnel', methods=['GET'])
+@mobile_auth_required
+def get_funnel():
+    try:
+        from modules.candidate.analytics import get_funnel as funnel_query, FUNNEL_GROUPS
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director', 'general_manager', 'manager']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        today = datetime.utcnow().date()
+        end_day = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else today
+        start_day = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') \
+            else end_day - timedelta(days=30)
+        group_by = request.args.get('group_by')
+        if group_by and group_by not in FUNNEL_GROUPS:
+            return jsonify({'success': False, 'message': f'group_by must be one of {sorted(FUNNEL_GROUPS)}'}), 400
+
+        funnel = funnel_query(start_day, end_day, filters=request.args, group_by=group_by)
+        return jsonify({
+            'success': True,
+            'from': start_day.isoformat(),
+            'to': end_day.isoformat(),
+            'group_by': group_by,
+            'funnel': funnel
+        }), 200
+
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 @api_candidate_bp.route('/<int:id>', methods=['GET'])
 @mobile_auth_required
 def get_candidate(id):
@@ -47,27 +78,7 @@ def get_candidate(id):
         c = Candidate.query.get_or_404(id)
         return jsonify({
             'success': True,
-            'candidate': {
-                'id': c.id,
-                'full_name': c.full_name,
-                'email': c.email,
-                'phone': c.phone,
-                'nationality': c.nationality,
-                'applied_position': c.applied_position,
-                'specialty': c.specialty,
-                'experience': c.experience,
-                'education': c.education,
-                'skills': c.skills,
-                'status': c.status,
-                'cv_filepath': c.cv_filepath,
-                'id_document_filepath': c.id_document_filepath,
-                'department': {
-                    'id': c.department.id,
-                    'name': c.department.name
-                } if c.department else None,
-                'created_at': c.created_at.isoformat(),
-                'updated_at': c.updated_at.isoformat()
-            }
+            'candidate': dump('candidate', c)
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -200,43 +211,127 @@ def delete_candidate(id):
 @mobile_auth_required
 def promote_candidate(id):
     try:
-        from core.models import Employee
+        from modules.candidate.services import promote_candidates
         current_user = getattr(request, "user", None)
         if current_user.role.lower() not in ['it_manager', 'general_director', 'manager']:
             return jsonify({'success': False, 'message': 'Permission denied'}), 403
 
-        c = Candidate.query.get_or_404(id)
-        
-        # Check if already hired
-        if c.status == 'hired':
-            # Check if employee record already exists
-            existing_emp = Employee.query.filter_by(full_name=c.full_name).first() # Basic check
-            if existing_emp:
-                return jsonify({'success': False, 'message': 'Candidate already promoted'}), 400
-
-        # Create new employee
-        new_emp = Employee(
-            full_name=c.full_name,
-            job_title=c.applied_position,
-            phone=c.phone,
-            nationality=c.nationality,
-            department_id=c.department_id
-        )
-        
-        c.status = 'hired'
-        db.session.add(new_emp)
-        db.session.commit()
-        
+        Candidate.query.get_or_404(id)
+        result = promote_candidates([id])[0]
+        if result['status'] == 'already_promoted':
+            return jsonify({'success': False, 'message': 'Candidate already promoted'}), 400
+
         return jsonify({
             'success': True, 
             'message': 'Candidate promoted to Employee record successfully',
-            'employee_id': new_emp.id
+            'employee_id': result['employee_id']
         }), 201
 
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
 
+
+# ------------------------------------------------------------
+# BATCH PROMOTION (single transaction)
+# ------------------------------------------------------------
+@api_candidate_bp.route('/promote', methods=['POST'])
+@mobile_auth_required
+def promote_candidates_batch():
+    try:
+        from modules.candidate.services import promote_candidates
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director', 'manager']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        data = request.json or {}
+        candidate_ids = data.get('candidate_ids') or []
+        if not candidate_ids:
+            return jsonify({'success': False, 'message': 'candidate_ids is required'}), 400
+
+        results = promote_candidates(candidate_ids)
+        promoted = sum(1 for r in results if r['status'] == 'promoted')
+        return jsonify({
+            'success': True,
+            'message': f'{promoted} candidate(s) promoted',
+            'promoted': promoted,
+            'results': results
+        }), 200
+
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+# ------------------------------------------------------------
+# BULK IMPORT (CSV / XLSX)
+# ------------------------------------------------------------
+@api_candidate_bp.route('/import', methods=['POST'])
+@mobile_auth_required
+def import_candidates():
+    try:
+        from modules.candidate.services import import_candidates as run_import
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director', 'manager']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        file = request.files.get('file')
+        if not file or file.filename == '':
+            return jsonify({'success': False, 'message': 'A .csv or .xlsx file is required'}), 400
+
+        dry_run = request.form.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        report = run_import(file, dry_run=dry_run)
+        return jsonify(dict(report, success=True)), 200
+
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+# ------------------------------------------------------------
+# MASS STATUS-UPDATE EMAILS
+# ------------------------------------------------------------
+@api_candidate_bp.route('/status-emails', methods=['POST'])
+@mobile_auth_required
+def queue_status_emails():
+    try:
+        from core.services.email_service import email_service
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director', 'manager']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        data = request.json or {}
+        candidate_ids = data.get('candidate_ids') or []
+        if not candidate_ids:
+            return jsonify({'success': False, 'message': 'candidate_ids is required'}), 400
+
+        candidates = Candidate.query.filter(Candidate.id.in_(candidate_ids)).all()
+        status = data.get('status')
+        if status:
+            queued = email_service.queue_status_updates(candidates, status)
+        else:
+            # No explicit status: each candidate is told about their current one
+            queued = 0
+            by_status = {}
+            for c in candidates:
+                by_status.setdefault(c.status or 'new', []).append(c)
+            for cand_status, group in by_status.items():
+                queued += email_service.queue_status_updates(group, cand_status)
+
+        return jsonify({
+            'success': True,
+            'message': f'{queued} email(s) queued',
+            'queued': queued
+        }), 202
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @api_candidate_bp.route('/<int:id>/cv', methods=['GET'])
 @mobile_auth_required
 def download_cv(id):
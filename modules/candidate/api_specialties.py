@@ -0,0 +1,50 @@
+from flask import Blueprint, jsonify, request
+from core.services.specialty_taxonomy import taxonomy
+
+api_specialty_bp = Blueprint('api_specialty', __name__, url_prefix='/api/specialties')
+
+# The taxonomy only changes with a deploy, so responses are safe to cache hard
+CACHE_CONTROL = 'public, max-age=86400, stale-while-revalidate=604800'
+
+
+def _cached(payload):
+    response = jsonify(payload)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    response.set_etag(f"{taxonomy.version}-{request.query_string.decode('utf-8', 'ignore')}")
+    return response.make_conditional(request)
+
+
+# ------------------------------------------------------------
+# AUTOCOMPLETE (public: used by the landing page form too)
+# ------------------------------------------------------------
+@api_specialty_bp.route('/suggest', methods=['GET'])
+def suggest():
+    q = (request.args.get('q') or '').strip()
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+        category_id = int(request.args['category_id']) if request.args.get('category_id') else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'limit and category_id must be integers'}), 400
+
+    return _cached({
+        'success': True,
+        'query': q,
+        'suggestions': taxonomy.suggest(q, limit=limit, category_id=category_id)
+    })
+
+
+# ------------------------------------------------------------
+# FULL TAXONOMY
+# ------------------------------------------------------------
+@api_specialty_bp.route('', methods=['GET'])
+def get_taxonomy():
+    return _cached({
+        'success': True,
+        'version': taxonomy.version,
+        'categories': [{
+            'id': category_id,
+            'name': name,
+            'specialty_ids': taxonomy.specialty_ids_in(category_id)
+        } for category_id, name in taxonomy.categories],
+        'specialties': [taxonomy.as_dict(i) for i in taxonomy.ids]
+    })
@@ -1,9 +1,9 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
 from flask_login import login_required
-from core.models import Candidate, Department
+from core.models import Candidate
 from modules.candidate.services import candidate_services
-from core.services.email_service import email_service
-from config_data.specialties import SPECIALTIES
+from core.services.specialty_taxonomy import taxonomy
+from modules.department.services import department_choices
 import os
 import requests
 
@@ -15,35 +15,60 @@ candidate_bp = Blueprint("candidates", __name__, url_prefix="/candidates")
 @candidate_bp.route("/")
 @login_required
 def list_candidates():
-    candidates = Candidate.query.order_by(Candidate.created_at.desc()).all()
-    return render_template("dashboard/candidates/list.html", candidates=candidates, specialties=SPECIALTIES)
+    query = Candidate.query
+    category_id = request.args.get("category", type=int)
+    if category_id:
+        query = query.filter(Candidate.specialty_category_id == category_id)
+    candidates = query.order_by(Candidate.created_at.desc()).all()
+    return render_template("dashboard/candidates/list.html", candidates=candidates, specialties=taxonomy.names)
 
 
 @candidate_bp.route("/create", methods=["GET", "POST"])
 @login_required
 def create_candidate():
-    departments = Department.query.all()
+    departments = department_choices()
     if request.method == "POST":
         cv_file = request.files.get("cv")
         id_file = request.files.get("id_document")
         candidate_services.save_candidate(request.form, cv_file=cv_file, id_file=id_file)
         flash("Candidate created successfully.", "success")
         return redirect(url_for("candidates.list_candidates"))
-    return render_template("dashboard/candidates/form.html", candidate=None, departments=departments, specialties=SPECIALTIES)
+    return render_template("dashboard/candidates/form.html", candidate=None, departments=departments, specialties=taxonomy.names)
 
 
 @candidate_bp.route("/edit/<int:id>", methods=["GET", "POST"])
 @login_required
 def edit_candidate(id):
     candidate = Candidate.query.get_or_404(id)
-    departments = Department.query.all()
+    departments = department_choices()
     if request.method == "POST":
         cv_file = request.files.get("cv")
         id_file = request.files.get("id_document")
         candidate_services.update_candidate(id, request.form, cv_file=cv_file, id_file=id_file)
         flash("Candidate updated successfully.", "success")
         return redirect(url_for("candidates.list_candidates"))
-    return render_template("dashboard/candidates/form.html", candidate=candidate, departments=departments, specialties=SPECIALTIES)
+    return render_template("dashboard/candidates/form.html", candidate=candidate, departments=departments, specialties=taxonomy.names)
+
+
+@candidate_bp.route("/import", methods=["POST"])
+@login_required
+def import_candidates():
+    file = request.files.get("file")
+    if not file or file.filename == "":
+        flash("Please choose a .csv or .xlsx file to import.", "error")
+        return redirect(url_for("candidates.list_candidates"))
+    try:
+        report = candidate_services.import_candidates(file)
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("candidates.list_candidates"))
+
+    flash(f"{report['imported']} candidate(s) imported, {report['skipped']} row(s) skipped.", "success")
+    for item in report["errors"][:10]:
+        flash(f"Row {item['row']}: {'; '.join(item['errors'])}", "warning")
+    if report["skipped"] > 10:
+        flash(f"... and {report['skipped'] - 10} more row(s) with errors.", "warning")
+    return redirect(url_for("candidates.list_candidates"))
 
 
 @candidate_bp.route("/delete/<int:id>", methods=["POST"])
@@ -68,7 +93,7 @@ def public_apply():
         try:
             verify_url = "https://www.google.com/recaptcha/api/siteverify"
             data = {"secret": secret_key, "response": recaptcha_response}
-            response = requests.post(verify_url, data=data)
+            response = requests.post(verify_url, data=data, timeout=current_app.config.get("RECAPTCHA_TIMEOUT", 5))
             result = response.json()
             current_app.logger.info("ReCAPTCHA result: %s", result)
 
@@ -99,7 +124,7 @@ def public_apply():
 
     # ----- Save to DB -----
     try:
-        candidate_services.save_candidate(
+        candidate = candidate_services.save_candidate(
             request.form,
             cv_file=cv_file,
             id_file=id_file
@@ -110,21 +135,11 @@ def public_apply():
         flash("Internal error saving your application.", "error")
         return redirect(url_for("landing.landing"))
 
-    # ----- Emails -----
+    # ----- Emails (sent by the background worker) -----
     try:
-        email_service.send_candidate_confirmation(
-            request.form["full_name"],
-            request.form["email"],
-            request.form["applied_position"]
-        )
-        email_service.send_candidate_notification(
-            request.form["full_name"],
-            request.form["email"],
-            request.form["phone"],
-            request.form["applied_position"]
-        )
+        candidate_services.enqueue_application_emails(candidate)
     except Exception as e:
-        current_app.logger.error("EMAIL ERROR: %s", e)
+        current_app.logger.error("EMAIL ENQUEUE ERROR: %s", e)
 
     flash("Application submitted successfully!", "success")
     return redirect(url_for("landing.landing"))
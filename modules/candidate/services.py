@@ -1,8 +1,16 @@
 import os
+import re
+from datetime import datetime
 from flask import current_app
+from sqlalchemy import insert, func
 from werkzeug.utils import secure_filename
 from core.extensions import db
-from core.models import Candidate
+from core.models import Candidate, CandidateStatusEvent, Department, Employee
+from core.services.email_service import email_service
+from core.services.specialty_taxonomy import taxonomy
+from core.services.tabular_import import iter_rows, chunked
+from core.services import search_index
+from modules.candidate import analytics  # noqa: F401  (registers the status history listener)
 
 # -------------------- Helper -------------------- #
 def save_file(file_obj, subfolder="candidates"):
@@ -89,11 +97,234 @@ def delete_candidate(candidate_id):
     return True
 
 
+# -------------------- Notifications -------------------- #
+def enqueue_application_emails(candidate):
+    """Queue the applicant confirmation and the HR notification in the email outbox"""
+    email_service.send_candidate_confirmation(
+        candidate.full_name, candidate.email, candidate.applied_position or '', commit=False
+    )
+    email_service.send_candidate_notification(
+        candidate.full_name, candidate.email, candidate.phone, candidate.applied_position or '', commit=False
+    )
+    db.session.commit()
+
+
+# -------------------- Bulk import -------------------- #
+IMPORT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+IMPORT_STATUSES = {'new', 'interviewed', 'hired', 'rejected'}
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+IMPORT_HEADER_ALIASES = {
+    'name': 'full_name',
+    'candidate_name': 'full_name',
+    'e_mail': 'email',
+    'email_address': 'email',
+    'mobile': 'phone',
+    'phone_number': 'phone',
+    'position': 'applied_position',
+    'job_title': 'applied_position',
+    'specialization': 'specialty',
+    'department': 'department_name',
+}
+
+
+def _import_row(row, departments):
+    """Validate one spreadsheet row. Returns (mapping, errors)."""
+    errors = []
+    full_name = row.get('full_name')
+    if not full_name:
+        errors.append("full_name is required")
+
+    email = str(row['email']).lower() if row.get('email') else None
+    if email and not _EMAIL_RE.match(email):
+        errors.append(f"invalid email '{email}'")
+
+    status = str(row.get('status') or 'new').lower()
+    if status not in IMPORT_STATUSES:
+        errors.append(f"unknown status '{status}'")
+
+    department_id = None
+    if row.get('department_id'):
+        try:
+            department_id = int(row['department_id'])
+        except (TypeError, ValueError):
+            errors.append(f"invalid department_id '{row['department_id']}'")
+        else:
+            if department_id not in departments.values():
+                errors.append(f"department {department_id} does not exist")
+    elif row.get('department_name'):
+        department_id = departments.get(str(row['department_name']).strip().lower())
+        if department_id is None:
+            errors.append(f"unknown department '{row['department_name']}'")
+
+    specialty = str(row['specialty']) if row.get('specialty') else None
+    specialty_id = taxonomy.resolve(specialty)
+
+    def text(key, limit=None):
+        value = row.get(key)
+        if value is None:
+            return None
+        value = str(value)
+        if limit and len(value) > limit:
+            errors.append(f"{key} is longer than {limit} characters")
+        return value
+
+    mapping = {
+        'full_name': text('full_name', 120),
+        'email': email,
+        'phone': text('phone', 20),
+        'nationality': text('nationality', 50),
+        'applied_position': text('applied_position', 120),
+        'specialty': taxonomy.name(specialty_id) or specialty,
+        'specialty_id': specialty_id,
+        'specialty_category_id': taxonomy.category_id(specialty_id),
+        'experience': text('experience', 50),
+        'education': text('education', 50),
+        'skills': text('skills'),
+        'department_id': department_id,
+        'status': status,
+        'id_document_filepath': '',   # uploaded later from the candidate page
+    }
+    return mapping, errors
+
+
+def import_candidates(file_obj, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Stream a CSV/XLSX file of candidates into the database.
+    Rows are validated, de-duplicated on email (within the file and,
+    case-insensitively, against the lower(candidates.email) index) and
+    inserted in batches, one commit per batch. Rows with errors are skipped and reported.
+    Returns {'imported', 'skipped', 'errors': [{'row', 'errors'}], 'errors_truncated'}.
+    """
+    departments = {name.lower(): dep_id for dep_id, name in db.session.query(Department.id, Department.name)}
+    seen_emails = set()
+    imported = skipped = 0
+    report = []
+
+    def reject(row_number, errors):
+        nonlocal skipped
+        skipped += 1
+        if len(report) < MAX_REPORTED_ERRORS:
+            report.append({'row': row_number, 'errors': errors})
+
+    for batch in chunked(iter_rows(file_obj, aliases=IMPORT_HEADER_ALIASES), batch_size):
+        validated = []
+        for row_number, row in batch:
+            mapping, errors = _import_row(row, departments)
+            if errors:
+                reject(row_number, errors)
+            else:
+                validated.append((row_number, mapping))
+
+        batch_emails = {m['email'] for _, m in validated if m['email']}
+        existing = {email for (email,) in db.session.query(func.lower(Candidate.email)).filter(
+            func.lower(Candidate.email).in_(batch_emails)
+        )} if batch_emails else set()
+
+        rows = []
+        for row_number, mapping in validated:
+            email = mapping['email']
+            if email and email in existing:
+                reject(row_number, [f"a candidate with email '{email}' already exists"])
+            elif email and email in seen_emails:
+                reject(row_number, [f"duplicate email '{email}' in file"])
+            else:
+                if email:
+                    seen_emails.add(email)
+                rows.append(mapping)
+
+        if rows and not dry_run:
+            _insert_candidates(rows)
+        imported += len(rows)
+
+    return {
+        'imported': imported,
+        'skipped': skipped,
+        'dry_run': dry_run,
+        'errors': report,
+        'errors_truncated': skipped > len(report),
+    }
+
+
+def _insert_candidates(rows):
+    # Bulk INSERT .. RETURNING bypasses the ORM unit of work, so the status
+    # history rows the before_flush listener would write are inserted here.
+    now = datetime.utcnow()
+    for row in rows:
+        row['created_at'] = row['updated_at'] = now
+    candidate_ids = db.session.scalars(
+        insert(Candidate).returning(Candidate.id, sort_by_parameter_order=True), rows
+    ).all()
+    db.session.execute(insert(CandidateStatusEvent), [{
+        'candidate_id': candidate_id,
+        'from_status': None,
+        'to_status': row['status'],
+        'specialty': row['specialty'],
+        'nationality': row['nationality'],
+        'department_id': row['department_id'],
+        'created_at': now,
+    } for candidate_id, row in zip(candidate_ids, rows)])
+    db.session.commit()
+    search_index.reindex(Candidate, candidate_ids)
+
+
+# -------------------- Promotion -------------------- #
+def promote_candidates(candidate_ids):
+    """
+    Turn candidates into Employee rows in a single transaction.
+    Already-promoted candidates are found with one query on the indexed
+    employees.candidate_id column. Returns one outcome per requested id:
+    {'candidate_id', 'status': promoted|already_promoted|not_found, 'employee_id'}.
+    """
+    ids = list(dict.fromkeys(int(i) for i in candidate_ids))
+    if not ids:
+        return []
+
+    candidates = {c.id: c for c in Candidate.query.filter(Candidate.id.in_(ids))}
+    promoted = dict(db.session.query(Employee.candidate_id, Employee.id).filter(Employee.candidate_id.in_(ids)))
+
+    results = []
+    new_employees = []
+    for candidate_id in ids:
+        candidate = candidates.get(candidate_id)
+        if candidate is None:
+            results.append({'candidate_id': candidate_id, 'status': 'not_found', 'employee_id': None})
+        elif candidate_id in promoted:
+            results.append({'candidate_id': candidate_id, 'status': 'already_promoted', 'employee_id': promoted[candidate_id]})
+        else:
+            employee = Employee(
+                full_name=candidate.full_name,
+                job_title=candidate.applied_position,
+                phone=candidate.phone,
+                nationality=candidate.nationality,
+                department_id=candidate.department_id,
+                candidate_id=candidate.id
+            )
+            candidate.status = 'hired'
+            new_employees.append((len(results), employee))
+            results.append({'candidate_id': candidate_id, 'status': 'promoted', 'employee_id': None})
+
+    try:
+        db.session.add_all([employee for _, employee in new_employees])
+        db.session.flush()
+        for index, employee in new_employees:
+            results[index]['employee_id'] = employee.id
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return results
+
+
 # -------------------- Service Object -------------------- #
 class CandidateService:
     save_candidate = staticmethod(save_candidate)
     update_candidate = staticmethod(update_candidate)
     delete_candidate = staticmethod(delete_candidate)
+    enqueue_application_emails = staticmethod(enqueue_application_emails)
+    import_candidates = staticmethod(import_candidates)
+    promote_candidates = staticmethod(promote_candidates)
 
 
 candidate_services = CandidateService()
\ No newline at end of file
@@ -1,21 +1,33 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from core.models import Employee, Department, LeaveRequest
+from core.services import org_hierarchy
 from modules.auth.jwt_utils import mobile_auth_required
 
 api_dashboard_bp = Blueprint('api_dashboard', __name__, url_prefix='/api/dashboard')
 
+# Roles whose stats cover the whole company; everyone else sees their team
+COMPANY_STATS_ROLES = ['it_manager', 'general_director']
+
+
 @api_dashboard_bp.route('/stats', methods=['GET'])
 @mobile_auth_required
 def get_stats():
-    total_employees = Employee.query.count()
-    total_departments = Department.query.count()
-    pending_leaves = LeaveRequest.query.filter_by(status='pending').count()
+    user = getattr(request, "user", None)
+    employees = Employee.query
+    pending_leaves = LeaveRequest.query.filter_by(status='pending')
+    scope = 'company'
+    if user.role.lower() not in COMPANY_STATS_ROLES:
+        team = org_hierarchy.reports_query(user.id)
+        employees = employees.filter(Employee.user_id.in_(team))
+        pending_leaves = pending_leaves.filter(LeaveRequest.user_id.in_(team))
+        scope = 'team'
     
     return jsonify({
         'success': True,
         'stats': {
-            'employees': total_employees,
-            'departments': total_departments,
-            'pending_leaves': pending_leaves
+            'scope': scope,
+            'employees': employees.count(),
+            'departments': Department.query.count(),
+            'pending_leaves': pending_leaves.count()
         }
     }), 200
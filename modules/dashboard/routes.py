@@ -3,10 +3,11 @@ from flask_login import login_required, current_user
 from sqlalchemy.orm import joinedload
 from sqlalchemy import or_, func, extract
 from core.decorators import permission_required, role_required
-from core.models import User, Department, ActivityLog, db, UserDocument, Folder, Employee, EmployeeDocument, EmployeeRequest
+from core.models import User, ActivityLog, db, UserDocument, Folder, Employee, EmployeeDocument, EmployeeRequest
 from core.permissions import Permission
 from core.forms import UserForm
 from .services import get_director_dashboard_data, get_manager_dashboard_data
+from modules.department.services import department_choices, department_summaries
 from modules.employee.services import (
     create_employee as create_employee_service,
     update_employee as update_employee_service,
@@ -16,6 +17,7 @@ from modules.employee.services import (
 from core.logger import audit_log
 from datetime import datetime, timedelta
 from modules.leave.services import LeaveRequest
+from modules.requests.services import request_scope, can_handle
 import os
 import calendar
 from collections import OrderedDict
@@ -71,11 +73,9 @@ def it_manager_dashboard():
     hiring_counts = list(months_dict.values())
 
     # --- Employees per department ---
-    departments = Department.query.order_by(Department.name).all()
+    departments = department_summaries()
     department_names = [d.name for d in departments]
-    employees_per_dept = [
-        Employee.query.filter_by(department_id=d.id).count() for d in departments
-    ]
+    employees_per_dept = [d.employee_count for d in departments]
 
     # --- Users Stats ---
     total_users = User.query.count()
@@ -147,11 +147,9 @@ def director_dashboard():
     hiring_counts = list(months_dict.values())
 
     # --- Employees per department ---
-    departments = Department.query.order_by(Department.name).all()
+    departments = department_summaries()
     department_names = [d.name for d in departments]
-    employees_per_dept = [
-        Employee.query.filter_by(department_id=d.id).count() for d in departments
-    ]
+    employees_per_dept = [d.employee_count for d in departments]
 
     # --- Users Stats ---
     total_users = User.query.count()
@@ -196,7 +194,7 @@ def director_dashboard():
 @login_required
 @role_required(['it_manager', 'general_director'])
 def employee_create():
-    departments = Department.query.order_by(Department.name).all()
+    departments = department_choices()
     
     if request.method == 'POST':
         form_data = request.form.to_dict()
@@ -236,7 +234,7 @@ def employee_create():
 @role_required(['it_manager', 'general_director'])
 def employee_edit(id):
     employee = Employee.query.get_or_404(id)
-    departments = Department.query.order_by(Department.name).all()
+    departments = department_choices()
 
     if request.method == 'POST':
         form_data = request.form.to_dict()
@@ -453,6 +451,28 @@ def recent_activities():
     activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).limit(10).all()
     return render_template('dashboard/partials/recent_activities.html', activities=activities)
 
+# -------------------- GLOBAL SEARCH (omnibox) --------------------
+SEARCH_RESULT_URLS = {
+    'employee': ('dashboard.employee_edit', 'id'),
+    'user': ('user.user_edit', 'user_id'),
+    'candidate': ('candidates.edit_candidate', 'id'),
+    'request': ('dashboard.request_list', None),
+    'user_document': ('docs.download_document', 'doc_id'),
+    'employee_document': ('dashboard.employee_document_download', 'doc_id'),
+}
+
+
+@dashboard_bp.route('/search')
+@login_required
+def global_search():
+    from core.services.search_index import search
+    results = search(current_user, request.args.get('q', ''), limit=request.args.get('limit', 10, type=int))
+    for item in results:
+        endpoint, arg = SEARCH_RESULT_URLS[item['type']]
+        item['url'] = url_for(endpoint, **({arg: item['id']} if arg else {}))
+    return jsonify({'success': True, 'results': results})
+
+
 @dashboard_bp.route('/users')
 @login_required
 @role_required(['it_manager', 'general_director'])
@@ -506,8 +526,8 @@ def create_user():
 @login_required
 @role_required(['it_manager', 'general_director', 'general_manager', 'head_of_department', 'manager'])
 def request_list():
-    # Fetch all requests, ordered by newest first
-    requests = EmployeeRequest.query.order_by(
+    # Fetch the requests this user handles, ordered by newest first
+    requests = EmployeeRequest.query.filter(request_scope(current_user)).order_by(
         # Put pending first, then by date
         (EmployeeRequest.status == 'pending').desc(),
         EmployeeRequest.created_at.desc()
@@ -521,12 +541,16 @@ def request_list():
 @role_required(['it_manager', 'general_director', 'general_manager', 'head_of_department', 'manager'])
 def request_update(id):
     req = EmployeeRequest.query.get_or_404(id)
+    if not can_handle(current_user, req):
+        abort(403)
     
     status = request.form.get('status')
     response = request.form.get('response')
     
-    if status:
+    if status and status != req.status:
         req.status = status
+        req.approver_id = current_user.id
+        req.decided_at = datetime.utcnow()
     if response:
         req.response = response
         
@@ -2,6 +2,7 @@
 # pyright: reportMissingModuleSource=false
 from core.models import User, Department, Employee, ActivityLog, db
 from sqlalchemy import func
+from core.services import org_hierarchy
 
 # ------------------------
 # Director Dashboard Data
@@ -48,17 +49,17 @@ def get_director_dashboard_data():
 # ------------------------
 def get_manager_dashboard_data(user):
     """
-    Returns data for a department manager
-    - department_employee_count: Employees in their department
+    Returns data for a manager
+    - team_member_count: Employees reporting to them, directly or not
     - department_activities: Recent User activity (staff only)
     """
-    department_employee_count = Employee.query.count()  # all employees
+    team_member_count = Employee.query.filter(Employee.user_id.in_(org_hierarchy.reports_query(user.id))).count()
     department_activities = ActivityLog.query.filter_by(user_id=user.id)\
         .order_by(ActivityLog.timestamp.desc())\
         .limit(10).all()
 
     return {
-        'department_employee_count': department_employee_count,
+        'team_member_count': team_member_count,
         'department_activities': department_activities
     }
 
@@ -2,22 +2,21 @@ from flask import Blueprint, jsonify, request
 from core.extensions import db
 from core.models import Department
 from modules.auth.jwt_utils import mobile_auth_required, mobile_role_required
+from core.decorators import conditional_get
+from core.schemas import dump, dump_many, DEPARTMENT_SUMMARY_FIELDS
+from modules.department.services import department_summaries, department_counts, department_employees
 
 api_department_bp = Blueprint('api_department', __name__, url_prefix='/api/departments')
 
 @api_department_bp.route('', methods=['GET'])
 @mobile_auth_required
+@conditional_get('departments', 'employees', 'candidates')
 def get_departments():
     try:
-        departments = Department.query.all()
+        departments = department_summaries()
         return jsonify({
             'success': True,
-            'departments': [{
-                'id': dept.id,
-                'name': dept.name,
-                'description': dept.description,
-                'employee_count': len(dept.employees)
-            } for dept in departments]
+            'departments': dump_many('department', departments, DEPARTMENT_SUMMARY_FIELDS)
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -27,19 +26,22 @@ def get_departments():
 def get_department(id):
     try:
         dept = Department.query.get_or_404(id)
+        employee_count, candidate_count = department_counts(dept.id)
+        employees, next_cursor = department_employees(
+            dept.id,
+            cursor=request.args.get('cursor', type=int),
+            limit=request.args.get('limit', type=int),
+            columns=['id', 'full_name', 'job_title']
+        )
         return jsonify({
             'success': True,
-            'department': {
-                'id': dept.id,
-                'name': dept.name,
-                'description': dept.description,
-                'created_at': dept.created_at.isoformat(),
-                'employees': [{
-                    'id': emp.id,
-                    'full_name': emp.full_name,
-                    'job_title': emp.job_title
-                } for emp in dept.employees]
-            }
+            'department': dict(
+                dump('department', dept, ('id', 'name', 'description', 'created_at')),
+                employee_count=employee_count,
+                candidate_count=candidate_count,
+                employees=dump_many('employee', employees, ('id', 'full_name', 'job_title')),
+                next_cursor=next_cursor
+            )
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
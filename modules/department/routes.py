@@ -1,47 +1,57 @@
 # modules/department/routes.py
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from core.extensions import db
 from core.models import Department, Employee, Candidate
 from flask_login import login_required
 from modules.department.forms import DepartmentForm, DeleteForm
+from modules.department.services import department_summaries, department_employees
 
 department_bp = Blueprint('department', __name__, url_prefix='/department')
 
 
 # -------------------- LIST DEPARTMENTS --------------------
+def _summary_cards():
+    # One aggregate query; rosters are fetched per card from department.department_members
+    return [{
+        'department': {
+            'id': dept.id,
+            'name': dept.name,
+            'description': dept.description
+        },
+        'employee_count': dept.employee_count,
+        'candidate_count': dept.candidate_count
+    } for dept in department_summaries()]
+
+
 @department_bp.route('/')
 @login_required
 def list_departments():
-    departments = Department.query.order_by(Department.name).all()
-    summary = []
-
-    for dept in departments:
-        employees = Employee.query.filter_by(department_id=dept.id).all()
-        # Only include employee fields, no user data
-        serialized_employees = [
-            {
-                'id': emp.id,
-                'full_name': emp.full_name,
-                'job_title': emp.job_title,
-                'phone': emp.phone,
-                'actual_address': emp.actual_address,
-                'mother_country_address': emp.mother_country_address,
-                'nationality': emp.nationality,
-                'id_number': emp.id_number
-            } for emp in employees
-        ]
-        summary.append({
-            'department': {
-                'id': dept.id,
-                'name': dept.name,
-                'description': dept.description
-            },
-            'employee_count': len(employees),
-            'employees': serialized_employees
-        })
-
     delete_form = DeleteForm()
-    return render_template('dashboard/departments/list.html', summary=summary, delete_form=delete_form)
+    return render_template('dashboard/departments/list.html', summary=_summary_cards(), delete_form=delete_form)
+
+
+# -------------------- DEPARTMENT ROSTER (JSON, paginated) --------------------
+@department_bp.route('/<int:dept_id>/members')
+@login_required
+def department_members(dept_id):
+    Department.query.get_or_404(dept_id)
+    employees, next_cursor = department_employees(
+        dept_id,
+        cursor=request.args.get('cursor', type=int),
+        limit=request.args.get('limit', type=int),
+        columns=['id', 'full_name', 'job_title', 'phone', 'nationality']
+    )
+    return jsonify({
+        'success': True,
+        'employees': [{
+            'id': emp.id,
+            'full_name': emp.full_name,
+            'job_title': emp.job_title,
+            'phone': emp.phone,
+            'nationality': emp.nationality
+        } for emp in employees],
+        'next_cursor': next_cursor
+    })
 
 
 # -------------------- CREATE DEPARTMENT --------------------
@@ -145,36 +155,5 @@ def view_department(dept_id):
 @department_bp.route('/summary')
 @login_required
 def department_summary():
-    departments = Department.query.order_by(Department.name).all()
-    summary = []
-
-    for dept in departments:
-        employees = Employee.query.filter_by(department_id=dept.id).all()
-        serialized_employees = [
-            {
-                'id': emp.id,
-                'full_name': emp.full_name,
-                'job_title': emp.job_title,
-                'phone': emp.phone,
-                'actual_address': emp.actual_address,
-                'mother_country_address': emp.mother_country_address,
-                'country': emp.country,
-                'state': emp.state,
-                'birth_date': emp.birth_date.strftime('%Y-%m-%d') if emp.birth_date else None,
-                'nationality': emp.nationality,
-                'id_number': emp.id_number
-            } for emp in employees
-        ]
-
-        summary.append({
-            'department': {
-                'id': dept.id,
-                'name': dept.name,
-                'description': dept.description
-            },
-            'employee_count': len(employees),
-            'employees': serialized_employees
-        })
-
     delete_form = DeleteForm()
-    return render_template('dashboard/departments/list.html', summary=summary, delete_form=delete_form)
+    return render_template('dashboard/departments/list.html', summary=_summary_cards(), delete_form=delete_form)
@@ -0,0 +1,79 @@
+# modules/department/services.py
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
+
+from core.extensions import db
+from core.models import Department, Employee, Candidate
+
+DEFAULT_MEMBER_PAGE = 100
+MAX_MEMBER_PAGE = 500
+
+
+def department_choices():
+    """Departments for dropdowns: id and name only, no members"""
+    return Department.query.options(load_only(Department.id, Department.name))\
+        .order_by(Department.name).all()
+
+
+def department_summaries():
+    """
+    Every department with its headcount and candidate count, in one query.
+    Counts come from grouped subqueries, so no employee or candidate row is loaded.
+    Returns a list of row objects: id, name, description, created_at, employee_count, candidate_count.
+    """
+    employee_counts = db.session.query(
+        Employee.department_id.label('department_id'),
+        func.count(Employee.id).label('total')
+    ).group_by(Employee.department_id).subquery()
+
+    candidate_counts = db.session.query(
+        Candidate.department_id.label('department_id'),
+        func.count(Candidate.id).label('total')
+    ).group_by(Candidate.department_id).subquery()
+
+    return db.session.query(
+        Department.id,
+        Department.name,
+        Department.description,
+        Department.created_at,
+        func.coalesce(employee_counts.c.total, 0).label('employee_count'),
+        func.coalesce(candidate_counts.c.total, 0).label('candidate_count')
+    ).outerjoin(employee_counts, employee_counts.c.department_id == Department.id)\
+        .outerjoin(candidate_counts, candidate_counts.c.department_id == Department.id)\
+        .order_by(Department.name).all()
+
+
+def department_counts(department_id):
+    """(employee_count, candidate_count) for one department"""
+    employee_count = db.session.query(func.count(Employee.id))\
+        .filter(Employee.department_id == department_id).scalar()
+    candidate_count = db.session.query(func.count(Candidate.id))\
+        .filter(Candidate.department_id == department_id).scalar()
+    return employee_count, candidate_count
+
+
+def _page(query, model, cursor=None, limit=None):
+    """Keyset page ordered by primary key. Returns (rows, next_cursor)."""
+    limit = min(max(limit or DEFAULT_MEMBER_PAGE, 1), MAX_MEMBER_PAGE)
+    if cursor:
+        query = query.filter(model.id > cursor)
+    rows = query.order_by(model.id.asc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, (rows[-1].id if has_more else None)
+
+
+def department_employees(department_id, cursor=None, limit=None, columns=None):
+    """One page of a department's employees (only `columns` are loaded, if given)"""
+    query = Employee.query.filter(Employee.department_id == department_id)
+    if columns:
+        query = query.options(load_only(*[getattr(Employee, c) for c in columns]))
+    return _page(query, Employee, cursor, limit)
+
+
+def department_candidates(department_id, cursor=None, limit=None, columns=None):
+    """One page of a department's candidates"""
+    query = Candidate.query.filter(Candidate.department_id == department_id)
+    if columns:
+        query = query.options(load_only(*[getattr(Candidate, c) for c in columns]))
+    return _page(query, Candidate, cursor, limit)
@@ -1,8 +1,12 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, Response, stream_with_context, send_file
 from core.extensions import db
 from core.models import Employee, Department, User
 from datetime import datetime
 from modules.auth.jwt_utils import mobile_auth_required
+from core.schemas import compile_schema, dump, EMPLOYEE_DETAIL_FIELDS
+from core.decorators import conditional_get
+from core.read_models import EMPLOYEE_COLUMNS, employee_rows, fetch
+from core.streaming import stream_mode, stream_rows
 
 api_employee_bp = Blueprint('api_employee', __name__, url_prefix='/api/employees')
 
@@ -17,32 +21,151 @@ def get_current_user():
 # --------------------------------------------------------
 # GET ALL EMPLOYEES
 # --------------------------------------------------------
+# Selectable fields: see EMPLOYEE_COLUMNS in core/read_models.py (shapes live in core/schemas.py)
+DEFAULT_EMPLOYEE_FIELDS = ['id', 'full_name', 'job_title', 'phone', 'department', 'country', 'nationality', 'role']
+MAX_PAGE_SIZE = 500
+
+
 @api_employee_bp.route('', methods=['GET'])
 @mobile_auth_required
+@conditional_get('employees', 'departments', 'users')
 def get_employees():
     try:
-        employees = Employee.query.all()
+        fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()] or DEFAULT_EMPLOYEE_FIELDS
+        unknown = [f for f in fields if f not in EMPLOYEE_COLUMNS]
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(EMPLOYEE_COLUMNS)}"
+            }), 400
+
+        # Column-only SELECT: rows are tuples, not Employee instances
+        query = employee_rows(fields)
+
+        # Filters
+        department_id = request.args.get('department_id', type=int)
+        if department_id:
+            query = query.where(Employee.department_id == department_id)
+        if request.args.get('nationality'):
+            query = query.where(Employee.nationality == request.args['nationality'])
+        has_account = request.args.get('has_account')
+        if has_account is not None:
+            linked = has_account.lower() in ('1', 'true', 'yes')
+            query = query.where(Employee.user_id.isnot(None) if linked else Employee.user_id.is_(None))
+
+        # ?stream=1 / ?stream=ndjson: the whole (filtered) table, no paging
+        mode = stream_mode()
+        if mode:
+            return stream_rows(query.order_by(Employee.id.asc()), compile_schema('employee_row', tuple(fields)),
+                               'employees', mode)
+
+        # Keyset pagination on the primary key (?cursor=<last id>&limit=)
+        cursor = request.args.get('cursor', type=int)
+        limit = request.args.get('limit', type=int)
+        if cursor:
+            query = query.where(Employee.id > cursor)
+        query = query.order_by(Employee.id.asc())
+        if cursor or limit:
+            limit = min(max(limit or 50, 1), MAX_PAGE_SIZE)
+            employees = fetch(query.limit(limit + 1))
+            has_more = len(employees) > limit
+            employees = employees[:limit]
+        else:
+            employees = fetch(query)
+            has_more = False
+
+        serialize = compile_schema('employee_row', tuple(fields))
         return jsonify({
             'success': True,
-            'employees': [{
-                'id': emp.id,
-                'full_name': emp.full_name,
-                'job_title': emp.job_title,
-                'phone': emp.phone,
-                'department': {
-                    'id': emp.department.id,
-                    'name': emp.department.name
-                } if emp.department else None,
-                'country': emp.country,
-                'nationality': emp.nationality,
-                'role': emp.user.role if emp.user else 'employee'  # Default to employee if no user account
-            } for emp in employees]
+            'employees': [serialize(emp) for emp in employees],
+            'next_cursor': employees[-1].id if has_more else None
         }), 200
 
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+# --------------------------------------------------------
+# BULK IMPORT / EXPORT
+# --------------------------------------------------------
+@api_employee_bp.route('/import', methods=['POST'])
+@mobile_auth_required
+def import_employees():
+    try:
+        from modules.employee.services import import_employees as run_import
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        file = request.files.get('file')
+        if not file or file.filename == '':
+            return jsonify({'success': False, 'message': 'A .csv or .xlsx file is required'}), 400
+
+        dry_run = request.form.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        report = run_import(file, dry_run=dry_run)
+        return jsonify(dict(report, success=True)), 200
+
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@api_employee_bp.route('/export', methods=['GET'])
+@mobile_auth_required
+def export_employees():
+    try:
+        from modules.employee.services import export_employees_csv, export_employees_xlsx
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        stamp = datetime.utcnow().strftime('%Y%m%d')
+        if request.args.get('format') == 'xlsx':
+            return send_file(
+                export_employees_xlsx(),
+                as_attachment=True,
+                download_name=f'employees_{stamp}.xlsx',
+                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            )
+        return Response(
+            stream_with_context(export_employees_csv()),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename=employees_{stamp}.csv'}
+        )
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+# --------------------------------------------------------
+# BULK UPDATE (reassignment etc.)
+# --------------------------------------------------------
+@api_employee_bp.route('/bulk', methods=['POST'])
+@mobile_auth_required
+def bulk_update_employees():
+    try:
+        from modules.employee.services import bulk_update_employees as run_bulk_update
+        from core.services.bulk_update import BulkUpdateError
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director', 'manager']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        data = request.get_json(silent=True) or {}
+        try:
+            summary = run_bulk_update(data.get('patch'), ids=data.get('ids'),
+                                      filters=data.get('filter'), actor_id=current_user.id)
+        except BulkUpdateError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return jsonify(dict(summary, success=True)), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 # --------------------------------------------------------
 # GET SINGLE EMPLOYEE
 # --------------------------------------------------------
@@ -53,29 +176,7 @@ def get_employee(id):
         emp = Employee.query.get_or_404(id)
         return jsonify({
             'success': True,
-            'employee': {
-                'id': emp.id,
-                'full_name': emp.full_name,
-                'job_title': emp.job_title,
-                'phone': emp.phone,
-                'actual_address': emp.actual_address,
-                'mother_country_address': emp.mother_country_address,
-                'country': emp.country,
-                'state': emp.state,
-                'birth_date': emp.birth_date.isoformat() if emp.birth_date else None,
-                'id_number': emp.id_number,
-                'nationality': emp.nationality,
-                'department': {
-                    'id': emp.department.id,
-                    'name': emp.department.name
-                } if emp.department else None,
-                'user': {
-                    'id': emp.user.id,
-                    'email': emp.user.email,
-                    'role': emp.user.role
-                } if emp.user else None,
-                'created_at': emp.created_at.isoformat() if emp.created_at else None
-            }
+            'employee': dump('employee', emp, EMPLOYEE_DETAIL_FIELDS)
         }), 200
 
     except Exception as e:
@@ -163,10 +264,10 @@ def update_employee(id):
 @mobile_auth_required
 def delete_employee(id):
     try:
-        emp = Employee.query.get_or_404(id)
-        db.session.delete(emp)
-        db.session.commit()
-        
+        from modules.employee.services import delete_employee as delete_employee_service
+        # Logical delete; documents and files are purged by a background job
+        delete_employee_service(id)
+
         return jsonify({
             'success': True,
             'message': 'Employee deleted successfully'
@@ -1,5 +1,6 @@
 import os
-from flask import Blueprint, request, redirect, url_for, flash, current_app, send_file, render_template
+from datetime import datetime
+from flask import Blueprint, request, redirect, url_for, flash, current_app, send_file, render_template, Response, stream_with_context
 from flask_login import login_required, current_user
 from core.decorators import permission_required
 from core.permissions import Permission
@@ -9,6 +10,9 @@ from .services import (
     delete_employee,
     _save_employee_documents,
     create_folder_for_employee,
+    import_employees,
+    export_employees_csv,
+    export_employees_xlsx,
 )
 from core.models import UserDocument
 from core.extensions import db
@@ -172,6 +176,52 @@ def delete_document(doc_id):
 
     return redirect(url_for('dashboard.employee_dashboard') if current_user.role == 'employee' else 'dashboard.role_dashboard')
 
+# ------------------------
+# Bulk Import / Export
+# ------------------------
+@employee_bp.route('/import', methods=['POST'])
+@login_required
+@permission_required(Permission.ADMIN)
+def import_file():
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        flash('Please choose a .csv or .xlsx file to import.', 'danger')
+        return redirect(url_for('dashboard.employee_summary'))
+    try:
+        report = import_employees(file)
+    except ValueError as e:
+        db.session.rollback()
+        flash(f'❌ {e}', 'danger')
+        return redirect(url_for('dashboard.employee_summary'))
+
+    flash(f"✅ {report['created']} employee(s) created, {report['updated']} updated, "
+          f"{report['skipped']} row(s) skipped.", 'success')
+    for item in report['errors'][:10]:
+        flash(f"Row {item['row']}: {'; '.join(item['errors'])}", 'warning')
+    if report['skipped'] > 10:
+        flash(f"... and {report['skipped'] - 10} more row(s) with errors.", 'warning')
+    return redirect(url_for('dashboard.employee_summary'))
+
+
+@employee_bp.route('/export')
+@login_required
+@permission_required(Permission.ADMIN)
+def export_file():
+    stamp = datetime.utcnow().strftime('%Y%m%d')
+    if request.args.get('format') == 'xlsx':
+        return send_file(
+            export_employees_xlsx(),
+            as_attachment=True,
+            download_name=f'employees_{stamp}.xlsx',
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+    return Response(
+        stream_with_context(export_employees_csv()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=employees_{stamp}.csv'}
+    )
+
+
 # ------------------------
 # Employee List Page
 # ------------------------
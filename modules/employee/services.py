@@ -1,12 +1,13 @@
 import os
 from typing import Optional, Union, List, Tuple
 import secrets
-from datetime import datetime
+from datetime import datetime, date
 from flask import current_app
 from werkzeug.utils import secure_filename
 
 from core.extensions import db
 from core.models import Employee, EmployeeDocument
+from core.services.job_queue import enqueue, job_handler, job_progress, report_progress
 
 # ------------------------
 # Helpers
@@ -230,24 +231,319 @@ def update_employee(employee_id, form_data, files=None):
 
 
 def delete_employee(employee_id):
+    """
+    Logically delete an employee. The row disappears from every query at once;
+    documents, files and the row itself are removed by the 'purge_employee'
+    background job, so the request does not wait on the file system.
+    """
     employee = Employee.query.get_or_404(employee_id)
-
-    # Delete all employee documents
-    docs = EmployeeDocument.query.filter_by(employee_id=employee.id).all()
-    for doc in docs:
-        try:
-            abs_path = os.path.join(current_app.config['UPLOAD_FOLDER'], doc.filepath)
-            if os.path.exists(abs_path):
-                os.remove(abs_path)
-        except Exception:
-            pass
-        db.session.delete(doc)
-
-    db.session.delete(employee)
+    employee.deleted_at = datetime.utcnow()
     try:
+        enqueue('purge_employee', {'employee_id': employee.id}, commit=False)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         raise e
 
     return employee
+
+
+@job_handler('purge_employee')
+def purge_employee(payload):
+    """Background cleanup for delete_employee: documents and files in batches, then the row"""
+    from sqlalchemy import delete, select
+    from core.services import purge, search_index
+
+    employee_id = payload['employee_id']
+    employee = db.session.execute(
+        select(Employee).filter_by(id=employee_id).execution_options(include_deleted=True)
+    ).scalar_one_or_none()
+    if employee is None or employee.deleted_at is None:
+        return  # already purged, or restored before the job ran
+
+    progress = job_progress()
+    batch_size = payload.get('batch_size', purge.PURGE_BATCH_SIZE)
+    for ids in purge.purge_rows(EmployeeDocument, EmployeeDocument.employee_id == employee_id, progress,
+                                'documents', batch_size, filepath_column=EmployeeDocument.filepath):
+        search_index.remove(EmployeeDocument, ids)
+
+    purge.remove_upload_dir('employees', employee_id)
+    db.session.execute(delete(Employee).where(Employee.id == employee_id)
+                       .execution_options(synchronize_session=False))
+    progress['employee'] = 'deleted'
+    report_progress(progress)
+    db.session.commit()
+
+
+# ------------------------
+# Bulk import / export
+# ------------------------
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y")
+
+IMPORT_HEADER_ALIASES = {
+    'name': 'full_name',
+    'employee_name': 'full_name',
+    'position': 'job_title',
+    'title': 'job_title',
+    'mobile': 'phone',
+    'phone_number': 'phone',
+    'address': 'actual_address',
+    'home_address': 'mother_country_address',
+    'passport_number': 'id_number',
+    'passport_no': 'id_number',
+    'iqama_number': 'id_number',
+    'id_no': 'id_number',
+    'date_of_birth': 'birth_date',
+    'dob': 'birth_date',
+    'department': 'department_name',
+}
+
+# Column order of the CSV/XLSX export (also accepted back by the import)
+EXPORT_COLUMNS = [
+    'id', 'full_name', 'job_title', 'phone', 'department_name', 'nationality', 'country', 'state',
+    'actual_address', 'mother_country_address', 'birth_date', 'id_type', 'id_number', 'created_at'
+]
+_TEXT_LIMITS = {
+    'full_name': 120, 'job_title': 120, 'phone': 20, 'actual_address': 255, 'mother_country_address': 255,
+    'country': 100, 'state': 100, 'nationality': 100, 'id_type': 50,
+}
+
+
+def _parse_date(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"invalid birth_date '{value}' (use YYYY-MM-DD)")
+
+
+def _employee_import_row(row, departments):
+    """Validate one spreadsheet row. Returns (mapping, errors); only filled-in columns are mapped."""
+    errors = []
+    mapping = {}
+
+    id_number = row.get('id_number')
+    if not id_number:
+        errors.append("id_number is required (it identifies the employee)")
+    else:
+        mapping['id_number'] = str(id_number).strip()
+        if len(mapping['id_number']) > 50:
+            errors.append("id_number is longer than 50 characters")
+
+    for field, limit in _TEXT_LIMITS.items():
+        value = row.get(field)
+        if value is None:
+            continue
+        value = str(value)
+        if len(value) > limit:
+            errors.append(f"{field} is longer than {limit} characters")
+        mapping[field] = value
+
+    if row.get('birth_date') is not None:
+        try:
+            mapping['birth_date'] = _parse_date(row['birth_date'])
+        except ValueError as e:
+            errors.append(str(e))
+
+    if row.get('department_id'):
+        try:
+            department_id = int(row['department_id'])
+        except (TypeError, ValueError):
+            errors.append(f"invalid department_id '{row['department_id']}'")
+        else:
+            if department_id not in departments.values():
+                errors.append(f"department {department_id} does not exist")
+            mapping['department_id'] = department_id
+    elif row.get('department_name'):
+        department_id = departments.get(str(row['department_name']).strip().lower())
+        if department_id is None:
+            errors.append(f"unknown department '{row['department_name']}'")
+        mapping['department_id'] = department_id
+
+    return mapping, errors
+
+
+def import_employees(file_obj, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Stream a CSV/XLSX file of employees and upsert them on id_number.
+    Each batch costs one lookup of existing id_numbers, one bulk UPDATE for
+    known employees, one bulk INSERT for new ones and one commit. Empty
+    cells leave existing values untouched; new rows need full_name.
+    Returns {'created', 'updated', 'skipped', 'errors': [{'row', 'errors'}], 'errors_truncated'}.
+    """
+    from sqlalchemy import insert, update
+    from core.models import Department
+    from core.services.tabular_import import iter_rows, chunked
+    from core.services import change_log, search_index
+
+    # Department names are resolved once per import, not once per row
+    departments = {name.strip().lower(): dep_id for dep_id, name in db.session.query(Department.id, Department.name)}
+    seen = set()
+    created = updated = skipped = 0
+    report = []
+
+    def reject(row_number, errors):
+        nonlocal skipped
+        skipped += 1
+        if len(report) < MAX_REPORTED_ERRORS:
+            report.append({'row': row_number, 'errors': errors})
+
+    for batch in chunked(iter_rows(file_obj, aliases=IMPORT_HEADER_ALIASES), batch_size):
+        validated = []
+        for row_number, row in batch:
+            mapping, errors = _employee_import_row(row, departments)
+            if not errors and mapping['id_number'] in seen:
+                errors = [f"duplicate id_number '{mapping['id_number']}' in file"]
+            if errors:
+                reject(row_number, errors)
+                continue
+            seen.add(mapping['id_number'])
+            validated.append((row_number, mapping))
+
+        existing = dict(db.session.query(Employee.id_number, Employee.id).filter(
+            Employee.id_number.in_([m['id_number'] for _, m in validated])
+        )) if validated else {}
+
+        inserts, updates = [], []
+        for row_number, mapping in validated:
+            employee_id = existing.get(mapping['id_number'])
+            if employee_id:
+                updates.append(dict(mapping, id=employee_id))
+            elif not mapping.get('full_name'):
+                reject(row_number, ["full_name is required for a new employee"])
+            else:
+                inserts.append(mapping)
+
+        if not dry_run and (inserts or updates):
+            touched = [u['id'] for u in updates]
+            if updates:
+                db.session.execute(update(Employee), updates)
+            if inserts:
+                touched += db.session.scalars(
+                    insert(Employee).returning(Employee.id, sort_by_parameter_order=True), inserts
+                ).all()
+            change_log.record(Employee, touched)
+            db.session.commit()
+            search_index.reindex(Employee, touched)
+        created += len(inserts)
+        updated += len(updates)
+
+    return {
+        'created': created,
+        'updated': updated,
+        'skipped': skipped,
+        'dry_run': dry_run,
+        'errors': report,
+        'errors_truncated': skipped > len(report),
+    }
+
+
+def _export_rows(chunk_size=1000):
+    """Employee rows (lists in EXPORT_COLUMNS order) read through a server-side cursor"""
+    from sqlalchemy import select
+    from core.models import Department
+
+    stmt = select(
+        Employee.id, Employee.full_name, Employee.job_title, Employee.phone, Department.name,
+        Employee.nationality, Employee.country, Employee.state, Employee.actual_address,
+        Employee.mother_country_address, Employee.birth_date, Employee.id_type, Employee.id_number,
+        Employee.created_at
+    ).outerjoin(Department, Department.id == Employee.department_id).order_by(Employee.id)
+
+    result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+    try:
+        for partition in result.partitions():
+            for row in partition:
+                yield [
+                    v.isoformat() if isinstance(v, (date, datetime)) else v
+                    for v in row
+                ]
+    finally:
+        result.close()
+
+
+def export_employees_csv(chunk_size=1000):
+    """Yield the CSV export in chunks of encoded lines, suitable for a streamed response"""
+    import csv
+    import io
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for n, row in enumerate(_export_rows(chunk_size), start=1):
+        writer.writerow(row)
+        if n % chunk_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue().encode('utf-8')
+
+
+def export_employees_xlsx(chunk_size=1000):
+    """
+    Write the XLSX export with a write-only workbook (rows go to a temp file,
+    not memory) and return a file object positioned at the start.
+    """
+    import tempfile
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Employees')
+    sheet.append(EXPORT_COLUMNS)
+    for row in _export_rows(chunk_size):
+        sheet.append(row)
+
+    output = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+# ------------------------
+# Bulk updates
+# ------------------------
+def _check_department(department_id):
+    from core.models import Department
+    from core.services.bulk_update import BulkUpdateError
+    if department_id is not None and db.session.get(Department, department_id) is None:
+        raise BulkUpdateError(f"department {department_id} does not exist")
+
+
+# field -> (type, validator)
+BULK_EMPLOYEE_FIELDS = {
+    'department_id': (int, _check_department),
+    'job_title': (str, None),
+    'nationality': (str, None),
+    'country': (str, None),
+    'state': (str, None),
+}
+BULK_EMPLOYEE_FILTERS = ('department_id', 'nationality', 'country', 'job_title', 'user_id')
+
+
+def bulk_update_employees(patch, ids=None, filters=None, actor_id=None):
+    """
+    Apply one validated patch to many employees (by ids or by filter) in a
+    single transaction and UPDATE statement. Raises BulkUpdateError for an
+    invalid request. Returns the per-id summary.
+    """
+    from core.services import bulk_update, change_log, search_index
+
+    values = bulk_update.validate_patch(patch, BULK_EMPLOYEE_FIELDS)
+    requested, existing = bulk_update.resolve_targets(Employee, ids, filters, BULK_EMPLOYEE_FILTERS)
+    try:
+        updated = bulk_update.apply_bulk_update(Employee, existing, values, actor_id, 'employees')
+        change_log.record(Employee, updated)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    if set(values) & {'job_title', 'nationality', 'country', 'state'}:
+        search_index.reindex(Employee, updated)
+    return bulk_update.summarize(requested, existing, updated)
@@ -1,8 +1,15 @@
 from flask import Blueprint, jsonify, request
 from core.extensions import db
-from core.models import LeaveRequest, User
-from datetime import datetime
+from core.models import LeaveRequest, User, Holiday
+from core.services import work_calendar
+from datetime import datetime, date
 from modules.auth.jwt_utils import mobile_auth_required
+from core.decorators import conditional_get
+from core.schemas import dump_many, LEAVE_OWN_FIELDS, LEAVE_PENDING_FIELDS
+from modules.leave import availability, ledger
+from modules.leave.services import (
+    pending_queue, queue_scope, can_decide, decide_leaves, resolve_approver, QUEUE_PAGE_SIZE
+)
 
 api_leave_bp = Blueprint('api_leave', __name__, url_prefix='/api/leaves')
 
@@ -14,11 +21,21 @@ def get_current_user():
     return User.query.get(user_id)
 
 
+def _with_working_days(leaves, fields):
+    """Serialized leaves plus their working days (counted in one batch per site)"""
+    days = work_calendar.leave_days(leaves)
+    items = dump_many('leave', leaves, fields)
+    for item, lr in zip(items, leaves):
+        item['working_days'] = days[lr.id]
+    return items
+
+
 # ------------------------------------------------------------
 # GET LOGGED USER LEAVE REQUESTS
 # ------------------------------------------------------------
 @api_leave_bp.route('', methods=['GET'])
 @mobile_auth_required
+@conditional_get('leave_requests', 'employees', 'holidays')
 def get_leaves():
     try:
         user = get_current_user()
@@ -26,15 +43,7 @@ def get_leaves():
 
         return jsonify({
             'success': True,
-            'leaves': [{
-                'id': lv.id,
-                'type': lv.type,
-                'start_date': lv.start_date.isoformat(),
-                'end_date': lv.end_date.isoformat(),
-                'reason': lv.reason,
-                'status': lv.status,
-                'created_at': lv.created_at.isoformat()
-            } for lv in leaves]
+            'leaves': _with_working_days(leaves, LEAVE_OWN_FIELDS)
         }), 200
 
     except Exception as e:
@@ -46,30 +55,202 @@ def get_leaves():
 # ------------------------------------------------------------
 @api_leave_bp.route('/pending', methods=['GET'])
 @mobile_auth_required
+@conditional_get('leave_requests', 'users', 'employees', 'holidays', 'org_closure')
 def get_pending():
+    """The caller's approval queue, oldest first: ?cursor=<next_cursor>&limit="""
     try:
-        leaves = LeaveRequest.query.filter_by(status='pending').all()
+        user = get_current_user()
+        if queue_scope(user) is None:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+        try:
+            leaves, next_cursor, total = pending_queue(
+                user, cursor=request.args.get('cursor'), limit=request.args.get('limit', QUEUE_PAGE_SIZE, type=int))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
 
         return jsonify({
             'success': True,
-            'leaves': [{
-                'id': lv.id,
-                'requester': {
-                    'id': lv.requester.id,
-                    'name': lv.requester.name
-                },
-                'type': lv.type,
-                'start_date': lv.start_date.isoformat(),
-                'end_date': lv.end_date.isoformat(),
-                'reason': lv.reason,
-                'created_at': lv.created_at.isoformat()
-            } for lv in leaves]
+            'leaves': _with_working_days(leaves, LEAVE_PENDING_FIELDS),
+            'next_cursor': next_cursor,
+            'total': total
         }), 200
 
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+# ------------------------------------------------------------
+# LEAVE BALANCE (LEDGER)
+# ------------------------------------------------------------
+BALANCE_ADMIN_ROLES = ['it_manager', 'general_director']
+
+
+@api_leave_bp.route('/balance', methods=['GET'])
+@mobile_auth_required
+def get_balance():
+    """Remaining days per leave type (?user_id= for managers) and the latest postings"""
+    try:
+        user = get_current_user()
+        user_id = request.args.get('user_id', type=int) or user.id
+        if user_id != user.id and user.role.lower() not in availability.CALENDAR_ALL_ROLES:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        limit = min(max(request.args.get('limit', 20, type=int), 0), 200)
+        return jsonify({
+            'success': True,
+            'user_id': user_id,
+            'balances': ledger.balances(user_id),
+            'entries': [{
+                'id': e.id,
+                'leave_type': e.leave_type,
+                'kind': e.kind,
+                'days': e.days,
+                'leave_request_id': e.leave_request_id,
+                'note': e.note,
+                'created_at': e.created_at,
+            } for e in ledger.entries(user_id, limit=limit)] if limit else []
+        }), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@api_leave_bp.route('/balance/adjust', methods=['POST'])
+@mobile_auth_required
+def adjust_balance():
+    """HR correction: {"user_id": 5, "days": -2, "leave_type": "annual", "note": "..."}"""
+    try:
+        user = get_current_user()
+        if user.role.lower() not in BALANCE_ADMIN_ROLES:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        data = request.get_json(silent=True) or {}
+        target = db.session.get(User, data.get('user_id') or 0)
+        if target is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+        try:
+            ledger.adjust(target.id, float(data.get('days') or 0), leave_type=data.get('leave_type', 'annual'),
+                          note=(data.get('note') or '').strip() or None, actor_id=user.id)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        db.session.commit()
+
+        return jsonify({'success': True, 'balances': ledger.balances(target.id)}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+# ------------------------------------------------------------
+# DEPARTMENT AVAILABILITY CALENDAR
+# ------------------------------------------------------------
+def _calendar_month():
+    """The month the calendar shows: ?month, else the current one (so the ETag rolls over with it)"""
+    return request.args.get('month') or date.today().strftime('%Y-%m')
+
+
+@api_leave_bp.route('/calendar', methods=['GET'])
+@mobile_auth_required
+@conditional_get('leave_requests', 'employees', 'holidays', vary=_calendar_month)
+def get_calendar():
+    """?month=YYYY-MM&department_id= : per-day headcount scheduled / on leave / available, plus the leaves"""
+    try:
+        user = get_current_user()
+        own_department = availability.user_department_id(user)
+        department_id = request.args.get('department_id', type=int) or own_department
+        if department_id is None:
+            return jsonify({'success': False, 'message': 'department_id is required'}), 400
+        if department_id != own_department and user.role.lower() not in availability.CALENDAR_ALL_ROLES:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        try:
+            first, last = availability.month_bounds(request.args.get('month'))
+        except ValueError:
+            return jsonify({'success': False, 'message': 'month must be YYYY-MM'}), 400
+
+        calendar = availability.department_calendar(department_id, first, last)
+        return jsonify(dict(calendar, success=True)), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+# ------------------------------------------------------------
+# PUBLIC HOLIDAYS (working-day calendars)
+# ------------------------------------------------------------
+@api_leave_bp.route('/holidays', methods=['GET'])
+@mobile_auth_required
+@conditional_get('holidays')
+def get_holidays():
+    """?site=&year= ; site defaults to every site"""
+    try:
+        query = Holiday.query
+        if request.args.get('site'):
+            query = query.filter(Holiday.site.in_({request.args['site'], work_calendar.DEFAULT_SITE}))
+        year = request.args.get('year', type=int)
+        if year:
+            query = query.filter(Holiday.date.between(date(year, 1, 1), date(year, 12, 31)))
+        return jsonify({
+            'success': True,
+            'sites': list(work_calendar.sites()),
+            'holidays': [{'id': h.id, 'site': h.site, 'date': h.date, 'name': h.name}
+                         for h in query.order_by(Holiday.date, Holiday.site).all()]
+        }), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@api_leave_bp.route('/holidays', methods=['POST'])
+@mobile_auth_required
+def create_holidays():
+    """{"site": "default", "holidays": [{"date": "2026-09-23", "name": "National Day"}, ...]}"""
+    try:
+        user = get_current_user()
+        if user.role.lower() not in BALANCE_ADMIN_ROLES:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        data = request.get_json(silent=True) or {}
+        site = data.get('site') or work_calendar.DEFAULT_SITE
+        if site not in work_calendar.sites():
+            return jsonify({'success': False, 'message': f"Unknown site. Configured: {', '.join(work_calendar.sites())}"}), 400
+        try:
+            wanted = {datetime.strptime(h['date'], '%Y-%m-%d').date(): (h.get('name') or '').strip() or 'Holiday'
+                      for h in data.get('holidays') or []}
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'success': False, 'message': 'holidays must be a list of {"date": "YYYY-MM-DD", "name": ...}'}), 400
+
+        existing = {d for (d,) in db.session.query(Holiday.date)
+                    .filter(Holiday.site == site, Holiday.date.in_(wanted)).all()}
+        db.session.add_all([Holiday(site=site, date=d, name=name) for d, name in wanted.items() if d not in existing])
+        db.session.commit()
+
+        return jsonify({'success': True, 'created': len(wanted) - len(existing), 'skipped': len(existing)}), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@api_leave_bp.route('/holidays/<int:id>', methods=['DELETE'])
+@mobile_auth_required
+def delete_holiday(id):
+    try:
+        user = get_current_user()
+        if user.role.lower() not in BALANCE_ADMIN_ROLES:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        holiday = Holiday.query.get_or_404(id)
+        db.session.delete(holiday)
+        db.session.commit()
+        return jsonify({'success': True, 'message': 'Holiday deleted'}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 # ------------------------------------------------------------
 # CREATE LEAVE REQUEST
 # ------------------------------------------------------------
@@ -80,11 +261,29 @@ def create_leave():
         user = get_current_user()
         data = request.json
 
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+        try:
+            working_days = availability.check_dates(user.id, start_date, end_date)
+        except availability.LeaveOverlapError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'conflicts': dump_many('leave', e.conflicts, ('id', 'type', 'start_date', 'end_date', 'status'))
+            }), 409
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        try:
+            approver_id = resolve_approver(user, data.get('approver_id'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+
         leave = LeaveRequest(
             user_id=user.id,
+            approver_id=approver_id,
             type=data.get('type', 'annual'),
-            start_date=datetime.strptime(data['start_date'], '%Y-%m-%d').date(),
-            end_date=datetime.strptime(data['end_date'], '%Y-%m-%d').date(),
+            start_date=start_date,
+            end_date=end_date,
             reason=data.get('reason'),
             status='pending'
         )
@@ -95,7 +294,8 @@ def create_leave():
         return jsonify({
             'success': True,
             'message': 'Leave request created',
-            'leave_id': leave.id
+            'leave_id': leave.id,
+            'working_days': working_days
         }), 201
 
     except Exception as e:
@@ -112,10 +312,16 @@ def approve_leave(id):
     try:
         user = get_current_user()
         leave = LeaveRequest.query.get_or_404(id)
+        if not can_decide(user, leave):
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+        if leave.status != 'pending':
+            # same rule as the bulk path: a decided leave is not re-decided
+            return jsonify({'success': False, 'message': f'Leave request is already {leave.status}'}), 409
 
         leave.status = 'approved'
         leave.approver_id = user.id
         leave.decided_at = datetime.utcnow()
+        ledger.sync_leave(leave, actor_id=user.id)
 
         db.session.commit()
 
@@ -126,6 +332,29 @@ def approve_leave(id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+# ------------------------------------------------------------
+# BULK APPROVE / REJECT
+# ------------------------------------------------------------
+@api_leave_bp.route('/decisions', methods=['POST'])
+@mobile_auth_required
+def decide_leaves_bulk():
+    try:
+        from core.services.bulk_update import BulkUpdateError
+        user = get_current_user()
+        data = request.get_json(silent=True) or {}
+        try:
+            summary = decide_leaves(user, data.get('ids'), data.get('decision'))
+        except PermissionError as e:
+            return jsonify({'success': False, 'message': str(e)}), 403
+        except BulkUpdateError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return jsonify(dict(summary, success=True)), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 # ------------------------------------------------------------
 # REJECT LEAVE REQUEST
 # ------------------------------------------------------------
@@ -135,10 +364,16 @@ def reject_leave(id):
     try:
         user = get_current_user()
         leave = LeaveRequest.query.get_or_404(id)
+        if not can_decide(user, leave):
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+        if leave.status != 'pending':
+            # same rule as the bulk path: a decided leave is not re-decided
+            return jsonify({'success': False, 'message': f'Leave request is already {leave.status}'}), 409
 
         leave.status = 'rejected'
         leave.approver_id = user.id
         leave.decided_at = datetime.utcnow()
+        ledger.sync_leave(leave, actor_id=user.id)
 
         db.session.commit()
 
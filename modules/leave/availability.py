@@ -0,0 +1,160 @@
+# modules/leave/availability.py
+# Leave overlap detection and per-day department availability.
+# Range lookups use the (user_id, start_date, end_date) index on leave_requests;
+# the day grid is built with NumPy date arrays when NumPy is installed.
+from calendar import monthrange
+from datetime import date, timedelta
+
+from core.extensions import db
+from core.models import LeaveRequest, Employee
+from core.services import work_calendar
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+# Leaves that hold the dates: a rejected request frees them again
+BLOCKING_STATUSES = ('pending', 'approved')
+
+# Roles that may look at any department's calendar (everyone else sees their own)
+CALENDAR_ALL_ROLES = ['it_manager', 'general_director', 'general_manager', 'head_of_department', 'manager']
+
+
+class LeaveOverlapError(ValueError):
+    """The requested dates collide with existing leave of the same user"""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        spans = ', '.join(f"#{lr.id} {lr.start_date.isoformat()}..{lr.end_date.isoformat()} ({lr.status})"
+                          for lr in conflicts)
+        super().__init__(f"Leave overlaps existing request(s): {spans}")
+
+
+def overlapping(start, end, user_id=None, department_id=None, statuses=BLOCKING_STATUSES, exclude_id=None):
+    """
+    Leave requests intersecting [start, end] (inclusive) for one user or a
+    whole department. Two ranges overlap when each starts before the other ends.
+    """
+    query = LeaveRequest.query.filter(LeaveRequest.start_date <= end, LeaveRequest.end_date >= start)
+    if user_id is not None:
+        query = query.filter(LeaveRequest.user_id == user_id)
+    if department_id is not None:
+        query = query.filter(LeaveRequest.user_id.in_(
+            db.session.query(Employee.user_id).filter(Employee.department_id == department_id,
+                                                      Employee.user_id.isnot(None))
+        ))
+    if statuses:
+        query = query.filter(LeaveRequest.status.in_(statuses))
+    if exclude_id is not None:
+        query = query.filter(LeaveRequest.id != exclude_id)
+    return query.order_by(LeaveRequest.start_date, LeaveRequest.id).all()
+
+
+def check_dates(user_id, start, end, exclude_id=None):
+    """
+    Validate a leave range for `user_id` and return its working days on the
+    user's site calendar; raises ValueError / LeaveOverlapError
+    """
+    if end < start:
+        raise ValueError("End date must be on or after the start date")
+    days = work_calendar.user_working_days(user_id, start, end)
+    if not days:
+        raise ValueError("The selected dates contain no working days (weekend or public holidays)")
+    conflicts = overlapping(start, end, user_id=user_id, exclude_id=exclude_id)
+    if conflicts:
+        raise LeaveOverlapError(conflicts)
+    return days
+
+
+def month_bounds(month):
+    """'YYYY-MM' (or None for the current month) -> (first day, last day)"""
+    if month:
+        year, mon = (int(part) for part in month.split('-'))
+    else:
+        today = date.today()
+        year, mon = today.year, today.month
+    return date(year, mon, 1), date(year, mon, monthrange(year, mon)[1])
+
+
+def _days_off(spans, working, first, last):
+    """
+    Members off on each day of [first, last] from (member index, start, end)
+    spans; `working` holds one per-day mask per member, and a member only counts
+    as off on their own working days (once per day, however many leaves overlap).
+    """
+    n_days = (last - first).days + 1
+    if np is not None:
+        grid = np.zeros((len(working), n_days), dtype=bool)
+        if spans:
+            rows, starts, ends = (np.array(column) for column in zip(*spans))
+            base = np.datetime64(first, 'D')
+            lo = (starts.astype('datetime64[D]') - base).astype(int)
+            hi = (ends.astype('datetime64[D]') - base).astype(int)
+            days = np.arange(n_days)
+            # leave x day mask, OR-ed into each member's row
+            np.logical_or.at(grid, rows, (days >= lo[:, None]) & (days <= hi[:, None]))
+        if working:
+            grid &= np.array(working, dtype=bool)
+        return grid.sum(axis=0).tolist()
+
+    off = [set() for _ in range(n_days)]
+    for row, start, end in spans:
+        for day in range(max((start - first).days, 0), min((end - first).days, n_days - 1) + 1):
+            if working[row][day]:
+                off[day].add(row)
+    return [len(users) for users in off]
+
+
+def department_calendar(department_id, first, last, statuses=BLOCKING_STATUSES):
+    """
+    Who is off in a department between `first` and `last`: per day, how many
+    members are scheduled to work (each on their own site calendar), how many of
+    those are on leave and how many are available, plus the leaves themselves.
+    Coverage is available / scheduled and None on a day nobody works.
+    """
+    members = db.session.query(Employee.user_id, Employee.full_name).filter(
+        Employee.department_id == department_id, Employee.user_id.isnot(None)
+    ).order_by(Employee.full_name).all()
+    index = {user_id: i for i, (user_id, _) in enumerate(members)}
+
+    leaves = overlapping(first, last, department_id=department_id, statuses=statuses)
+    spans = [(index[lr.user_id], lr.start_date, lr.end_date) for lr in leaves if lr.user_id in index]
+    member_sites = work_calendar.sites_for_users(index)
+    masks = {site: work_calendar.working_mask(first, last, site) for site in set(member_sites.values())}
+    working = [masks[member_sites[user_id]] for user_id, _ in members]
+    scheduled = [sum(day) for day in zip(*working)] if working else [0] * ((last - first).days + 1)
+    off = _days_off(spans, working, first, last)
+
+    headcount = len(members)
+    names = dict(members)
+    working_days = work_calendar.leave_days(leaves)
+    return {
+        'department_id': department_id,
+        'from': first,
+        'to': last,
+        'headcount': headcount,
+        'days': [{
+            'date': first + timedelta(days=i),
+            'working': bool(on_duty),
+            'scheduled': on_duty,
+            'off': count,
+            'available': on_duty - count,
+            'coverage': round((on_duty - count) / on_duty, 3) if on_duty else None,
+        } for i, (on_duty, count) in enumerate(zip(scheduled, off))],
+        'leaves': [{
+            'id': lr.id,
+            'user_id': lr.user_id,
+            'name': names.get(lr.user_id),
+            'type': lr.type,
+            'status': lr.status,
+            'start_date': lr.start_date,
+            'end_date': lr.end_date,
+            'working_days': working_days[lr.id],
+        } for lr in leaves],
+    }
+
+
+def user_department_id(user):
+    """Department of the employee record linked to `user` (None if unlinked)"""
+    return db.session.query(Employee.department_id).filter(Employee.user_id == user.id).scalar()
@@ -0,0 +1,212 @@
+# modules/leave/ledger.py
+# Leave balances as an append-only ledger of postings (accrual, consumption,
+# adjustment, carry_over) with a cached running balance per user and leave type,
+# so "remaining days" is a primary-key read instead of a scan of LeaveRequest.
+from datetime import date, datetime
+
+from flask import current_app
+from sqlalchemy import func, select, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from core.extensions import db
+from core.models import LeaveLedgerEntry, LeaveBalance, LeaveRequest, User
+from core.services.job_queue import job_handler, job_progress, report_progress
+from core.services import work_calendar
+
+LEDGER_BATCH_SIZE = 500
+
+
+def tracked_types():
+    """Leave types that draw on a balance (the ones with an entitlement)"""
+    return tuple(current_app.config['LEAVE_ENTITLEMENT_DAYS'])
+
+
+def post_many(entries):
+    """
+    Insert ledger entries (dicts of LeaveLedgerEntry columns) and move the
+    cached balances by the same amounts. Nothing is committed here, so the
+    postings land in the caller's transaction together with what caused them.
+    """
+    if not entries:
+        return
+    db.session.execute(insert(LeaveLedgerEntry), entries)
+
+    deltas = {}
+    for entry in entries:
+        key = (entry['user_id'], entry.get('leave_type', 'annual'))
+        deltas[key] = deltas.get(key, 0) + entry['days']
+    upsert = sqlite_insert(LeaveBalance)
+    db.session.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[LeaveBalance.user_id, LeaveBalance.leave_type],
+            set_={'balance': LeaveBalance.balance + upsert.excluded.balance,
+                  'updated_at': upsert.excluded.updated_at}
+        ),
+        [{'user_id': user_id, 'leave_type': leave_type, 'balance': days, 'updated_at': datetime.utcnow()}
+         for (user_id, leave_type), days in deltas.items()]
+    )
+
+
+def post(user_id, kind, days, leave_type='annual', **fields):
+    post_many([dict(fields, user_id=user_id, kind=kind, days=days, leave_type=leave_type)])
+
+
+def balance(user_id, leave_type='annual'):
+    """Remaining days (0 before the first posting)"""
+    row = db.session.get(LeaveBalance, (user_id, leave_type))
+    return row.balance if row else 0.0
+
+
+def balances(user_id):
+    """{leave type: remaining days} for every tracked type"""
+    stored = dict(db.session.query(LeaveBalance.leave_type, LeaveBalance.balance)
+                  .filter(LeaveBalance.user_id == user_id).all())
+    return {leave_type: stored.get(leave_type, 0.0) for leave_type in tracked_types()}
+
+
+def entries(user_id, leave_type=None, limit=50):
+    query = LeaveLedgerEntry.query.filter(LeaveLedgerEntry.user_id == user_id)
+    if leave_type:
+        query = query.filter(LeaveLedgerEntry.leave_type == leave_type)
+    return query.order_by(LeaveLedgerEntry.id.desc()).limit(limit).all()
+
+
+def sync_many(leave_ids, actor_id=None):
+    """
+    Post whatever brings the ledger in line with the status of each leave:
+    an approved leave is charged its working days on the requester's site
+    calendar, any other status nets to zero (so rejecting an approved leave
+    refunds it). Safe to call repeatedly; reads the rows fresh, so it also
+    follows bulk UPDATEs. Returns the number of postings.
+    """
+    leave_ids = list(leave_ids)
+    if not leave_ids:
+        return 0
+    leaves = db.session.query(
+        LeaveRequest.id, LeaveRequest.user_id, LeaveRequest.type, LeaveRequest.status,
+        LeaveRequest.start_date, LeaveRequest.end_date
+    ).filter(LeaveRequest.id.in_(leave_ids), LeaveRequest.type.in_(tracked_types())).all()
+    posted = dict(db.session.query(LeaveLedgerEntry.leave_request_id, func.sum(LeaveLedgerEntry.days))
+                  .filter(LeaveLedgerEntry.leave_request_id.in_(leave_ids))
+                  .group_by(LeaveLedgerEntry.leave_request_id).all())
+    days = work_calendar.leave_days([lr for lr in leaves if lr.status == 'approved'])
+
+    entries = []
+    for lr in leaves:
+        already = posted.get(lr.id) or 0.0
+        delta = (-float(days[lr.id]) if lr.status == 'approved' else 0.0) - already
+        if delta:
+            entries.append({
+                'user_id': lr.user_id, 'leave_type': lr.type, 'kind': 'consumption' if not already else 'adjustment',
+                'days': delta, 'leave_request_id': lr.id, 'created_by': actor_id,
+                'note': f"Leave #{lr.id} {lr.status}",
+            })
+    post_many(entries)
+    return len(entries)
+
+
+def sync_leave(lr, actor_id=None):
+    """sync_many() for one leave request (pending changes on `lr` are flushed first)"""
+    return sync_many([lr.id], actor_id)
+
+
+def adjust(user_id, days, leave_type='annual', note=None, actor_id=None):
+    """Manual correction by HR (positive credits, negative debits); the caller commits"""
+    if leave_type not in tracked_types():
+        raise ValueError(f"Leave type '{leave_type}' has no balance. Tracked: {', '.join(tracked_types())}")
+    if not days:
+        raise ValueError("days must be a non-zero number")
+    post(user_id, 'adjustment', float(days), leave_type=leave_type, note=note, created_by=actor_id)
+
+
+# ------------------------
+# Periodic jobs
+# ------------------------
+def _batches(stmt, progress, key, batch_size):
+    """Keyset batches of user ids from `stmt` (a SELECT of user ids), resuming after progress[key]"""
+    column = stmt.selected_columns[0]
+    while True:
+        ids = db.session.execute(
+            stmt.where(column > progress.get(key, 0)).order_by(column).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return
+        yield ids
+        progress[key] = ids[-1]
+
+
+@job_handler('leave_accrual')
+def accrue_month(payload):
+    """Credit one month of entitlement to every active user (payload: {'period': 'YYYY-MM'})"""
+    period = payload['period']
+    batch_size = payload.get('batch_size', LEDGER_BATCH_SIZE)
+    progress = job_progress()
+    for leave_type, yearly in current_app.config['LEAVE_ENTITLEMENT_DAYS'].items():
+        reference = f"accrual:{period}"
+        already = select(LeaveLedgerEntry.user_id).where(
+            LeaveLedgerEntry.leave_type == leave_type, LeaveLedgerEntry.reference == reference)
+        users = select(User.id).where(User.is_active.is_(True), User.id.not_in(already))
+        for ids in _batches(users, progress, leave_type, batch_size):
+            post_many([{
+                'user_id': user_id, 'leave_type': leave_type, 'kind': 'accrual',
+                'days': round(yearly / 12, 4), 'reference': reference, 'note': f"Accrual {period}",
+            } for user_id in ids])
+            report_progress(progress)
+            db.session.commit()
+
+
+@job_handler('leave_carry_over')
+def carry_over(payload):
+    """
+    Year-end: balances above LEAVE_CARRY_OVER_MAX_DAYS are cut back to it with
+    one carry_over posting each (payload: {'year': 2026}).
+    """
+    year = int(payload['year'])
+    cap = float(payload.get('max_days', current_app.config['LEAVE_CARRY_OVER_MAX_DAYS']))
+    batch_size = payload.get('batch_size', LEDGER_BATCH_SIZE)
+    reference = f"carry_over:{year}"
+    progress = job_progress()
+    for leave_type in tracked_types():
+        done = select(LeaveLedgerEntry.user_id).where(
+            LeaveLedgerEntry.leave_type == leave_type, LeaveLedgerEntry.reference == reference)
+        over = select(LeaveBalance.user_id).where(
+            LeaveBalance.leave_type == leave_type, LeaveBalance.balance > cap, LeaveBalance.user_id.not_in(done))
+        for ids in _batches(over, progress, leave_type, batch_size):
+            rows = db.session.query(LeaveBalance.user_id, LeaveBalance.balance).filter(
+                LeaveBalance.leave_type == leave_type, LeaveBalance.user_id.in_(ids)).all()
+            post_many([{
+                'user_id': user_id, 'leave_type': leave_type, 'kind': 'carry_over',
+                'days': cap - current, 'reference': reference,
+                'note': f"{year} closing balance {current:g}, {cap:g} carried over",
+            } for user_id, current in rows])
+            report_progress(progress)
+            db.session.commit()
+
+
+def backfill_approved(batch_size=LEDGER_BATCH_SIZE):
+    """Charge leaves approved before the ledger existed. Returns the number of leaves posted."""
+    posted = 0
+    charged = select(LeaveLedgerEntry.leave_request_id).where(LeaveLedgerEntry.leave_request_id.isnot(None))
+    pending = LeaveRequest.query.filter(
+        LeaveRequest.status == 'approved', LeaveRequest.type.in_(tracked_types()), LeaveRequest.id.not_in(charged)
+    ).order_by(LeaveRequest.id)
+    last_id = 0
+    while True:
+        leaves = pending.filter(LeaveRequest.id > last_id).limit(batch_size).all()
+        if not leaves:
+            return posted
+        days = work_calendar.leave_days(leaves)
+        post_many([{
+            'user_id': lr.user_id, 'leave_type': lr.type, 'kind': 'consumption',
+            'days': -float(days[lr.id]), 'leave_request_id': lr.id,
+            'note': f"Leave #{lr.id} approved",
+        } for lr in leaves])
+        db.session.commit()
+        posted += len(leaves)
+        last_id = leaves[-1].id
+
+
+def year_end(today=None):
+    """The year a carry-over run on `today` closes (January runs close the previous year)"""
+    today = today or date.today()
+    return today.year - 1 if today.month == 1 else today.year
@@ -1,16 +1,17 @@
 # modules/leave/routes.py
-from flask import render_template, redirect, url_for, flash, request
+from flask import render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
 from . import leave_bp
 from .services import (
     create_leave_request,
     list_user_requests,
-    list_pending_requests,
+    pending_queue,
+    approver_choices,
     set_leave_status,
 )
 from core.decorators import role_required
 from core.forms import LeaveForm
-from core.models import User
+from . import availability
 
 
 # --- UNIFIED LEAVES DASHBOARD ---
@@ -20,15 +21,8 @@ def leaves_dashboard():
     """Unified Leaves page with tabs (New Request, My Requests, Pending Requests)"""
     form = LeaveForm()
 
-    # Approver choices depend on user's role
-    if current_user.role in ['it_manager', 'general_director']:
-        approvers = User.query.filter(User.id != current_user.id).all()
-    else:
-        approvers = User.query.filter(
-            User.department_id == current_user.department_id,
-            User.role.in_(['manager', 'head_of_department', 'it_manager', 'general_director'])
-        ).all()
-
+    # Approver choices follow the reporting line (everyone for IT manager / director)
+    approvers = approver_choices(current_user)
     form.approver_id.choices = [(u.id, f"{u.name} ({u.role.replace('_', ' ').title()})") for u in approvers]
 
     # Handle submission in the same page
@@ -40,28 +34,55 @@ def leaves_dashboard():
             'reason': form.reason.data,
             'approver_id': form.approver_id.data,
         }
-        create_leave_request(current_user.id, payload)
-        flash("Leave request submitted successfully!", "success")
-        return redirect(url_for('leave.leaves_dashboard'))
+        try:
+            create_leave_request(current_user.id, payload)
+        except ValueError as e:
+            flash(str(e), "danger")
+        else:
+            flash("Leave request submitted successfully!", "success")
+            return redirect(url_for('leave.leaves_dashboard'))
 
     # Load data for the other tabs
     my_requests = list_user_requests(current_user.id)
-    pending = list_pending_requests(current_user) if current_user.role in ['manager', 'head_of_department', 'it_manager', 'general_director'] else []
+    try:
+        pending, pending_cursor, pending_total = pending_queue(current_user, cursor=request.args.get('pending_cursor'))
+    except ValueError:
+        pending, pending_cursor, pending_total = pending_queue(current_user)
 
     return render_template(
         'dashboard/leaves.html',
         form=form,
         requests=my_requests,
-        pending_requests=pending
+        pending_requests=pending,
+        pending_cursor=pending_cursor,
+        pending_total=pending_total
     )
 
 
+# --- DEPARTMENT AVAILABILITY (JSON for the dashboard calendar) ---
+@leave_bp.route('/calendar')
+@login_required
+def leave_calendar():
+    """?month=YYYY-MM&department_id= ; same payload as /api/leaves/calendar"""
+    own_department = availability.user_department_id(current_user)
+    department_id = request.args.get('department_id', type=int) or own_department
+    if department_id is None:
+        return jsonify({'success': False, 'message': 'department_id is required'}), 400
+    if department_id != own_department and current_user.role not in availability.CALENDAR_ALL_ROLES:
+        return jsonify({'success': False, 'message': 'Permission denied'}), 403
+    try:
+        first, last = availability.month_bounds(request.args.get('month'))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'month must be YYYY-MM'}), 400
+    return jsonify(dict(availability.department_calendar(department_id, first, last), success=True))
+
+
 # --- APPROVE / REJECT REQUEST ---
 @leave_bp.route('/<int:lr_id>/<action>', methods=['POST'])
 @login_required
 @role_required(['manager', 'head_of_department', 'it_manager', 'general_director'])
 def set_status(lr_id, action):
-    """Approve or reject a leave request assigned to current approver"""
+    """Approve or reject a leave request the current user may decide on (see services.can_decide)"""
     if action not in ["approve", "reject"]:
         flash("Invalid action", "danger")
         return redirect(url_for('leave.leaves_dashboard'))
@@ -69,6 +90,10 @@ def set_status(lr_id, action):
     status_map = {"approve": "approved", "reject": "rejected"}
     status = status_map[action]
 
-    lr = set_leave_status(lr_id, current_user.id, status)
-    flash(f"Leave request #{lr.id} {status}", "success")
+    try:
+        lr = set_leave_status(lr_id, current_user.id, status)
+    except (PermissionError, ValueError) as e:
+        flash(str(e), "danger")
+    else:
+        flash(f"Leave request #{lr.id} {status}", "success")
     return redirect(url_for('leave.leaves_dashboard'))
@@ -1,20 +1,32 @@
 # modules/leave/services.py
 from datetime import datetime, date
+from sqlalchemy import func, tuple_, and_, or_
+from sqlalchemy.orm import joinedload
 from core.extensions import db
 from core.models import LeaveRequest, User
+from core.services import org_hierarchy
+from modules.leave.availability import check_dates
+from modules.leave import ledger
 
 def _parse_date(s: str) -> date:
     return datetime.strptime(s, "%Y-%m-%d").date()
 
 
 def create_leave_request(user_id: int, payload: dict) -> LeaveRequest:
-    """Create a new leave request"""
+    """
+    Create a new leave request (raises ValueError for bad or overlapping dates);
+    without an explicit approver it goes to the requester's direct manager
+    """
+    start_date = _parse_date(payload['start_date'])
+    end_date = _parse_date(payload['end_date'])
+    check_dates(user_id, start_date, end_date)
+
     lr = LeaveRequest(
         user_id=user_id,
-        approver_id=payload.get('approver_id'),
+        approver_id=payload.get('approver_id') or org_hierarchy.manager_of(user_id),
         type=(payload.get('type') or 'annual').lower(),
-        start_date=_parse_date(payload['start_date']),
-        end_date=_parse_date(payload['end_date']),
+        start_date=start_date,
+        end_date=end_date,
         reason=payload.get('reason', '').strip(),
         status='pending'
     )
@@ -28,33 +40,165 @@ def list_user_requests(user_id: int):
     return LeaveRequest.query.filter_by(user_id=user_id).order_by(LeaveRequest.created_at.desc()).all()
 
 
-def list_pending_requests(current_user: User):
-    """Return pending leave requests relevant to the current approver"""
-    # Managers / Head of Department: see requests where they are the approver
-    if current_user.role in ['manager', 'head_of_department']:
-        return LeaveRequest.query.filter_by(status='pending', approver_id=current_user.id)\
-            .order_by(LeaveRequest.created_at.asc()).all()
+# ------------------------
+# Approval queue
+# ------------------------
+QUEUE_APPROVER_ROLES = ('manager', 'head_of_department')   # assigned to them or from their reports
+QUEUE_ALL_ROLES = ('it_manager', 'general_director')       # every pending request
+QUEUE_PAGE_SIZE = 50
+QUEUE_MAX_PAGE_SIZE = 200
+
+
+def queue_scope(current_user: User):
+    """
+    Filter for the leaves `current_user` may decide on, or None when the role
+    has no queue. Nobody decides their own leave.
+    """
+    if current_user.role in QUEUE_APPROVER_ROLES:
+        return and_(LeaveRequest.user_id != current_user.id,
+                    or_(LeaveRequest.approver_id == current_user.id,
+                        LeaveRequest.user_id.in_(org_hierarchy.reports_query(current_user.id))))
+    if current_user.role in QUEUE_ALL_ROLES:
+        return LeaveRequest.user_id != current_user.id
+    return None
+
+
+def can_decide(current_user: User, lr: LeaveRequest) -> bool:
+    """queue_scope() for a single leave: the assigned approver or anyone above the requester"""
+    if lr.user_id == current_user.id:
+        return False
+    if current_user.role in QUEUE_ALL_ROLES:
+        return True
+    if current_user.role in QUEUE_APPROVER_ROLES:
+        return lr.approver_id == current_user.id or org_hierarchy.in_chain(current_user.id, lr.user_id)
+    return False
+
+
+def approver_choices(current_user: User):
+    """
+    Who `current_user` can send a leave request to: their management chain,
+    nearest first, then the IT manager / director accounts
+    """
+    if current_user.role in QUEUE_ALL_ROLES:
+        return User.query.filter(User.id != current_user.id).order_by(User.name).all()
+    chain = org_hierarchy.approvers_for(current_user.id)
+    top = User.query.filter(
+        User.role.in_(QUEUE_ALL_ROLES), User.id != current_user.id, User.id.not_in([u.id for u in chain])
+    ).order_by(User.name).all()
+    return chain + top
+
+
+def resolve_approver(current_user: User, approver_id=None):
+    """
+    Approver for a new leave of `current_user`: one of approver_choices(), or
+    their direct manager when none is given. Raises ValueError.
+    """
+    if approver_id is None or approver_id == '':
+        return org_hierarchy.manager_of(current_user.id)
+    try:
+        if isinstance(approver_id, bool):
+            raise TypeError
+        approver_id = int(approver_id)
+    except (TypeError, ValueError):
+        raise ValueError("approver_id must be a user id")
+    if approver_id == current_user.id or approver_id not in {u.id for u in approver_choices(current_user)}:
+        raise ValueError("approver_id must be one of your approvers (your management chain or IT manager / director)")
+    return approver_id
+
+
+def encode_cursor(lr: LeaveRequest) -> str:
+    return f"{lr.created_at.isoformat()},{lr.id}"
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, lr_id = cursor.rsplit(',', 1)
+        return datetime.fromisoformat(created_at), int(lr_id)
+    except (AttributeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def pending_queue(current_user: User, cursor: str = None, limit: int = QUEUE_PAGE_SIZE):
+    """
+    One page of the pending leaves `current_user` can act on, oldest first:
+    (leaves, next_cursor, total). Pending rows are read in page order from the
+    (status, created_at, id) index (no sort step), keyset-paginated on
+    (created_at, id), requesters loaded in the same query. limit=None returns
+    the whole queue.
+    """
+    scope = queue_scope(current_user)
+    if scope is None:
+        return [], None, 0
+
+    pending = LeaveRequest.query.filter(scope, LeaveRequest.status == 'pending')
+    total = pending.with_entities(func.count(LeaveRequest.id)).scalar()
+
+    query = pending.options(joinedload(LeaveRequest.requester).load_only(User.id, User.name))\
+        .order_by(LeaveRequest.created_at.asc(), LeaveRequest.id.asc())
+    if cursor:
+        query = query.filter(tuple_(LeaveRequest.created_at, LeaveRequest.id) > tuple_(*decode_cursor(cursor)))
+    if limit is None:
+        return query.all(), None, total
+
+    limit = min(max(limit, 1), QUEUE_MAX_PAGE_SIZE)
+    leaves = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(leaves[limit - 1]) if len(leaves) > limit else None
+    return leaves[:limit], next_cursor, total
+
+
+# decision verbs accepted by the bulk endpoint -> stored status
+DECISIONS = {'approve': 'approved', 'approved': 'approved', 'reject': 'rejected', 'rejected': 'rejected'}
+
+
+def decide_leaves(current_user: User, ids, decision: str):
+    """
+    Approve or reject many pending leaves in one transaction: authority is
+    checked for all ids with one query (the same scope as the approval queue),
+    status / approver / decided_at are set with one UPDATE, the ledger is
+    charged for the approved ones and every decision is audited.
+    Returns the per-id summary; raises BulkUpdateError / PermissionError.
+    """
+    from core.services import bulk_update, change_log
+
+    status = DECISIONS.get((decision or '').lower().strip())
+    if status is None:
+        raise bulk_update.BulkUpdateError("decision must be 'approve' or 'reject'")
+    scope = queue_scope(current_user)
+    if scope is None:
+        raise PermissionError("You have no leave requests to decide on.")
 
-    # IT Manager / General Director: see all pending requests
-    elif current_user.role in ['it_manager', 'general_director']:
-        return LeaveRequest.query.filter_by(status='pending').order_by(LeaveRequest.created_at.asc()).all()
-    
-    # Other roles: no access
-    return []
+    now = datetime.utcnow()
+    try:
+        requested, existing, updated, skipped, owners = bulk_update.apply_bulk_decision(
+            LeaveRequest, ids,
+            {'status': status, 'approver_id': current_user.id, 'decided_at': now, 'updated_at': now},
+            current_user.id, f'bulk_{status}_leave', authorized=scope
+        )
+        ledger.sync_many(updated, actor_id=current_user.id)
+        change_log.record(LeaveRequest, updated, owners=owners)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return bulk_update.summarize(requested, existing, updated, skipped)
 
 
 def set_leave_status(lr_id: int, approver_id: int, status: str):
-    """Approve or reject a leave request"""
+    """Approve or reject a pending leave request; raises PermissionError / ValueError"""
     status = status.lower().strip()
     if status not in ('approved', 'rejected'):
         raise ValueError("Status must be 'approved' or 'rejected'")
 
     lr = LeaveRequest.query.get_or_404(lr_id)
-    # Only allow the assigned approver to approve/reject
-    if lr.approver_id != approver_id:
+    # Same authority as the queue: assigned approver, a manager above the requester, or IT manager / director
+    if not can_decide(db.session.get(User, approver_id), lr):
         raise PermissionError("You are not authorized to approve/reject this leave request.")
+    if lr.status != 'pending':
+        raise ValueError(f"Leave request #{lr.id} is already {lr.status}")
 
     lr.status = status
+    lr.approver_id = approver_id  # whoever decided, as the API records it
     lr.decided_at = datetime.utcnow()
+    ledger.sync_leave(lr, actor_id=approver_id)
     db.session.commit()
     return lr
@@ -2,12 +2,18 @@ from flask import Blueprint, jsonify, request
 from core.extensions import db
 from core.models import EmployeeRequest, User
 from modules.auth.jwt_utils import mobile_auth_required
+from core.decorators import conditional_get
+from core.schemas import compile_schema, dump_many, REQUEST_OWN_FIELDS, REQUEST_ALL_FIELDS
+from core.read_models import request_rows, fetch
+from core.streaming import stream_mode, stream_rows
+from modules.requests.services import decide_requests, request_scope, can_handle, REQUEST_HANDLER_ROLES
 from datetime import datetime
 
 api_mobile_requests_bp = Blueprint('api_mobile_requests', __name__, url_prefix='/api/mobile/requests')
 
 @api_mobile_requests_bp.route('', methods=['GET'])
 @mobile_auth_required
+@conditional_get('employee_requests')
 def get_my_requests():
     try:
         user_id = getattr(request, "user_id", None)
@@ -15,15 +21,7 @@ def get_my_requests():
         
         return jsonify({
             'success': True,
-            'requests': [{
-                'id': req.id,
-                'category': req.category,
-                'subject': req.subject,
-                'message': req.message,
-                'status': req.status,
-                'response': req.response,
-                'date': req.created_at.strftime('%Y-%m-%d') if req.created_at else None
-            } for req in requests]
+            'requests': dump_many('request', requests, REQUEST_OWN_FIELDS)
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -67,37 +65,27 @@ def create_request():
 
 @api_mobile_requests_bp.route('/all', methods=['GET'])
 @mobile_auth_required
+@conditional_get('employee_requests', 'users', 'org_closure')
 def get_all_requests():
     try:
         user = getattr(request, "user", None)
         # Check permissions
-        if user.role not in ['it_manager', 'general_director', 'general_manager', 'head_of_department', 'manager']:
+        if user.role not in REQUEST_HANDLER_ROLES:
             return jsonify({'success': False, 'message': 'Permission denied'}), 403
 
-        # Fetch all requests, pending first
-        requests = EmployeeRequest.query.order_by(
+        # Fetch every request the user handles, pending first
+        query = request_rows().where(request_scope(user)).order_by(
             (EmployeeRequest.status == 'pending').desc(),
             EmployeeRequest.created_at.desc()
-        ).all()
-        
+        )
+        mode = stream_mode()
+        if mode:
+            return stream_rows(query, compile_schema('request_row', REQUEST_ALL_FIELDS), 'requests', mode)
+        requests = fetch(query)
+
         return jsonify({
             'success': True,
-            'requests': [{
-                'id': req.id,
-                'user': {
-                    'id': req.user.id,
-                    'name': req.user.name,
-                    'role': req.user.role,
-                    'avatar': req.user.avatar,
-                    'position': req.user.position
-                },
-                'category': req.category,
-                'subject': req.subject,
-                'message': req.message,
-                'status': req.status,
-                'response': req.response,
-                'date': req.created_at.strftime('%Y-%m-%d') if req.created_at else None
-            } for req in requests]
+            'requests': dump_many('request_row', requests, REQUEST_ALL_FIELDS)
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -108,16 +96,20 @@ def update_request(id):
     try:
         user = getattr(request, "user", None)
         # Check permissions
-        if user.role not in ['it_manager', 'general_director', 'general_manager', 'head_of_department', 'manager']:
+        if user.role not in REQUEST_HANDLER_ROLES:
             return jsonify({'success': False, 'message': 'Permission denied'}), 403
 
         req_obj = EmployeeRequest.query.get(id)
         if not req_obj:
             return jsonify({'success': False, 'message': 'Request not found'}), 404
+        if not can_handle(user, req_obj):
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
 
         data = request.json
-        if 'status' in data:
+        if 'status' in data and data['status'] != req_obj.status:
             req_obj.status = data['status']
+            req_obj.approver_id = user.id
+            req_obj.decided_at = datetime.utcnow()
         if 'response' in data:
             req_obj.response = data['response']
         
@@ -131,3 +123,25 @@ def update_request(id):
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@api_mobile_requests_bp.route('/decisions', methods=['POST'])
+@mobile_auth_required
+def decide_requests_bulk():
+    try:
+        from core.services.bulk_update import BulkUpdateError
+        user = getattr(request, "user", None)
+        if user.role not in REQUEST_HANDLER_ROLES:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        data = request.get_json(silent=True) or {}
+        try:
+            summary = decide_requests(user, data.get('ids'), data.get('status'), data.get('response'))
+        except PermissionError as e:
+            return jsonify({'success': False, 'message': str(e)}), 403
+        except BulkUpdateError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return jsonify(dict(summary, success=True)), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
@@ -0,0 +1,63 @@
+# modules/requests/services.py
+from datetime import datetime
+from sqlalchemy import true
+from core.extensions import db
+from core.models import EmployeeRequest
+from core.services import org_hierarchy
+
+# Roles that handle employee requests (same as the single update endpoints)
+REQUEST_HANDLER_ROLES = ['it_manager', 'general_director', 'general_manager', 'head_of_department', 'manager']
+# Handlers who see every request; the others see the requests of their reports
+REQUEST_ALL_ROLES = ('it_manager', 'general_director', 'general_manager')
+# Requests move pending -> in-progress -> resolved / closed
+OPEN_STATUSES = ('pending', 'in-progress')
+DECIDED_STATUSES = ('in-progress', 'resolved', 'closed')
+
+
+def request_scope(current_user):
+    """Filter for the requests `current_user` handles, or None when the role handles none"""
+    if current_user.role in REQUEST_ALL_ROLES:
+        return true()
+    if current_user.role in REQUEST_HANDLER_ROLES:
+        return EmployeeRequest.user_id.in_(org_hierarchy.reports_query(current_user.id))
+    return None
+
+
+def can_handle(current_user, req):
+    """request_scope() for a single request"""
+    if current_user.role in REQUEST_ALL_ROLES:
+        return True
+    return current_user.role in REQUEST_HANDLER_ROLES and org_hierarchy.in_chain(current_user.id, req.user_id)
+
+
+def decide_requests(current_user, ids, status, response=None):
+    """
+    Move many open employee requests within the handler's scope to `status`
+    (optionally with one shared response) in one transaction: one classifying SELECT, one UPDATE setting
+    status / approver / decided_at, one audit insert for all of them.
+    Returns the per-id summary; raises BulkUpdateError / PermissionError.
+    """
+    from core.services import bulk_update, change_log
+
+    scope = request_scope(current_user)
+    if scope is None:
+        raise PermissionError("You do not handle employee requests.")
+    status = (status or '').lower().strip()
+    if status not in DECIDED_STATUSES:
+        raise bulk_update.BulkUpdateError(f"status must be one of: {', '.join(DECIDED_STATUSES)}")
+
+    now = datetime.utcnow()
+    values = {'status': status, 'approver_id': current_user.id, 'decided_at': now, 'updated_at': now}
+    if response:
+        values['response'] = str(response).strip()
+    try:
+        requested, existing, updated, skipped, owners = bulk_update.apply_bulk_decision(
+            EmployeeRequest, ids, values, current_user.id, 'bulk_update_request', authorized=scope,
+            open_statuses=tuple(s for s in OPEN_STATUSES if s != status)
+        )
+        change_log.record(EmployeeRequest, updated, owners=owners)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return bulk_update.summarize(requested, existing, updated, skipped)
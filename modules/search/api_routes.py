@@ -0,0 +1,27 @@
+from flask import Blueprint, jsonify, request
+from core.services.search_index import search, ENTITY_TYPES
+from modules.auth.jwt_utils import mobile_auth_required
+
+api_search_bp = Blueprint('api_search', __name__, url_prefix='/api/search')
+
+
+# ------------------------------------------------------------
+# GLOBAL SEARCH (typeahead)
+# ------------------------------------------------------------
+@api_search_bp.route('', methods=['GET'])
+@mobile_auth_required
+def global_search():
+    try:
+        query = (request.args.get('q') or '').strip()
+        types = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()] or None
+        if types and any(t not in ENTITY_TYPES for t in types):
+            return jsonify({
+                'success': False,
+                'message': f"types must be among: {', '.join(ENTITY_TYPES)}"
+            }), 400
+
+        results = search(request.user, query, types=types, limit=request.args.get('limit', 20, type=int))
+        return jsonify({'success': True, 'query': query, 'results': results}), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
@@ -0,0 +1,85 @@
+from flask import Blueprint, jsonify, request
+from core.models import Employee, Department, EmployeeRequest, LeaveRequest
+from core.services import change_log
+from modules.auth.jwt_utils import mobile_auth_required
+from core.schemas import dump_many
+from core.read_models import employee_rows, fetch
+from modules.employee.api_routes import DEFAULT_EMPLOYEE_FIELDS
+
+api_sync_bp = Blueprint('api_sync', __name__, url_prefix='/api/sync')
+
+# Roles that see every request and leave (as on /api/mobile/requests/all)
+SYNC_ALL_ROLES = ['it_manager', 'general_director', 'general_manager', 'head_of_department', 'manager']
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+SYNC_EMPLOYEE_FIELDS = tuple(DEFAULT_EMPLOYEE_FIELDS) + ('updated_at',)
+
+
+def _employees(ids):
+    rows = fetch(employee_rows(SYNC_EMPLOYEE_FIELDS).where(Employee.id.in_(ids)))
+    return dump_many('employee_row', rows, SYNC_EMPLOYEE_FIELDS)
+
+
+def _departments(ids):
+    rows = Department.query.filter(Department.id.in_(ids)).all()
+    return dump_many('department', rows, ('id', 'name', 'description', 'updated_at'))
+
+
+def _requests(ids):
+    rows = EmployeeRequest.query.filter(EmployeeRequest.id.in_(ids)).all()
+    return dump_many('request', rows, ('id', 'user_id', 'category', 'subject', 'message', 'status',
+                                       'response', 'date', 'updated_at'))
+
+
+def _leaves(ids):
+    rows = LeaveRequest.query.filter(LeaveRequest.id.in_(ids)).all()
+    return dump_many('leave', rows, ('id', 'user_id', 'type', 'start_date', 'end_date', 'reason',
+                                     'status', 'created_at', 'updated_at'))
+
+
+# entity type -> (response key, loader)
+SYNC_COLLECTIONS = {
+    'employee': ('employees', _employees),
+    'department': ('departments', _departments),
+    'request': ('requests', _requests),
+    'leave': ('leaves', _leaves),
+}
+
+
+# ------------------------------------------------------------
+# DELTA SYNC
+# ------------------------------------------------------------
+@api_sync_bp.route('', methods=['GET'])
+@mobile_auth_required
+def sync():
+    """
+    Rows created, updated or deleted after ?since=<cursor> (0 or absent = everything).
+    Clients store the returned cursor and call again while has_more is true.
+    """
+    try:
+        user = request.user
+        since = request.args.get('since', 0, type=int)
+        limit = min(max(request.args.get('limit', DEFAULT_SYNC_LIMIT, type=int), 1), MAX_SYNC_LIMIT)
+        see_all = user.role.lower() in SYNC_ALL_ROLES
+
+        entries, cursor, has_more = change_log.changes_since(user, since, limit, see_all=see_all)
+
+        upserts = {t: [] for t in SYNC_COLLECTIONS}
+        deletes = {t: [] for t in SYNC_COLLECTIONS}
+        for entry in entries:
+            (deletes if entry.op == 'delete' else upserts)[entry.entity_type].append(entry.entity_id)
+
+        payload = {'success': True, 'cursor': cursor, 'has_more': has_more}
+        for entity_type, (key, load) in SYNC_COLLECTIONS.items():
+            rows = load(upserts[entity_type]) if upserts[entity_type] else []
+            # Rows gone between logging and this read are reported as deleted
+            missing = set(upserts[entity_type]) - {r['id'] for r in rows}
+            payload[key] = {
+                'upserted': rows,
+                'deleted': deletes[entity_type] + sorted(missing)
+            }
+        return jsonify(payload), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
@@ -1,8 +1,12 @@
 from flask import Blueprint, jsonify, request
 from core.extensions import db
-from core.models import User
+from core.models import User, OrgClosure
 from datetime import datetime
 from modules.auth.jwt_utils import mobile_auth_required
+from core.schemas import compile_schema, dump, dump_many, USER_LIST_FIELDS, USER_DETAIL_FIELDS, USER_TEAM_FIELDS
+from core.read_models import user_rows, fetch
+from core.streaming import stream_mode, stream_rows
+from core.services import org_hierarchy
 
 api_user_bp = Blueprint('api_user', __name__, url_prefix='/api/users')
 
@@ -29,23 +33,18 @@ def get_users():
             # Only allow top roles to see inactive users
             if user.role.lower() not in ['it_manager', 'general_director']:
                 return jsonify({'success': False, 'message': 'Permission denied to view inactive users'}), 403
-            users = User.query.all()
+            query = user_rows()
         else:
-            users = User.query.filter_by(is_active=True).all()
-            
+            query = user_rows().where(User.is_active.is_(True))
+
+        mode = stream_mode()
+        if mode:
+            return stream_rows(query.order_by(User.id), compile_schema('user', USER_LIST_FIELDS), 'users', mode)
+        users = fetch(query)
+
         return jsonify({
             'success': True,
-            'users': [{
-                'id': u.id,
-                'name': u.name,
-                'email': u.email,
-                'role': u.role,
-                'phone': u.phone,
-                'position': u.position,
-                'is_active': u.is_active,
-                'created_at': u.created_at.isoformat(),
-                'last_login': u.last_login.isoformat() if u.last_login else None
-            } for u in users]
+            'users': dump_many('user', users, USER_LIST_FIELDS)
         }), 200
 
     except Exception as e:
@@ -139,6 +138,37 @@ def update_user(id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+# ------------------------------------------------------------
+# BULK UPDATE USERS (ROLE / ACTIVATION)
+# ------------------------------------------------------------
+@api_user_bp.route('/bulk', methods=['POST'])
+@mobile_auth_required
+def bulk_update_users():
+    try:
+        from modules.user.services import bulk_update_users as run_bulk_update
+        from core.services.bulk_update import BulkUpdateError
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director', 'manager']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        data = request.get_json(silent=True) or {}
+        patch = data.get('patch') or {}
+        # Handing out roles is restricted like account deletion
+        if 'role' in patch and current_user.role.lower() not in ['it_manager', 'general_director']:
+            return jsonify({'success': False, 'message': 'Only IT Manager / Director can change roles in bulk'}), 403
+
+        try:
+            summary = run_bulk_update(patch, ids=data.get('ids'),
+                                      filters=data.get('filter'), actor=current_user)
+        except BulkUpdateError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return jsonify(dict(summary, success=True)), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 # ------------------------------------------------------------
 # DELETE A USER
 # ------------------------------------------------------------
@@ -157,8 +187,9 @@ def delete_user(id):
         if u.id == current_user.id:
             return jsonify({'success': False, 'message': 'You cannot delete your own account'}), 400
 
-        db.session.delete(u)
-        db.session.commit()
+        from modules.user.services import delete_user as delete_user_service
+        # Logical delete; documents and dependent rows are purged by a background job
+        delete_user_service(u.id)
 
         return jsonify({
             'success': True,
@@ -181,22 +212,68 @@ def get_user(id):
         u = User.query.get_or_404(id)
         return jsonify({
             'success': True,
-            'user': {
-                'id': u.id,
-                'name': u.name,
-                'email': u.email,
-                'role': u.role,
-                'phone': u.phone,
-                'position': u.position,
-                'access_code': u.access_code,
-                'is_active': u.is_active,
-                'login_count': u.login_count,
-                'last_login': u.last_login.isoformat() if u.last_login else None,
-                'employee': {
-                    'id': u.employee.id,
-                    'full_name': u.employee.full_name
-                } if u.employee else None
-            }
+            'user': dump('user', u, USER_DETAIL_FIELDS)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+# ------------------------------------------------------------
+# REPORTING LINE: SET MANAGER / LIST TEAM
+# ------------------------------------------------------------
+@api_user_bp.route('/<int:id>/manager', methods=['PUT'])
+@mobile_auth_required
+def set_user_manager(id):
+    try:
+        current_user = getattr(request, "user", None)
+        if current_user.role.lower() not in ['it_manager', 'general_director']:
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        u = User.query.get_or_404(id)
+        data = request.get_json(silent=True) or {}
+        if 'manager_id' not in data:
+            return jsonify({'success': False, 'message': 'manager_id is required (null to clear)'}), 400
+        try:
+            manager_id = int(data['manager_id']) if data['manager_id'] is not None else None
+            org_hierarchy.set_manager(u.id, manager_id)
+        except (TypeError, ValueError) as e:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': str(e)}), 400
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'manager_id': manager_id,
+            'approvers': [{'id': m.id, 'name': m.name, 'role': m.role} for m in org_hierarchy.approvers_for(u.id)]
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@api_user_bp.route('/<int:id>/team', methods=['GET'])
+@mobile_auth_required
+def get_user_team(id):
+    """Everyone reporting to the user, nearest first (?depth=1 for direct reports only)"""
+    try:
+        current_user = getattr(request, "user", None)
+        if current_user.id != id and current_user.role.lower() not in ['it_manager', 'general_director'] \
+                and not org_hierarchy.in_chain(current_user.id, id):
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+
+        query = user_rows(USER_TEAM_FIELDS[:-1]).add_columns(OrgClosure.depth)\
+            .join(OrgClosure, OrgClosure.descendant_id == User.id)\
+            .where(OrgClosure.ancestor_id == id, OrgClosure.depth > 0)\
+            .order_by(OrgClosure.depth, User.name)
+        max_depth = request.args.get('depth', type=int)
+        if max_depth:
+            query = query.where(OrgClosure.depth <= max_depth)
+
+        return jsonify({
+            'success': True,
+            'team': dump_many('team_row', fetch(query), USER_TEAM_FIELDS)
         }), 200
 
     except Exception as e:
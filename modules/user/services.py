@@ -7,6 +7,8 @@ from werkzeug.utils import secure_filename
 
 from core.extensions import db
 from core.models import User, UserDocument
+from core.permissions import Permission
+from core.services.job_queue import enqueue, job_handler, job_progress, report_progress
 
 # ------------------------
 # Helpers
@@ -212,24 +214,129 @@ def update_user(user_id, form_data):
 
 
 def delete_user(user_id):
-    """Delete a system user and all associated documents."""
+    """
+    Logically delete a system user: the account is deactivated and hidden at
+    once, and the 'purge_user' background job removes documents, files and
+    dependent rows in batches before deleting the user row.
+    """
     user = User.query.get_or_404(user_id)
-
-    docs = UserDocument.query.filter_by(user_id=user.id).all()
-    for doc in docs:
-        try:
-            abs_path = os.path.join(current_app.config['UPLOAD_FOLDER'], doc.filepath)
-            if os.path.exists(abs_path):
-                os.remove(abs_path)
-        except Exception:
-            pass
-        db.session.delete(doc)
-
-    db.session.delete(user)
+    user.deleted_at = datetime.utcnow()
+    user.is_active = False
     try:
+        enqueue('purge_user', {'user_id': user.id}, commit=False)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         raise e
 
     return user
+
+
+@job_handler('purge_user')
+def purge_user(payload):
+    """Background cleanup for delete_user; resumable because every step works on the rows left"""
+    from sqlalchemy import delete, select, update, or_
+    from core.models import (Folder, ActivityLog, LeaveRequest, EmployeeRequest,
+                             CandidateStatusEvent, Employee, LeaveLedgerEntry, LeaveBalance)
+    from core.services import change_log, purge, search_index, org_hierarchy
+
+    user_id = payload['user_id']
+    user = db.session.execute(
+        select(User).filter_by(id=user_id).execution_options(include_deleted=True)
+    ).scalar_one_or_none()
+    if user is None or user.deleted_at is None:
+        return  # already purged, or restored before the job ran
+
+    progress = job_progress()
+    batch_size = payload.get('batch_size', purge.PURGE_BATCH_SIZE)
+    own_folders = select(Folder.id).where(Folder.created_by == user_id)
+
+    documents = or_(UserDocument.user_id == user_id, UserDocument.folder_id.in_(own_folders))
+    for ids in purge.purge_rows(UserDocument, documents, progress, 'documents', batch_size,
+                                filepath_column=UserDocument.filepath):
+        search_index.remove(UserDocument, ids)
+    for ids in purge.purge_rows(EmployeeRequest, EmployeeRequest.user_id == user_id, progress, 'requests', batch_size):
+        search_index.remove(EmployeeRequest, ids)
+        change_log.record(EmployeeRequest, ids, op='delete', owners=dict.fromkeys(ids, user_id))
+        db.session.commit()
+    for _ in purge.purge_rows(LeaveLedgerEntry, LeaveLedgerEntry.user_id == user_id, progress, 'leave_ledger', batch_size):
+        pass
+    db.session.execute(delete(LeaveBalance).where(LeaveBalance.user_id == user_id))
+    for ids in purge.purge_rows(LeaveRequest, LeaveRequest.user_id == user_id, progress, 'leave_requests', batch_size):
+        change_log.record(LeaveRequest, ids, op='delete', owners=dict.fromkeys(ids, user_id))
+        db.session.commit()
+    for model, condition, key in (
+        (Folder, Folder.created_by == user_id, 'folders'),
+        (ActivityLog, ActivityLog.user_id == user_id, 'activity'),
+    ):
+        for _ in purge.purge_rows(model, condition, progress, key, batch_size):
+            pass
+
+    # Rows that only point at the user keep their history
+    for column in (LeaveRequest.approver_id, EmployeeRequest.approver_id, CandidateStatusEvent.changed_by,
+                   Employee.user_id, LeaveLedgerEntry.created_by):
+        db.session.execute(update(column.class_).where(column == user_id).values({column.key: None})
+                           .execution_options(synchronize_session=False))
+
+    # Direct reports move up to the purged user's manager
+    org_hierarchy.remove_user(user_id)
+
+    purge.remove_upload_dir(user_id)
+    db.session.execute(delete(User).where(User.id == user_id).execution_options(synchronize_session=False))
+    progress['user'] = 'deleted'
+    report_progress(progress)
+    db.session.commit()
+
+
+# ------------------------
+# Bulk updates
+# ------------------------
+ASSIGNABLE_ROLES = tuple(Permission.ROLE_PERMISSIONS)  # every role the permission matrix knows
+
+
+def _check_role(role):
+    from core.services.bulk_update import BulkUpdateError
+    if (role or '').lower() not in ASSIGNABLE_ROLES:
+        raise BulkUpdateError(f"Unknown role '{role}'. Allowed: {', '.join(ASSIGNABLE_ROLES)}")
+
+
+def _check_flag(value):
+    from core.services.bulk_update import BulkUpdateError
+    if value is None:
+        raise BulkUpdateError("is_active must be true or false")
+
+
+# field -> (type, validator)
+BULK_USER_FIELDS = {
+    'role': (str, _check_role),
+    'is_active': (bool, _check_flag),
+    'position': (str, None),
+}
+BULK_USER_FILTERS = ('role', 'is_active', 'position')
+
+
+def bulk_update_users(patch, ids=None, filters=None, actor=None):
+    """
+    Apply one validated patch (role / activation / position) to many accounts
+    in a single transaction. The acting user's own account is skipped so an
+    admin cannot lock themselves out. Returns the per-id summary.
+    """
+    from core.services import bulk_update, search_index
+
+    values = bulk_update.validate_patch(patch, BULK_USER_FIELDS)
+    if 'role' in values:
+        values['role'] = values['role'].lower()
+    requested, existing = bulk_update.resolve_targets(User, ids, filters, BULK_USER_FILTERS)
+
+    skipped = {}
+    if actor is not None and actor.id in existing:
+        skipped[actor.id] = 'cannot change your own account in a bulk update'
+    try:
+        updated = bulk_update.apply_bulk_update(User, existing, values, getattr(actor, 'id', None), 'users', skipped)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    if set(values) & {'role', 'position'}:
+        search_index.reindex(User, updated)
+    return bulk_update.summarize(requested, existing, updated, skipped)
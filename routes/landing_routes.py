@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request
-from config_data.specialties import SPECIALTIES
+from core.services.specialty_taxonomy import taxonomy
 
 # Define blueprint
 landing_bp = Blueprint('landing', __name__)
@@ -8,4 +8,4 @@ landing_bp = Blueprint('landing', __name__)
 @landing_bp.route('/')
 def landing():
     submitted = request.args.get('submitted') # capture the query parameter
-    return render_template('landing.html', specialties=SPECIALTIES, submitted=submitted)
+    return render_template('landing.html', specialties=taxonomy.names, submitted=submitted)
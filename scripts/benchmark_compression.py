@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# scripts/benchmark_compression.py
+# Payload size and latency per endpoint, uncompressed vs gzip vs brotli.
+# --seed N adds N synthetic employees and candidates for the run and rolls them back afterwards.
+import sys
+import os
+import time
+import statistics
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+from app import app
+from config import Config
+from core.extensions import db
+from core.models import User, Employee, Candidate, Department
+from core import compression
+
+API_ENDPOINTS = ['/api/employees', '/api/candidates', '/api/departments']
+WEB_ENDPOINTS = ['/', '/dashboard/employee-summary', '/department/']
+
+
+def seed(count):
+    departments = [d.id for d in Department.query.all()]
+    db.session.add_all([Employee(
+        full_name=f"Bench Employee {i}", job_title="Steel Fixer", phone=f"05{i:08d}",
+        nationality="Pakistan", country="Saudi Arabia", state="Riyadh",
+        department_id=departments[i % len(departments)] if departments else None
+    ) for i in range(count)])
+    db.session.add_all([Candidate(
+        full_name=f"Bench Candidate {i}", email=f"bench{i}@example.com", phone=f"05{i:08d}",
+        nationality="India", applied_position="Electrician", specialty="Electrical",
+        skills="wiring, conduit, panels", status="new", id_document_filepath=""
+    ) for i in range(count)])
+    db.session.flush()
+
+
+def measure(client, url, headers, encoding, runs):
+    headers = dict(headers, **({'Accept-Encoding': encoding} if encoding else {'Accept-Encoding': 'identity'}))
+    timings, size, status = [], 0, None
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        size = len(response.get_data())
+        timings.append((time.perf_counter() - start) * 1000)
+        status = response.status_code
+    return status, size, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response compression")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic employees/candidates to add for the run")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    encodings = [None, 'gzip'] + (['br'] if compression.brotli is not None else [])
+    with app.app_context():
+        if args.seed:
+            seed(args.seed)
+        user = User.query.filter_by(role='it_manager').first()
+        token = jwt.encode({'id': user.id}, Config.JWT_SECRET_KEY, algorithm='HS256')
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+            session['_fresh'] = True
+
+        print(f"{'endpoint':32} {'encoding':9} {'status':>6} {'bytes':>10} {'saved':>7} {'ms (median)':>12}")
+        for url in API_ENDPOINTS + WEB_ENDPOINTS:
+            headers = {'Authorization': f'Bearer {token}'} if url.startswith('/api/') else {}
+            baseline = None
+            for encoding in encodings:
+                status, size, ms = measure(client, url, headers, encoding, args.runs)
+                baseline = baseline or size
+                saved = f"{100 * (1 - size / baseline):.0f}%" if baseline else "-"
+                print(f"{url:32} {encoding or 'identity':9} {status:>6} {size:>10} {saved:>7} {ms:>12.2f}")
+        if args.seed:
+            db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# scripts/benchmark_read_models.py
+# CPU time and peak memory per list endpoint: ORM instances vs Core read-model rows.
+# --seed N adds N synthetic employees, candidates, users and requests for the run and rolls them back afterwards.
+import sys
+import os
+import time
+import argparse
+import logging
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import joinedload, selectinload
+from app import app
+from core.extensions import db
+from core.models import User, Employee, Candidate, Department, EmployeeRequest
+from core.schemas import dump_many, USER_LIST_FIELDS, REQUEST_ALL_FIELDS
+from core import read_models
+from modules.employee.api_routes import DEFAULT_EMPLOYEE_FIELDS
+
+EMPLOYEE_FIELDS = tuple(DEFAULT_EMPLOYEE_FIELDS) + ('birth_date', 'created_at', 'user')
+REQUEST_ORDER = ((EmployeeRequest.status == 'pending').desc(), EmployeeRequest.created_at.desc())
+
+
+def seed(count):
+    departments = [d.id for d in Department.query.all()]
+    users = [User(
+        email=f"bench{i}@example.com", password_hash="-", name=f"Bench User {i}", role="employee",
+        access_code=f"BENCH-{i}", position="Technician"
+    ) for i in range(count)]
+    db.session.add_all(users)
+    db.session.flush()
+    db.session.add_all([Employee(
+        full_name=f"Bench Employee {i}", job_title="Steel Fixer", phone=f"05{i:08d}",
+        nationality="Pakistan", country="Saudi Arabia", state="Riyadh",
+        department_id=departments[i % len(departments)] if departments else None,
+        user_id=users[i].id if i % 2 == 0 else None
+    ) for i in range(count)])
+    db.session.add_all([Candidate(
+        full_name=f"Bench Candidate {i}", email=f"bench{i}@example.com", phone=f"05{i:08d}",
+        nationality="India", applied_position="Electrician", specialty="Electrical",
+        skills="wiring, conduit, panels", status="new", id_document_filepath="",
+        department_id=departments[i % len(departments)] if departments else None
+    ) for i in range(count)])
+    db.session.add_all([EmployeeRequest(
+        user_id=users[i].id, category="general", subject=f"Request {i}", message="Please review",
+        status="pending" if i % 3 else "approved"
+    ) for i in range(count)])
+    db.session.flush()
+
+
+# name -> (ORM path, read-model path); both return the serialized list
+CASES = {
+    'employees': (
+        lambda: dump_many('employee', Employee.query.options(
+            joinedload(Employee.department), selectinload(Employee.user)
+        ).order_by(Employee.id).all(), EMPLOYEE_FIELDS),
+        lambda: dump_many('employee_row', read_models.fetch(
+            read_models.employee_rows(EMPLOYEE_FIELDS).order_by(Employee.id)
+        ), EMPLOYEE_FIELDS),
+    ),
+    'candidates': (
+        lambda: dump_many('candidate', Candidate.query.order_by(Candidate.id).all()),
+        lambda: dump_many('candidate_row', read_models.fetch(read_models.candidate_rows().order_by(Candidate.id))),
+    ),
+    'users': (
+        lambda: dump_many('user', User.query.filter_by(is_active=True).order_by(User.id).all(), USER_LIST_FIELDS),
+        lambda: dump_many('user', read_models.fetch(
+            read_models.user_rows().where(User.is_active.is_(True)).order_by(User.id)
+        ), USER_LIST_FIELDS),
+    ),
+    'requests': (
+        lambda: dump_many('request', EmployeeRequest.query.order_by(*REQUEST_ORDER).all(), REQUEST_ALL_FIELDS),
+        lambda: dump_many('request_row', read_models.fetch(
+            read_models.request_rows().order_by(*REQUEST_ORDER)
+        ), REQUEST_ALL_FIELDS),
+    ),
+}
+
+
+def measure(fn, runs):
+    """Best CPU time over `runs` (fresh session state each time) and the peak traced memory of one run"""
+    cpu = []
+    for _ in range(runs):
+        db.session.expunge_all()
+        start = time.process_time()
+        result = fn()
+        cpu.append(time.process_time() - start)
+    db.session.expunge_all()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(cpu) * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs read-model list queries")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic rows per table to add for the run")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with app.app_context():
+        logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)  # app.py logs every statement
+        if args.seed:
+            seed(args.seed)
+        print(f"{'list':12} {'rows':>7} {'orm ms':>9} {'rows ms':>9} {'orm KiB':>10} {'rows KiB':>10} {'us/row orm':>11} {'us/row':>8}")
+        for name, (orm_path, row_path) in CASES.items():
+            orm_result, orm_ms, orm_kib = measure(orm_path, args.runs)
+            row_result, row_ms, row_kib = measure(row_path, args.runs)
+            assert orm_result == row_result, f"{name}: read model output differs from the ORM path"
+            n = max(len(row_result), 1)
+            print(f"{name:12} {len(row_result):>7} {orm_ms:>9.1f} {row_ms:>9.1f} {orm_kib:>10.0f} {row_kib:>10.0f} "
+                  f"{orm_ms * 1000 / n:>11.1f} {row_ms * 1000 / n:>8.1f}")
+        if args.seed:
+            db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# scripts/benchmark_serializers.py
+# Serialization time for N employees (default 10k, in memory, no database):
+# hand-built dicts + stdlib json vs compiled schemas + stdlib json vs compiled schemas + orjson.
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime, date
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from core.models import Employee, Department, User
+from core.schemas import compile_schema
+from core.serializers import orjson
+from modules.employee.api_routes import DEFAULT_EMPLOYEE_FIELDS
+
+FIELDS = tuple(DEFAULT_EMPLOYEE_FIELDS) + ('birth_date', 'created_at', 'user')
+
+
+def build(count):
+    departments = [Department(id=i, name=f"Department {i}") for i in range(1, 9)]
+    users = [User(id=i, email=f"user{i}@example.com", role='employee') for i in range(1, count // 2 + 1)]
+    return [Employee(
+        id=i, full_name=f"Employee {i}", job_title="Steel Fixer", phone=f"05{i:08d}",
+        country="Saudi Arabia", nationality="Pakistan", birth_date=date(1990, 1, 1 + i % 28),
+        created_at=datetime(2025, 1, 1, 8, i % 60, i % 60),
+        department=departments[i % len(departments)],
+        user=users[i // 2] if i % 2 == 0 and i // 2 < len(users) else None
+    ) for i in range(count)]
+
+
+def hand_built(e):
+    # the shape the endpoints used to build inline
+    return {
+        'id': e.id,
+        'full_name': e.full_name,
+        'job_title': e.job_title,
+        'phone': e.phone,
+        'department': {'id': e.department.id, 'name': e.department.name} if e.department else None,
+        'country': e.country,
+        'nationality': e.nationality,
+        'role': e.user.role if e.user else 'employee',
+        'birth_date': e.birth_date.isoformat() if e.birth_date else None,
+        'created_at': e.created_at.isoformat() if e.created_at else None,
+        'user': {'id': e.user.id, 'email': e.user.email, 'role': e.user.role} if e.user else None,
+    }
+
+
+def _iso(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(repr(value))
+
+
+def timed(label, fn, runs):
+    best = min(_run(fn) for _ in range(runs))
+    print(f"{label:42} {best * 1000:9.1f} ms")
+    return best
+
+
+def _run(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API serialization")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with app.app_context():
+        employees = build(args.count)
+        serialize = compile_schema('employee', FIELDS)
+        assert json.loads(json.dumps([serialize(e) for e in employees[:50]], default=_iso)) == \
+            [hand_built(e) for e in employees[:50]]
+
+        print(f"{args.count} employees, best of {args.runs}")
+        baseline = timed("hand-built dicts + json.dumps", lambda: json.dumps([hand_built(e) for e in employees]), args.runs)
+        timed("compiled schema (dicts only)", lambda: [serialize(e) for e in employees], args.runs)
+        timed("compiled schema + json.dumps", lambda: json.dumps([serialize(e) for e in employees], default=_iso), args.runs)
+        if orjson is not None:
+            fast = timed("compiled schema + orjson", lambda: orjson.dumps([serialize(e) for e in employees]), args.runs)
+            print(f"speed-up vs hand-built + json: {baseline / fast:.1f}x")
+        else:
+            print("orjson is not installed; pip install orjson")
+
+
+if __name__ == "__main__":
+    main()
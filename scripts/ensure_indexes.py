@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# scripts/ensure_indexes.py
+# db.create_all() does not touch existing tables; this creates any index
+# declared on the models that the database does not have yet.
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from app import app
+from core.extensions import db
+
+
+def existing_index_names(inspector, tables):
+    if db.engine.dialect.name == 'sqlite':
+        # read from sqlite_master: SQLite reflection skips expression indexes (lower(email), ...)
+        with db.engine.connect() as conn:
+            return set(conn.execute(db.text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    return {index['name'] for table in tables for index in inspector.get_indexes(table)}
+
+
+def ensure_indexes():
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    existing = existing_index_names(inspector, existing_tables)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=db.engine, checkfirst=True)
+                created.append(index.name)
+    return created
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        created = ensure_indexes()
+        for name in created:
+            print(f"➕ Created index {name}")
+        print(f"✅ {len(created)} index(es) created")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# scripts/leave_ledger.py
+# Cron entry points for the leave ledger. Accrual and carry-over are queued as
+# background jobs (run by scripts/run_jobs.py); --backfill runs inline once after upgrading.
+#   monthly:  leave_ledger.py --accrue            (current month)
+#   1 Jan:    leave_ledger.py --carry-over        (closes the previous year, run before --accrue)
+import sys
+import os
+import argparse
+from datetime import date
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from core.services.job_queue import enqueue
+from modules.leave import ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leave ledger maintenance")
+    parser.add_argument("--accrue", nargs="?", const=date.today().strftime("%Y-%m"), metavar="YYYY-MM",
+                        help="Queue the monthly accrual (defaults to the current month)")
+    parser.add_argument("--carry-over", nargs="?", const=ledger.year_end(), type=int, metavar="YEAR",
+                        help="Queue the year-end carry-over (defaults to the year just closed)")
+    parser.add_argument("--backfill", action="store_true", help="Post consumption for already approved leaves")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.backfill:
+            print(f"✅ Charged {ledger.backfill_approved()} approved leave(s) to the ledger")
+        if args.carry_over:
+            job = enqueue('leave_carry_over', {'year': args.carry_over})
+            print(f"🕒 Queued carry-over for {args.carry_over} (job {job.id})")
+        if args.accrue:
+            job = enqueue('leave_accrual', {'period': args.accrue})
+            print(f"🕒 Queued accrual for {args.accrue} (job {job.id})")
+        if not (args.backfill or args.carry_over or args.accrue):
+            parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# scripts/migrate_candidate_import.py
+# Adds the columns/indexes used by bulk candidate import and batch promotion,
+# and links employees promoted before employees.candidate_id existed.
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from app import app
+from core.extensions import db
+from core.models import Candidate, Employee
+
+
+def ensure_schema():
+    columns = {c['name'] for c in inspect(db.engine).get_columns('employees')}
+    with db.engine.begin() as conn:
+        if 'candidate_id' not in columns:
+            conn.execute(db.text("ALTER TABLE employees ADD COLUMN candidate_id INTEGER REFERENCES candidates(id)"))
+            print("➕ Added employees.candidate_id")
+        conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_employees_candidate_id ON employees (candidate_id)"))
+        # import de-duplication compares lower(email); the plain email index is no longer read
+        conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_candidates_email_lower ON candidates (lower(email))"))
+        conn.execute(db.text("DROP INDEX IF EXISTS ix_candidates_email"))
+
+
+def link_promoted_employees():
+    # Earlier promotions only matched on full name; keep that rule for the backfill
+    hired = db.session.query(Candidate.id, Candidate.full_name).filter(Candidate.status == 'hired').all()
+    linked = 0
+    for candidate_id, full_name in hired:
+        linked += Employee.query.filter(
+            Employee.candidate_id.is_(None),
+            Employee.full_name == full_name
+        ).update({'candidate_id': candidate_id}, synchronize_session=False)
+    db.session.commit()
+    return linked
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        ensure_schema()
+        print(f"✅ {link_promoted_employees()} employee(s) linked to their candidate record")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# scripts/migrate_org_hierarchy.py
+# Adds the reporting line (users.manager_id) and its closure table (org_closure),
+# then rebuilds the closure from users.manager_id. Re-run after importing or
+# hand-editing manager ids.
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from app import app
+from core.extensions import db
+from core.models import OrgClosure
+from core.services import org_hierarchy
+
+
+def ensure_schema():
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        if 'manager_id' not in {c['name'] for c in inspector.get_columns('users')}:
+            conn.execute(db.text("ALTER TABLE users ADD COLUMN manager_id INTEGER REFERENCES users (id)"))
+            print("➕ Added users.manager_id")
+        conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_users_manager_id ON users (manager_id)"))
+    OrgClosure.__table__.create(db.engine, checkfirst=True)
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        ensure_schema()
+        try:
+            rows = org_hierarchy.rebuild()
+        except ValueError as e:
+            db.session.rollback()
+            sys.exit(f"❌ {e}")
+        db.session.commit()
+        print(f"✅ Rebuilt org_closure ({rows} row(s))")
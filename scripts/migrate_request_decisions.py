@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# scripts/migrate_request_decisions.py
+# Adds who decided an employee request and when (employee_requests.approver_id /
+# decided_at), used by the single and bulk request decision endpoints.
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from app import app
+from core.extensions import db
+
+COLUMNS = [
+    ('employee_requests', 'approver_id', 'INTEGER REFERENCES users (id)'),
+    ('employee_requests', 'decided_at', 'DATETIME'),
+]
+
+
+def ensure_schema():
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table, column, ddl_type in COLUMNS:
+            if column not in {c['name'] for c in inspector.get_columns(table)}:
+                conn.execute(db.text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+                print(f"➕ Added {table}.{column}")
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        ensure_schema()
+        print("✅ Request decision columns are up to date")
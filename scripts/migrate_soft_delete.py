@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# scripts/migrate_soft_delete.py
+# Adds the columns used by logical deletes (users/employees.deleted_at) and
+# by background job progress reporting (background_jobs.progress).
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from app import app
+from core.extensions import db
+
+COLUMNS = [
+    ('users', 'deleted_at', 'DATETIME'),
+    ('employees', 'deleted_at', 'DATETIME'),
+    ('background_jobs', 'progress', 'TEXT'),
+]
+
+
+def ensure_schema():
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table, column, ddl_type in COLUMNS:
+            if column not in {c['name'] for c in inspector.get_columns(table)}:
+                conn.execute(db.text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+                print(f"➕ Added {table}.{column}")
+        conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_users_deleted_at ON users (deleted_at)"))
+        conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_employees_deleted_at ON employees (deleted_at)"))
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        ensure_schema()
+        print("✅ Soft-delete schema is up to date")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# scripts/migrate_sync.py
+# Adds updated_at to employees/departments, creates the change_log table and
+# logs every existing row once so mobile clients can start syncing from 0.
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from app import app
+from core.extensions import db
+from core.models import ChangeLog
+from core.services import change_log
+
+
+def ensure_schema():
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in ('employees', 'departments'):
+            if 'updated_at' not in {c['name'] for c in inspector.get_columns(table)}:
+                conn.execute(db.text(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME"))
+                conn.execute(db.text(f"UPDATE {table} SET updated_at = created_at"))
+                print(f"➕ Added {table}.updated_at")
+    ChangeLog.__table__.create(db.engine, checkfirst=True)
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        ensure_schema()
+        if db.session.query(ChangeLog.id).first() is None:
+            print(f"✅ Logged {change_log.backfill()} existing row(s) for sync")
+        else:
+            print("✅ change_log already populated")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# scripts/normalize_specialties.py
+# Adds the taxonomy id columns to candidates (if missing) and backfills them
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from app import app
+from core.extensions import db
+from core.models import Candidate
+from core.services.specialty_taxonomy import taxonomy
+
+
+def ensure_columns():
+    columns = {c['name'] for c in inspect(db.engine).get_columns('candidates')}
+    with db.engine.begin() as conn:
+        for column in ('specialty_id', 'specialty_category_id'):
+            if column not in columns:
+                conn.execute(db.text(f"ALTER TABLE candidates ADD COLUMN {column} INTEGER"))
+                print(f"➕ Added candidates.{column}")
+            conn.execute(db.text(f"CREATE INDEX IF NOT EXISTS ix_candidates_{column} ON candidates ({column})"))
+
+
+def backfill():
+    # One UPDATE per distinct free-text value instead of one per candidate
+    distinct = [value for (value,) in db.session.query(Candidate.specialty).distinct()]
+    matched = 0
+    for value in distinct:
+        specialty_id = taxonomy.resolve(value)
+        updated = Candidate.query.filter(Candidate.specialty == value).update({
+            'specialty': taxonomy.name(specialty_id) or value,
+            'specialty_id': specialty_id,
+            'specialty_category_id': taxonomy.category_id(specialty_id),
+        }, synchronize_session=False)
+        if specialty_id:
+            matched += updated
+    db.session.commit()
+    return matched, len(distinct)
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        ensure_columns()
+        matched, distinct = backfill()
+        print(f"✅ {matched} candidate(s) mapped to the taxonomy ({distinct} distinct specialty value(s))")
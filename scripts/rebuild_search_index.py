@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# scripts/rebuild_search_index.py
+# Re-creates the global search index from the database tables
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from core.services.search_index import ensure_search_index, rebuild
+
+if __name__ == "__main__":
+    with app.app_context():
+        ensure_search_index(rebuild_if_created=False)
+        print(f"✅ {rebuild()} row(s) indexed")
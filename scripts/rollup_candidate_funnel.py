@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# scripts/rollup_candidate_funnel.py
+# Nightly cron: roll candidate status events up into candidate_funnel_daily
+import sys
+import os
+import argparse
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from modules.candidate.analytics import rollup_range, seed_status_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute daily candidate funnel rollups")
+    parser.add_argument("--day", help="Day to roll up (YYYY-MM-DD), defaults to yesterday")
+    parser.add_argument("--days", type=int, default=1, help="Number of days ending at --day to (re)compute")
+    parser.add_argument("--seed", action="store_true", help="Backfill initial events for existing candidates first")
+    args = parser.parse_args()
+
+    end_day = datetime.strptime(args.day, "%Y-%m-%d").date() if args.day \
+        else datetime.utcnow().date() - timedelta(days=1)
+    start_day = end_day - timedelta(days=max(args.days, 1) - 1)
+
+    with app.app_context():
+        if args.seed:
+            print(f"🌱 Seeded {seed_status_events()} initial status event(s)")
+        rows = rollup_range(start_day, end_day)
+        print(f"✅ Funnel rolled up for {start_day} → {end_day} ({rows} row(s))")
+
+
+if __name__ == "__main__":
+    main()
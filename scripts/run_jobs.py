@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# scripts/run_jobs.py
+# Background worker: drains the background_jobs table and the email outbox
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from core.services.job_queue import run_pending, requeue_stale_jobs
+from core.services.email_service import email_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument("--once", action="store_true", help="Process one batch and exit")
+    parser.add_argument("--batch", type=int, default=20, help="Jobs claimed per poll")
+    args = parser.parse_args()
+
+    with app.app_context():
+        requeue_stale_jobs()
+        poll = app.config.get("JOB_POLL_SECONDS", 5)
+        while True:
+            processed = run_pending(limit=args.batch)
+            processed += email_service.drain_outbox(batch_size=args.batch)
+            if args.once:
+                print(f"✅ Processed {processed} job(s)")
+                return
+            if not processed:
+                time.sleep(poll)
+
+
+if __name__ == "__main__":
+    main()